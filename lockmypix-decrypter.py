@@ -3,781 +3,196 @@
 
 import sys
 import os
-import hashlib
-import binascii
-import zipfile
-import sqlite3
-import shutil
 from pathlib import Path
 from datetime import datetime
 import logging
+import argparse
+import getpass
+import time
+from collections import deque
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QPushButton, QFileDialog, QTextEdit, QProgressBar,
-    QLineEdit, QMessageBox, QGroupBox, QInputDialog, QComboBox
+    QLabel, QPushButton, QFileDialog, QListView, QProgressBar,
+    QLineEdit, QMessageBox, QGroupBox, QInputDialog, QComboBox, QSpinBox
 )
 
 from PyQt6 import QtGui
-from PyQt6.QtCore import QThread, pyqtSignal, Qt
-from PyQt6.QtGui import QFont, QIcon
-from Crypto.Cipher import AES
-from Crypto.Util import Counter
-
-# EXIF támogatás (opcionális)
-try:
-    from PIL import Image, ExifTags
-    HAS_PIL = True
-except ImportError:
-    HAS_PIL = False
-
-# ======================================
-# SEGÉDFÜGGVÉNYEK - Intelligens név- és dátumkezelés
-# ======================================
-
-def set_file_timestamps(file_path, datetime_obj):
-    """Fájl időbélyegek beállítása"""
-    timestamp = datetime_obj.timestamp()
-    os.utime(file_path, (timestamp, timestamp))  # (access_time, modified_time)
-
-def is_image_file(file_path):
-    """Ellenőrzi hogy képfájl-e"""
-    image_extensions = {'.jpg', '.jpeg', '.png', '.heic', '.heif', '.tiff', '.bmp', '.gif', '.webp'}
-    return Path(file_path).suffix.lower() in image_extensions
-
-def is_video_file(file_path):
-    """Ellenőrzi hogy videófájl-e"""
-    video_extensions = {'.mp4', '.mov', '.avi', '.mkv', '.wmv', '.flv', '.webm', '.m4v'}
-    return Path(file_path).suffix.lower() in video_extensions
-
-def get_exif_datetime(image_path):
-    """EXIF DateTime kinyerése képfájlból"""
-    if not HAS_PIL:
-        return None
-
-    try:
-        with Image.open(image_path) as img:
-            exif_data = img._getexif()
-            if exif_data:
-                for tag_id, value in exif_data.items():
-                    tag = ExifTags.TAGS.get(tag_id, tag_id)
-                    if tag == "DateTime":
-                        return datetime.strptime(value, "%Y:%m:%d %H:%M:%S")
-    except:
-        pass
-    return None
-
-def detect_extension_by_header(file_path):
-    """Fájl tartalom alapján kiterjesztés meghatározás"""
-    default_ext = Path(file_path).suffix or '.bin'
-    try:
-        with open(file_path, 'rb') as f:
-            header = f.read(16)
-
-        # JPEG
-        if header.startswith(b'\xff\xd8\xff'):
-            return '.jpg'
-        # PNG  
-        elif header.startswith(b'\x89PNG'):
-            return '.png'
-        # MP4
-        elif b'ftyp' in header:
-            return '.mp4'
-        # GIF
-        elif header.startswith(b'GIF8'):
-            return '.gif'
-        # BMP
-        elif header.startswith(b'BM'):
-            return '.bmp'
-
-    except:
-        pass
-
-    return default_ext
-
-def generate_intelligent_filename(file_mapping, hash_id, decrypted_path, sort_order):
-    """
-    Intelligens fájlnév generálás hibrid módszerrel
-
-    Args:
-        file_mapping (dict): Sort.db mapping adatok
-        hash_id (str): Fájl hash azonosító
-        decrypted_path (str): Dekriptált fájl útvonala
-        sort_order (int): Rendezési sorszám
-
-    Returns:
-        str: Generált fájlnév
-    """
-
-    # 1. IMGPATH tábla ellenőrzés (ha implementált)
-    if file_mapping and hash_id in file_mapping and 'original_path' in file_mapping[hash_id]:
-        original_path = file_mapping[hash_id]['original_path']
-        if original_path:
-            return os.path.basename(original_path)
-
-    # 2. EXIF alapú névgenerálás (képfájlokhoz)
-    if is_image_file(decrypted_path):
-        exif_date = get_exif_datetime(decrypted_path)
-        if exif_date:
-            date_str = exif_date.strftime("%Y%m%d_%H%M%S")
-            file_ext = Path(decrypted_path).suffix
-            return f"IMG_{date_str}{file_ext}"
-
-    # 3. Videó fájlok header alapú névgenerálás (egyszerűsített)
-    if is_video_file(decrypted_path):
-        try:
-            # Fájl létrehozási ideje alapján
-            ctime = os.path.getctime(decrypted_path)
-            creation_date = datetime.fromtimestamp(ctime)
-            date_str = creation_date.strftime("%Y%m%d_%H%M%S")
-            file_ext = Path(decrypted_path).suffix
-            return f"VID_{date_str}{file_ext}"
-        except:
-            pass
-
-    # 4. Sorrend alapú fallback
-    file_ext = detect_extension_by_header(decrypted_path)
-    return f"file_{sort_order:03d}{file_ext}"
-
-def restore_file_timestamps(encrypted_path, decrypted_path, file_mapping=None, filename_key=None):
-    """
-    Fájldátumok helyreállítása prioritás alapján
-
-    Args:
-        encrypted_path (str): Eredeti titkosított fájl útvonala
-        decrypted_path (str): Dekriptált fájl útvonala  
-        file_mapping (dict): Sort.db mapping adatok (opcionális)
-        filename_key (str): Fájl azonosító a mapping-ben (opcionális)
-    """
-
-    # 1. ELSŐDLEGES: Sort.db adatbázis dátum
-    if file_mapping and filename_key and filename_key in file_mapping:
-        mapping_info = file_mapping[filename_key]
-        if 'date_modified' in mapping_info:
-            try:
-                original_date = datetime.fromisoformat(mapping_info['date_modified'])
-                set_file_timestamps(decrypted_path, original_date)
-                return
-            except:
-                pass
-
-    # 2. MÁSODLAGOS: EXIF adatok (csak képfájlokhoz)
-    if HAS_PIL and is_image_file(decrypted_path):
-        exif_date = get_exif_datetime(decrypted_path)
-        if exif_date:
-            set_file_timestamps(decrypted_path, exif_date)
-            return
-
-    # 3. HARMADLAGOS: OS fájl metadatok másolása
-    if os.path.exists(encrypted_path):
-        try:
-            shutil.copystat(encrypted_path, decrypted_path)
-            return
-        except:
-            pass
-
-    # 4. NEGYEDLEGES: Aktuális idő (fallback)
-    current_time = datetime.now()
-    set_file_timestamps(decrypted_path, current_time)
-
-def rename_folder_by_timestamps(folder_path):
-    """
-    Mappa átnevezése a benne lévő fájlok legkorábbi és legkésőbbi dátuma alapján
-    """
-    if not os.path.exists(folder_path):
-        return folder_path
-
-    timestamps = []
-    for root, dirs, files in os.walk(folder_path):
-        for filename in files:
-            file_path = os.path.join(root, filename)
-            try:
-                ctime = os.path.getctime(file_path)
-                timestamps.append(ctime)
-            except:
-                continue
-
-    if not timestamps:
-        return folder_path  # Nincs fájl a mappában
-
-    # Legkorábbi és legkésőbbi timestamp
-    earliest = datetime.fromtimestamp(min(timestamps)).strftime("%Y%m%d")
-    latest = datetime.fromtimestamp(max(timestamps)).strftime("%Y%m%d")
-
-    # Új mappanév
-    parent = os.path.dirname(folder_path)
-    if earliest == latest:
-        new_name = earliest
-    else:
-        new_name = f"{earliest}-{latest}"
-    new_path = os.path.join(parent, new_name)
-
-    # Ütközés kezelése
-    suffix = 1
-    temp_path = new_path
-    while os.path.exists(temp_path) and temp_path != folder_path:
-        temp_path = f"{new_path}_{suffix}"
-        suffix += 1
-    new_path = temp_path
-
-    # Átnevezés
-    if new_path != folder_path:
-        try:
-            os.rename(folder_path, new_path)
-            print(f"📂 Mappa átnevezve: {os.path.basename(folder_path)} → {os.path.basename(new_path)}")
-            return new_path
-        except Exception as e:
-            print(f"⚠️ Mappa átnevezési hiba: {e}")
-
-    return folder_path
-
-class LanguageManager:
-    """Nyelvkezelő osztály"""
-    def __init__(self):
-        self.current_language = "hu"  # Alapértelmezett: magyar
-
-        # Szöveg fordítások
-        self.texts = {
-            "hu": {
-                # Főablak
-                "window_title": "LockMyPix Decrypter",
-                "app_title": "🔓 LockMyPix Decrypter",
-
-                # Csoportok
-                "folders_group": "📁 Mappák",
-                "controls_group": "🎛️ Vezérlés",
-                "progress_group": "📊 Haladás",
-                "log_group": "📝 Napló",
-
-                # Mezők
-                "input_label": "Bemenet:",
-                "output_label": "Kimenet:",
-                "input_placeholder": "Titkosított fájlok vagy .zip.cmpexport...",
-                "output_placeholder": "Dekriptált fájlok helye...",
-
-                # Gombok
-                "browse_button": "Tallózás",
-                "start_button": "▶️ Indítás",
-                "stop_button": "⏹️ Leállítás",
-                "log_button": "📋 Napló",
-
-                # Állapotok
-                "ready_status": "Kész - Backup és egyedi fájlok támogatva",
-                "finished_status": "Kész",
-
-                # Üzenetek - Worker
-                "password_test_error": "Jelszó teszt hiba",
-                "no_files": "Nincsenek támogatott titkosított fájlok!",
-                "interrupted": "Megszakítva",
-                "processing": "Feldolgozás",
-                "completed": "Kész",
-                "error": "Hiba",
-                "password_checking": "Jelszó ellenőrzése...",
-                "wrong_password": "Helytelen jelszó!",
-                "decrypting": "Dekriptálás...",
-                "files_processed": "fájl sikeresen dekriptálva",
-
-                # .zip.cmpexport üzenetek
-                "cmpexport_detected": "LockMyPix backup észlelve",
-                "extracting_zip": "ZIP kicsomagolása",
-                "analyzing_sortdb": "Sort.db elemzése",
-                "loading_keyfiles": "Kulcs fájlok betöltése",
-                "decrypting_folder": "Titkosított mappa dekriptálása",
-                "mapping_files": "Fájlnév mapping alkalmazása",
-                "cleanup_temp": "Temp fájlok törlése",
-                "backup_processed": "backup sikeresen feldolgozva",
-                "intelligent_naming": "Intelligens névgenerálás",
-                "timestamp_restore": "Időbélyegek helyreállítása",
-                "folder_rename": "Mappák átnevezése",
-
-                # Üzenetek - UI
-                "app_started": "Alkalmazás elindítva",
-                "input_selected": "Bemenet",
-                "output_selected": "Kimenet",
-                "password_prompt": "Add meg a jelszót:",
-                "password_title": "Jelszó szükséges",
-                "error_title": "Hiba",
-                "missing_folders": "Adja meg a mappákat!",
-                "folder_not_exists": "A bemeneti mappa nem létezik!",
-                "decrypt_starting": "Dekriptálás indítása...",
-                "stopping": "Leállítás...",
-                "success_title": "Siker",
-                "finished": "Befejezve",
-                "log_opened": "Napló megnyitva",
-                "info_title": "Info",
-                "no_log_file": "Nincs napló fájl",
-                "log_open_error": "Napló megnyitási hiba",
-
-                # Dialógusok
-                "input_folder_dialog": "Bemeneti mappa vagy fájl",
-                "output_folder_dialog": "Kimeneti mappa",
-            },
-            "en": {
-                # Main window
-                "window_title": "LockMyPix Decrypter",
-                "app_title": "🔓 LockMyPix Decrypter",
-
-                # Groups
-                "folders_group": "📁 Folders",
-                "controls_group": "🎛️ Controls",
-                "progress_group": "📊 Progress",
-                "log_group": "📝 Log",
-
-                # Fields
-                "input_label": "Input:",
-                "output_label": "Output:",
-                "input_placeholder": "Encrypted files or .zip.cmpexport...",
-                "output_placeholder": "Decrypted files location...",
-
-                # Buttons
-                "browse_button": "Browse",
-                "start_button": "▶️ Start",
-                "stop_button": "⏹️ Stop",
-                "log_button": "📋 Log",
-
-                # Status
-                "ready_status": "Ready - Backup and individual files supported",
-                "finished_status": "Finished",
-
-                # Messages - Worker
-                "password_test_error": "Password test error",
-                "no_files": "No supported encrypted files found!",
-                "interrupted": "Interrupted",
-                "processing": "Processing",
-                "completed": "Completed",
-                "error": "Error",
-                "password_checking": "Checking password...",
-                "wrong_password": "Wrong password!",
-                "decrypting": "Decrypting...",
-                "files_processed": "files successfully decrypted",
-
-                # .zip.cmpexport messages
-                "cmpexport_detected": "LockMyPix backup detected",
-                "extracting_zip": "Extracting ZIP",
-                "analyzing_sortdb": "Analyzing sort.db",
-                "loading_keyfiles": "Loading key files",
-                "decrypting_folder": "Decrypting encrypted folder",
-                "mapping_files": "Applying filename mapping",
-                "cleanup_temp": "Cleaning temp files",
-                "backup_processed": "backup successfully processed",
-                "intelligent_naming": "Intelligent name generation",
-                "timestamp_restore": "Timestamp restoration",
-                "folder_rename": "Folder renaming",
-
-                # Messages - UI
-                "app_started": "Application started",
-                "input_selected": "Input",
-                "output_selected": "Output",
-                "password_prompt": "Enter password:",
-                "password_title": "Password Required",
-                "error_title": "Error",
-                "missing_folders": "Please specify folders!",
-                "folder_not_exists": "Input folder does not exist!",
-                "decrypt_starting": "Starting decryption...",
-                "stopping": "Stopping...",
-                "success_title": "Success",
-                "finished": "Finished",
-                "log_opened": "Log file opened",
-                "info_title": "Info",
-                "no_log_file": "No log file",
-                "log_open_error": "Log file open error",
-
-                # Dialogs
-                "input_folder_dialog": "Input Folder or File",
-                "output_folder_dialog": "Output Folder",
-            }
-        }
-
-    def set_language(self, lang_code):
-        """Nyelv beállítása"""
-        if lang_code in self.texts:
-            self.current_language = lang_code
+from PyQt6.QtCore import (
+    QThread, pyqtSignal, Qt,
+    QAbstractListModel, QSortFilterProxyModel, QModelIndex
+)
+from PyQt6.QtGui import QFont, QIcon, QColor
 
-    def get_text(self, key):
-        """Szöveg lekérdezése aktuális nyelven"""
-        return self.texts[self.current_language].get(key, key)
+from lockmypix import (
+    EXTENSION_MAP, OUTPUT_FORMATS, ORDER_POLICIES, MEMORY_BUDGET, OperationCancelled, InputIndex,
+    LanguageManager, Decryptor, build_plan, save_plan, load_plan, format_plan_summary,
+    format_progress_stats, start_async_logging, archive_target_path, CIPHER_AUTO, CIPHER_BACKENDS
+)
+from lockmypix.daemon import submit as daemon_submit
 
 class DecryptWorker(QThread):
-    """Dekriptálási munkaszál - KIBŐVÍTVE intelligens név- és dátumkezeléssel"""
+    """Dekriptálási munkaszál - a lockmypix.Decryptor vékony Qt burka (szignálok a callbackekből)"""
     progress_updated = pyqtSignal(int)
+    progress_stats = pyqtSignal(dict)
     status_updated = pyqtSignal(str)
     finished = pyqtSignal(bool, str)
 
-    def __init__(self, password, input_dir, output_dir, lang_manager):
+    def __init__(self, password, input_dir, output_dir, lang_manager, output_format="dir", **options):
         super().__init__()
-        self.password = password
-        self.input_dir = input_dir
-        self.output_dir = output_dir
-        self.should_stop = False
-        self.lang = lang_manager
-
-        # Fájlkiterjesztés konverzió (KIBŐVÍTVE)
-        self.extension_map = {
-            ".vp3": ".mp4", ".vo1": ".webm", ".v27": ".mpg", ".vb9": ".avi",
-            ".v77": ".mov", ".v78": ".wmv", ".v82": ".dv", ".vz9": ".divx",
-            ".vi3": ".ogv", ".v1u": ".h261", ".v6m": ".h264", ".6zu": ".jpg",
-            ".tr7": ".gif", ".p5o": ".png", ".8ur": ".bmp", ".33t": ".tiff",
-            ".20i": ".webp", ".v93": ".heic", ".v91": ".flv", ".v80": ".3gpp",
-            ".vo4": ".ts", ".v99": ".mkv", ".vr2": ".mpeg", ".vv3": ".dpg",
-            ".v81": ".rmvb", ".vz8": ".vob", ".wi2": ".asf", ".vi4": ".h263",
-            ".v2u": ".f4v", ".v76": ".m4v", ".v75": ".ram", ".v74": ".rm",
-            ".v3u": ".mts", ".v92": ".dng", ".r89": ".ps", ".v79": ".3gp",
-
-            # ÚJ: Backup támogatás
-            ".zip.cmpexport": ".backup"
-        }
-
-    def create_cipher(self):
-        """AES cipher létrehozása (EREDETI ALGORITMUS)"""
-        key = hashlib.sha1(self.password.encode()).digest()[:16]
-        iv = key
-        counter = Counter.new(128, initial_value=int.from_bytes(iv, "big"))
-        return AES.new(key, AES.MODE_CTR, counter=counter)
-
-    def test_password(self):
-        """Jelszó validálása - KIBŐVÍTVE .zip.cmpexport támogatással"""
-        try:
-            # .zip.cmpexport fájl esetén nincs jelszó teszt szükséges
-            if os.path.isfile(self.input_dir) and self.input_dir.endswith('.zip.cmpexport'):
-                return True
-
-            # Keresés minden támogatott titkosított kiterjesztésben
-            supported_extensions = list(self.extension_map.keys())
-            supported_extensions.remove('.zip.cmpexport')  # Backup fájl nem tesztelhető
-
-            for filename in os.listdir(self.input_dir):
-                file_ext = os.path.splitext(filename)[1].lower()
-
-                if file_ext in supported_extensions:
-                    file_path = os.path.join(self.input_dir, filename)
-                    cipher = self.create_cipher()
-                    with open(file_path, "rb") as f:
-                        encrypted_data = f.read(16)
-                    decrypted_data = cipher.decrypt(encrypted_data)
-                    header = binascii.hexlify(decrypted_data).decode("utf8")
-
-                    # Különböző fájltípusok header ellenőrzése
-                    if (header.startswith("ffd8ff") or  # JPEG
-                        header.startswith("89504e") or  # PNG
-                        header.startswith("474946") or  # GIF
-                        header.startswith("424d") or    # BMP
-                        header.startswith("000000") or  # Video files
-                        len(decrypted_data) > 0):       # Bármilyen dekriptált adat
-                        return True
-            return False
-        except Exception as e:
-            error_msg = f"{self.lang.get_text('password_test_error')}: {str(e)}"
-            self.status_updated.emit(error_msg)
-            return False
-
-    def handle_cmpexport_file(self, zip_path, output_dir):
-        """
-        ÚJ: .zip.cmpexport fájl teljes feldolgozása
-        Sort.db alapú mapping + intelligens névgenerálás
-        """
-        try:
-            # 1. Temp mappa létrehozása
-            temp_dir = os.path.join(os.path.dirname(zip_path), "temp_cmpexport")
-            if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
-            os.makedirs(temp_dir, exist_ok=True)
-
-            self.status_updated.emit(f"{self.lang.get_text('cmpexport_detected')}: {os.path.basename(zip_path)}")
-
-            # 2. ZIP kicsomagolás
-            self.status_updated.emit(self.lang.get_text('extracting_zip'))
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(temp_dir)
-
-            # 3. Sort.db elemzés
-            self.status_updated.emit(self.lang.get_text('analyzing_sortdb'))
-            file_mapping = self.analyze_sort_db(temp_dir)
-
-            # 4. .encrypt mappa dekriptálása
-            self.status_updated.emit(self.lang.get_text('decrypting_folder'))
-            encrypt_dir = os.path.join(temp_dir, ".encrypt")
-
-            if not os.path.exists(encrypt_dir):
-                raise Exception(f".encrypt mappa nem található: {encrypt_dir}")
+        self.decryptor = Decryptor(password, input_dir, output_dir, lang_manager, output_format,
+                                   on_status=self.status_updated.emit, on_progress=self.emit_progress,
+                                   **options)
 
-            success_count = self.decrypt_encrypt_folder(encrypt_dir, output_dir, file_mapping)
+    def emit_progress(self, stats):
+        """Haladás továbbítása a GUI-nak"""
+        self.progress_updated.emit(stats["percent"])
+        self.progress_stats.emit(stats)
 
-            # 5. Mappák átnevezése időbélyeg alapján
-            self.status_updated.emit(self.lang.get_text('folder_rename'))
-            self.rename_output_folders(output_dir)
-
-            # 6. Temp mappa takarítása
-            self.status_updated.emit(self.lang.get_text('cleanup_temp'))
-            shutil.rmtree(temp_dir)
-
-            return success_count > 0, f"1 {self.lang.get_text('backup_processed')} ({success_count} fájl)"
-
-        except Exception as e:
-            error_msg = f"Backup feldolgozási hiba: {str(e)}"
-            self.status_updated.emit(error_msg)
-
-            # Cleanup hiba esetén is
-            if 'temp_dir' in locals() and os.path.exists(temp_dir):
-                try:
-                    shutil.rmtree(temp_dir)
-                except:
-                    pass
-
-            return False, error_msg
-
-    def analyze_sort_db(self, temp_dir):
-        """Sort.db elemzés fájlnév mapping kinyeréséhez - KIBŐVÍTVE dátum támogatással"""
-        sort_db_path = os.path.join(temp_dir, "sort.db")
-        file_mapping = {}
-
-        if not os.path.exists(sort_db_path):
-            self.status_updated.emit("sort.db nem található - folytatás mapping nélkül")
-            return file_mapping
-
-        try:
-            conn = sqlite3.connect(sort_db_path)
-            cursor = conn.cursor()
-
-            # sortorder tábla lekérdezése bővített mezőkkel
-            try:
-                cursor.execute("SELECT id, dir, sort, date_modified FROM sortorder ORDER BY sort")
-            except sqlite3.OperationalError:
-                # Ha nincs date_modified mező, csak az alapokat kérjük le
-                cursor.execute("SELECT id, dir, sort FROM sortorder ORDER BY sort")
-
-            rows = cursor.fetchall()
-
-            for row in rows:
-                if len(row) >= 3:
-                    id_hash, dir_hash, sort_order = row[0], row[1], row[2]
-                    date_modified = row[3] if len(row) > 3 else None
-
-                    file_mapping[id_hash] = {
-                        'directory': dir_hash,
-                        'sort_order': int(sort_order),
-                        'original_name': f"file_{sort_order:03d}",
-                        'date_modified': date_modified
-                    }
-
-            conn.close()
-            self.status_updated.emit(f"Sort.db: {len(file_mapping)} fájl mapping betöltve")
-
-        except Exception as e:
-            self.status_updated.emit(f"Sort.db elemzési hiba: {str(e)}")
-
-        return file_mapping
-
-    def decrypt_encrypt_folder(self, encrypt_dir, output_dir, file_mapping):
-        """
-        .encrypt mappa rekurzív dekriptálása
-        KIBŐVÍTVE intelligens név- és dátumkezeléssel
-        """
-        success_count = 0
-        total_count = 0
-        processed_dirs = set()
-
-        # Rekurzív fájl bejárás
-        for root, dirs, files in os.walk(encrypt_dir):
-            for file in files:
-                if self.should_stop:
-                    return success_count
-
-                total_count += 1
-                input_file_path = os.path.join(root, file)
-
-                # Relatív útvonal az encrypt_dir-hez képest
-                rel_path = os.path.relpath(input_file_path, encrypt_dir)
-
-                # Fájlnév és kiterjesztés
-                file_basename = os.path.splitext(file)[0]
-                file_ext = os.path.splitext(file)[1]
-
-                # Kimeneti könyvtár meghatározása
-                if file_basename in file_mapping:
-                    mapping_info = file_mapping[file_basename]
-                    output_subdir = mapping_info['directory'].rstrip('/')
-                    output_dir_path = os.path.join(output_dir, output_subdir)
-                else:
-                    # Mapping nélkül - relatív útvonal megtartása
-                    output_dir_path = os.path.join(output_dir, os.path.dirname(rel_path))
-
-                # Kimeneti könyvtár létrehozása
-                os.makedirs(output_dir_path, exist_ok=True)
-
-                # Temp fájl létrehozása dekriptáláshoz
-                temp_file_name = f"temp_{file_basename}{file_ext}"
-                temp_file_path = os.path.join(output_dir_path, temp_file_name)
-
-                # Dekriptálás (EREDETI ALGORITMUS)
-                try:
-                    cipher = self.create_cipher()
-
-                    with open(input_file_path, 'rb') as f:
-                        encrypted_data = f.read()
-
-                    decrypted_data = cipher.decrypt(encrypted_data)
-
-                    with open(temp_file_path, 'wb') as f:
-                        f.write(decrypted_data)
-
-                    # Intelligens fájlnév generálás
-                    self.status_updated.emit(self.lang.get_text('intelligent_naming'))
-                    sort_order = file_mapping[file_basename]['sort_order'] if file_basename in file_mapping else total_count
-                    intelligent_name = generate_intelligent_filename(file_mapping, file_basename, temp_file_path, sort_order)
-
-                    # Végleges fájl útvonal
-                    final_file_path = os.path.join(output_dir_path, intelligent_name)
-
-                    # Átnevezés intelligens névre
-                    os.rename(temp_file_path, final_file_path)
+    def stop(self):
+        """Műveletek leállítása"""
+        self.decryptor.stop()
 
-                    # Időbélyeg helyreállítás
-                    self.status_updated.emit(self.lang.get_text('timestamp_restore'))
-                    restore_file_timestamps(input_file_path, final_file_path, file_mapping, file_basename)
+    def run(self):
+        """Fő futási logika (a Decryptor végzi, itt csak a végeredmény kerül kiküldésre)"""
+        self.finished.emit(*self.decryptor.run())
 
-                    success_count += 1
-                    processed_dirs.add(output_dir_path)
-                    self.status_updated.emit(f"{self.lang.get_text('completed')}: {intelligent_name}")
+class ScanWorker(QThread):
+    """
+    Bemeneti mappa háttérben történő bejárása (a GUI szál nem fagy le lassú meghajtón)
+    Részleges kiterjesztés-statisztikát küld, és kiválasztás-váltáskor megszakítható
+    """
+    partial_counts = pyqtSignal(dict)
+    first_supported_found = pyqtSignal()
+    scan_finished = pyqtSignal(object)
+    scan_failed = pyqtSignal(str)
 
-                except Exception as e:
-                    error_msg = f"{self.lang.get_text('error')} {file}: {str(e)}"
-                    self.status_updated.emit(error_msg)
+    def __init__(self, input_path, emit_interval=0.1, exclude=()):
+        super().__init__()
+        self.input_path = input_path
+        self.exclude = [folder for folder in exclude if folder]
+        self.emit_interval = emit_interval
+        self.should_stop = False
+        self.counts = {}
+        self.last_emit = 0.0
 
-                    # Temp fájl törlése hiba esetén
-                    if os.path.exists(temp_file_path):
-                        try:
-                            os.remove(temp_file_path)
-                        except:
-                            pass
+    def stop(self):
+        """Bejárás megszakítása"""
+        self.should_stop = True
 
-                # Haladás frissítése
-                if total_count > 0:
-                    progress = int(success_count / total_count * 100)
-                    self.progress_updated.emit(min(progress, 100))
+    def on_entry(self, entry):
+        """Talált fájl feldolgozása - számlálás és ritkított részeredmény küldés"""
+        if entry.ext not in EXTENSION_MAP:
+            return
+        if not self.counts:
+            self.first_supported_found.emit()
+        self.counts[entry.ext] = self.counts.get(entry.ext, 0) + 1
 
-        return success_count
+        now = time.monotonic()
+        if now - self.last_emit >= self.emit_interval:
+            self.last_emit = now
+            self.partial_counts.emit(dict(self.counts))
 
-    def rename_output_folders(self, output_dir):
-        """Kimeneti mappák átnevezése időbélyeg alapján"""
+    def run(self):
         try:
-            # Almappák keresése és átnevezése
-            for item in os.listdir(output_dir):
-                item_path = os.path.join(output_dir, item)
-                if os.path.isdir(item_path):
-                    rename_folder_by_timestamps(item_path)
+            index = InputIndex.scan(self.input_path, lambda: self.should_stop, self.on_entry, self.exclude)
+            self.partial_counts.emit(dict(self.counts))
+            self.scan_finished.emit(index)
+        except OperationCancelled:
+            pass
         except Exception as e:
-            self.status_updated.emit(f"Mappa átnevezési hiba: {str(e)}")
-
-    def process_files(self):
-        """Fájlok feldolgozása - HIBRID: .zip.cmpexport + egyedi fájlok"""
-
-        # .zip.cmpexport fájl kezelése
-        if os.path.isfile(self.input_dir) and self.input_dir.endswith('.zip.cmpexport'):
-            return self.handle_cmpexport_file(self.input_dir, self.output_dir)
+            self.scan_failed.emit(str(e))
 
-        # Kimeneti könyvtár létrehozása
-        Path(self.output_dir).mkdir(parents=True, exist_ok=True)
+# Napló nézet: alapból legfeljebb ennyi sor marad memóriában (a teljes előzmény a
+# naplófájlban); a felületen állítható, kezdőértéke a LOCKMYPIX_LOG_VIEW_CAP változóból is jöhet
+LOG_VIEW_CAP = 5000
+LOG_VIEW_CAP_RANGE = (100, 1000000)
 
-        # Támogatott titkosított fájlok keresése
-        supported_extensions = list(self.extension_map.keys())
-        supported_extensions.remove('.zip.cmpexport')  # Backup már kezelve
-        files = []
-
-        for f in os.listdir(self.input_dir):
-            if os.path.isfile(os.path.join(self.input_dir, f)):
-                file_ext = os.path.splitext(f)[1].lower()
-                if file_ext in supported_extensions:
-                    files.append(f)
-
-        if not files:
-            return False, self.lang.get_text("no_files")
-
-        successful_count = 0
-
-        for i, filename in enumerate(files):
-            if self.should_stop:
-                return False, self.lang.get_text("interrupted")
-
-            try:
-                input_path = os.path.join(self.input_dir, filename)
-                status_msg = f"{self.lang.get_text('processing')}: {filename}"
-                self.status_updated.emit(status_msg)
-
-                # Dekriptálás (EREDETI ALGORITMUS)
-                cipher = self.create_cipher()
-                with open(input_path, "rb") as f:
-                    decrypted_data = cipher.decrypt(f.read())
-
-                # Temp fájl létrehozása
-                basename, ext = os.path.splitext(filename)
-                temp_filename = f"temp_{basename}{ext}"
-                temp_path = os.path.join(self.output_dir, temp_filename)
-
-                # Temp fájl írása
-                with open(temp_path, "wb") as f:
-                    f.write(decrypted_data)
-
-                # Intelligens névgenerálás
-                self.status_updated.emit(self.lang.get_text('intelligent_naming'))
-                intelligent_name = generate_intelligent_filename(None, None, temp_path, i + 1)
-                final_path = os.path.join(self.output_dir, intelligent_name)
-
-                # Átnevezés
-                os.rename(temp_path, final_path)
-
-                # Időbélyeg helyreállítás
-                self.status_updated.emit(self.lang.get_text('timestamp_restore'))
-                restore_file_timestamps(input_path, final_path)
-
-                successful_count += 1
-                completed_msg = f"{self.lang.get_text('completed')}: {intelligent_name}"
-                self.status_updated.emit(completed_msg)
-
-            except Exception as e:
-                error_msg = f"{self.lang.get_text('error')} {filename}: {str(e)}"
-                self.status_updated.emit(error_msg)
-
-                # Temp fájl törlése hiba esetén
-                temp_path = os.path.join(self.output_dir, f"temp_{os.path.splitext(filename)[0]}{os.path.splitext(filename)[1]}")
-                if os.path.exists(temp_path):
-                    try:
-                        os.remove(temp_path)
-                    except:
-                        pass
-
-            # Haladás frissítése
-            progress = int((i + 1) / len(files) * 100)
-            self.progress_updated.emit(progress)
-
-        # Kimeneti mappa átnevezése (ha van egyedi fájl)
-        if successful_count > 0:
-            self.status_updated.emit(self.lang.get_text('folder_rename'))
-            rename_folder_by_timestamps(self.output_dir)
-
-        result_msg = f"{successful_count}/{len(files)} {self.lang.get_text('files_processed')}"
-        return True, result_msg
+def initial_log_view_cap():
+    """Napló nézet kezdő sorkorlátja: LOCKMYPIX_LOG_VIEW_CAP (a tartományba szorítva), vagy LOG_VIEW_CAP"""
+    try:
+        cap = int(os.environ.get("LOCKMYPIX_LOG_VIEW_CAP", LOG_VIEW_CAP))
+    except ValueError:
+        return LOG_VIEW_CAP
+    return min(max(cap, LOG_VIEW_CAP_RANGE[0]), LOG_VIEW_CAP_RANGE[1])
 
-    def stop(self):
-        """Műveletek leállítása"""
-        self.should_stop = True
+# Szintek súlyosság szerint növekvő sorrendben, és a szűrhető szakaszok
+LOG_LEVELS = ("info", "warning", "error")
+LOG_STAGES = ("app", "scan", "decrypt")
 
-    def run(self):
-        """Fő futási logika"""
-        try:
-            # Jelszó ellenőrzés
-            self.status_updated.emit(self.lang.get_text("password_checking"))
-            if not self.test_password():
-                self.finished.emit(False, self.lang.get_text("wrong_password"))
-                return
+LOG_LEVEL_NUMBERS = {"info": logging.INFO, "warning": logging.WARNING, "error": logging.ERROR}
+LOG_LEVEL_COLORS = {"warning": QColor("#ffb900"), "error": QColor("#ff6b6b")}
 
-            # Fájlok feldolgozása
-            self.status_updated.emit(self.lang.get_text("decrypting"))
-            success, message = self.process_files()
-            self.finished.emit(success, message)
+class LogModel(QAbstractListModel):
+    """
+    Gyűrűpuffer alapú napló modell: legfeljebb `cap` sor, a legrégebbi sor kiesik
+    A QListView csak a látható sorokat rajzolja, így hosszú futásnál is állandó a memória
+    """
+    LevelRole = Qt.ItemDataRole.UserRole
+    StageRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, cap=LOG_VIEW_CAP, parent=None):
+        super().__init__(parent)
+        self.cap = cap
+        self.entries = deque()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.entries)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        text, level, stage = self.entries[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return text
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return LOG_LEVEL_COLORS.get(level)
+        if role == self.LevelRole:
+            return level
+        if role == self.StageRole:
+            return stage
+        return None
 
-        except Exception as e:
-            error_msg = f"{self.lang.get_text('error')}: {str(e)}"
-            self.finished.emit(False, error_msg)
+    def set_cap(self, cap):
+        """Sorkorlát módosítása (csökkentéskor a legrégebbi sorok kiesnek)"""
+        self.cap = cap
+        excess = len(self.entries) - cap
+        if excess > 0:
+            self.beginRemoveRows(QModelIndex(), 0, excess - 1)
+            for _ in range(excess):
+                self.entries.popleft()
+            self.endRemoveRows()
+
+    def append(self, text, level="info", stage="app"):
+        """Új sor a végére (telített puffernél a legrégebbi törlésével)"""
+        if len(self.entries) >= self.cap:
+            self.beginRemoveRows(QModelIndex(), 0, 0)
+            self.entries.popleft()
+            self.endRemoveRows()
+        row = len(self.entries)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.entries.append((text, level, stage))
+        self.endInsertRows()
+
+class LogFilterProxy(QSortFilterProxyModel):
+    """Napló szűrése minimális szint és szakasz szerint"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.min_level = LOG_LEVELS[0]
+        self.stage = None  # None = minden szakasz
+
+    def set_filter(self, min_level, stage):
+        self.min_level = min_level
+        self.stage = stage
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        index = self.sourceModel().index(source_row, 0, source_parent)
+        level = index.data(LogModel.LevelRole)
+        if LOG_LEVELS.index(level) < LOG_LEVELS.index(self.min_level):
+            return False
+        return self.stage is None or index.data(LogModel.StageRole) == self.stage
 
 class LockMyPixDecrypter(QMainWindow):
     """Fő alkalmazás ablak - KIBŐVÍTVE Pro funkciókkal"""
@@ -785,6 +200,9 @@ class LockMyPixDecrypter(QMainWindow):
     def __init__(self):
         super().__init__()
         self.worker = None
+        self.scan_worker = None
+        self.running_scans = set()  # Referencia a szál végéig (megszakítás után is)
+        self.input_index = None
         self.lang = LanguageManager()
         self.setup_logging()
         self.init_ui()
@@ -795,15 +213,10 @@ class LockMyPixDecrypter(QMainWindow):
         log_dir.mkdir(exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.log_file = log_dir / f"decrypt_{timestamp}.log"
+        self.json_log_file = log_dir / f"decrypt_{timestamp}.jsonl"
 
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(message)s',
-            handlers=[
-                logging.FileHandler(self.log_file, encoding='utf-8'),
-                logging.StreamHandler()
-            ]
-        )
+        # Olvasható napló + JSON-lines események, az írás háttérszálon
+        self.log_listener = start_async_logging(self.log_file, self.json_log_file)
 
     def init_ui(self):
         """UI inicializálása"""
@@ -934,6 +347,27 @@ class LockMyPixDecrypter(QMainWindow):
         output_layout.addWidget(self.output_browse)
         layout.addLayout(output_layout)
 
+        # Kimeneti formátum
+        format_layout = QHBoxLayout()
+        self.format_label = QLabel(self.lang.get_text("format_label"))
+        format_layout.addWidget(self.format_label)
+
+        self.format_combo = QComboBox()
+        for output_format in OUTPUT_FORMATS:
+            self.format_combo.addItem(self.lang.get_text(f"format_{output_format}"), output_format)
+        format_layout.addWidget(self.format_combo)
+
+        # Feldolgozási sorrend
+        self.order_label = QLabel(self.lang.get_text("order_label"))
+        format_layout.addWidget(self.order_label)
+
+        self.order_combo = QComboBox()
+        for order in ORDER_POLICIES:
+            self.order_combo.addItem(self.lang.get_text(f"order_{order}"), order)
+        format_layout.addWidget(self.order_combo)
+        format_layout.addStretch()
+        layout.addLayout(format_layout)
+
         return group
 
     def create_control_group(self):
@@ -973,6 +407,11 @@ class LockMyPixDecrypter(QMainWindow):
         self.status_label.setStyleSheet("color: #cccccc; font-size: 13px;")
         layout.addWidget(self.status_label)
 
+        # Átviteli sebesség és becsült hátralévő idő
+        self.stats_label = QLabel("")
+        self.stats_label.setStyleSheet("color: #999999; font-size: 12px; font-weight: normal;")
+        layout.addWidget(self.stats_label)
+
         return group
 
     def create_log_group(self):
@@ -980,12 +419,55 @@ class LockMyPixDecrypter(QMainWindow):
         group = QGroupBox(self.lang.get_text("log_group"))
         layout = QVBoxLayout(group)
 
-        self.log_text = QTextEdit()
-        self.log_text.setMaximumHeight(120)
-        layout.addWidget(self.log_text)
+        # Szűrők: minimális szint és szakasz
+        filter_layout = QHBoxLayout()
+        self.log_level_label = QLabel(self.lang.get_text("log_level_label"))
+        filter_layout.addWidget(self.log_level_label)
+        self.log_level_combo = QComboBox()
+        for level in LOG_LEVELS:
+            self.log_level_combo.addItem(self.lang.get_text(f"log_level_{level}"), level)
+        filter_layout.addWidget(self.log_level_combo)
+
+        self.log_stage_label = QLabel(self.lang.get_text("log_stage_label"))
+        filter_layout.addWidget(self.log_stage_label)
+        self.log_stage_combo = QComboBox()
+        self.log_stage_combo.addItem(self.lang.get_text("log_stage_all"), None)
+        for stage in LOG_STAGES:
+            self.log_stage_combo.addItem(self.lang.get_text(f"log_stage_{stage}"), stage)
+        filter_layout.addWidget(self.log_stage_combo)
+        filter_layout.addStretch()
+
+        # Megtartott sorok száma (gyűrűpuffer mérete)
+        self.log_cap_label = QLabel(self.lang.get_text("log_cap_label"))
+        filter_layout.addWidget(self.log_cap_label)
+        self.log_cap_spin = QSpinBox()
+        self.log_cap_spin.setRange(*LOG_VIEW_CAP_RANGE)
+        self.log_cap_spin.setSingleStep(1000)
+        self.log_cap_spin.setValue(initial_log_view_cap())
+        filter_layout.addWidget(self.log_cap_spin)
+        layout.addLayout(filter_layout)
+
+        self.log_level_combo.currentIndexChanged.connect(self.update_log_filter)
+        self.log_stage_combo.currentIndexChanged.connect(self.update_log_filter)
+
+        # Gyűrűpuffer modell + virtualizált lista (csak a látható sorok rajzolódnak)
+        self.log_model = LogModel(self.log_cap_spin.value(), parent=self)
+        self.log_cap_spin.valueChanged.connect(self.log_model.set_cap)
+        self.log_filter = LogFilterProxy(self)
+        self.log_filter.setSourceModel(self.log_model)
+
+        self.log_view = QListView()
+        self.log_view.setModel(self.log_filter)
+        self.log_view.setUniformItemSizes(True)
+        self.log_view.setMaximumHeight(120)
+        layout.addWidget(self.log_view)
 
         return group
 
+    def update_log_filter(self):
+        """Napló szűrő alkalmazása a kiválasztott szint és szakasz szerint"""
+        self.log_filter.set_filter(self.log_level_combo.currentData(), self.log_stage_combo.currentData())
+
     def get_browse_button_style(self):
         """Tallózás gombok stílusa"""
         return """
@@ -1134,10 +616,24 @@ class LockMyPixDecrypter(QMainWindow):
         self.control_group.setTitle(self.lang.get_text("controls_group"))
         self.progress_group.setTitle(self.lang.get_text("progress_group"))
         self.log_group.setTitle(self.lang.get_text("log_group"))
+        self.log_level_label.setText(self.lang.get_text("log_level_label"))
+        for index in range(self.log_level_combo.count()):
+            self.log_level_combo.setItemText(index, self.lang.get_text(f"log_level_{self.log_level_combo.itemData(index)}"))
+        self.log_stage_label.setText(self.lang.get_text("log_stage_label"))
+        self.log_cap_label.setText(self.lang.get_text("log_cap_label"))
+        for index in range(self.log_stage_combo.count()):
+            stage = self.log_stage_combo.itemData(index)
+            self.log_stage_combo.setItemText(index, self.lang.get_text(f"log_stage_{stage or 'all'}"))
 
         # Mezők
         self.input_label.setText(self.lang.get_text("input_label"))
         self.output_label.setText(self.lang.get_text("output_label"))
+        self.format_label.setText(self.lang.get_text("format_label"))
+        for index in range(self.format_combo.count()):
+            self.format_combo.setItemText(index, self.lang.get_text(f"format_{self.format_combo.itemData(index)}"))
+        self.order_label.setText(self.lang.get_text("order_label"))
+        for index in range(self.order_combo.count()):
+            self.order_combo.setItemText(index, self.lang.get_text(f"order_{self.order_combo.itemData(index)}"))
         self.input_path.setPlaceholderText(self.lang.get_text("input_placeholder"))
         self.output_path.setPlaceholderText(self.lang.get_text("output_placeholder"))
 
@@ -1201,7 +697,7 @@ class LockMyPixDecrypter(QMainWindow):
                 font-weight: bold;
             }
 
-            QTextEdit {
+            QListView {
                 background-color: #1e1e1e;
                 color: #ffffff;
                 font-family: 'Courier New', monospace;
@@ -1291,12 +787,13 @@ class LockMyPixDecrypter(QMainWindow):
             }
         """
 
-    def log_message(self, message):
-        """Napló üzenet"""
+    def log_message(self, message, level="info", stage="app"):
+        """Napló üzenet (a nézetben korlátozott számú sor, a naplófájlban minden)"""
         timestamp = datetime.now().strftime("%H:%M:%S")
         formatted = f"[{timestamp}] {message}"
-        self.log_text.append(formatted)
-        logging.info(message)
+        self.log_model.append(formatted, level, stage)
+        self.log_view.scrollToBottom()
+        logging.log(LOG_LEVEL_NUMBERS[level], message)
 
     def browse_input(self):
         """
@@ -1350,6 +847,8 @@ class LockMyPixDecrypter(QMainWindow):
         KIBŐVÍTVE minden támogatott kiterjesztéssel és .zip.cmpexport-tal
         """
         input_path = self.input_path.text().strip()
+        self.input_index = None
+        self.cancel_input_scan()
         if not input_path:
             self.start_btn.setEnabled(False)
             self.start_btn.setText(self.lang.get_text("start_button") + " - Nincs fájl")
@@ -1361,7 +860,7 @@ class LockMyPixDecrypter(QMainWindow):
             if os.path.exists(input_path):
                 self.start_btn.setEnabled(True)
                 self.start_btn.setText(self.lang.get_text("start_button"))
-                self.log_message(f"LockMyPix backup fájl észlelve: {os.path.basename(input_path)}")
+                self.log_message(f"LockMyPix backup fájl észlelve: {os.path.basename(input_path)}", stage="scan")
             else:
                 self.start_btn.setEnabled(False)
                 self.start_btn.setText(self.lang.get_text("start_button") + " - Fájl nem létezik")
@@ -1370,23 +869,13 @@ class LockMyPixDecrypter(QMainWindow):
         # Egyedi titkosított fájl ellenőrzése
         if os.path.isfile(input_path):
             file_ext = os.path.splitext(input_path)[1].lower()
-            # Extension mapping betöltése
-            extension_map = {
-                ".vp3": ".mp4", ".vo1": ".webm", ".v27": ".mpg", ".vb9": ".avi",
-                ".v77": ".mov", ".v78": ".wmv", ".v82": ".dv", ".vz9": ".divx",
-                ".vi3": ".ogv", ".v1u": ".h261", ".v6m": ".h264", ".6zu": ".jpg",
-                ".tr7": ".gif", ".p5o": ".png", ".8ur": ".bmp", ".33t": ".tiff",
-                ".20i": ".webp", ".v93": ".heic", ".v91": ".flv", ".v80": ".3gpp",
-                ".vo4": ".ts", ".v99": ".mkv", ".vr2": ".mpeg", ".vv3": ".dpg",
-                ".v81": ".rmvb", ".vz8": ".vob", ".wi2": ".asf", ".vi4": ".h263",
-                ".v2u": ".f4v", ".v76": ".m4v", ".v75": ".ram", ".v74": ".rm",
-                ".v3u": ".mts", ".v92": ".dng", ".r89": ".ps", ".v79": ".3gp",
-            }
 
-            if file_ext in extension_map:
+            if file_ext in EXTENSION_MAP:
+                self.input_index = InputIndex.scan(input_path)
                 self.start_btn.setEnabled(True)
                 self.start_btn.setText(self.lang.get_text("start_button"))
-                self.log_message(f"Támogatott titkosított fájl: {os.path.basename(input_path)} ({file_ext})")
+                self.log_message(f"Támogatott titkosított fájl: {os.path.basename(input_path)} ({file_ext})",
+                                 stage="scan")
             else:
                 self.start_btn.setEnabled(False)
                 self.start_btn.setText(self.lang.get_text("start_button") + " - Nem támogatott fájl")
@@ -1399,56 +888,75 @@ class LockMyPixDecrypter(QMainWindow):
             self.output_browse.setEnabled(False)
             return
 
-        # Extension mapping betöltése
-        extension_map = {
-            ".vp3": ".mp4", ".vo1": ".webm", ".v27": ".mpg", ".vb9": ".avi",
-            ".v77": ".mov", ".v78": ".wmv", ".v82": ".dv", ".vz9": ".divx",
-            ".vi3": ".ogv", ".v1u": ".h261", ".v6m": ".h264", ".6zu": ".jpg",
-            ".tr7": ".gif", ".p5o": ".png", ".8ur": ".bmp", ".33t": ".tiff",
-            ".20i": ".webp", ".v93": ".heic", ".v91": ".flv", ".v80": ".3gpp",
-            ".vo4": ".ts", ".v99": ".mkv", ".vr2": ".mpeg", ".vv3": ".dpg",
-            ".v81": ".rmvb", ".vz8": ".vob", ".wi2": ".asf", ".vi4": ".h263",
-            ".v2u": ".f4v", ".v76": ".m4v", ".v75": ".ram", ".v74": ".rm",
-            ".v3u": ".mts", ".v92": ".dng", ".r89": ".ps", ".v79": ".3gp",
-        }
-
-        supported_extensions = list(extension_map.keys())
-
-        # Keressünk támogatott titkosított fájlokat a mappában
-        has_supported_files = False
-        total_count = 0
-        extension_counts = {}
+        # Háttérben futó scandir bejárás - az index a workerhez is továbbadódik
+        self.start_btn.setEnabled(False)
+        self.start_btn.setText(self.lang.get_text("start_button") + " - " + self.lang.get_text("scanning"))
+
+        scan_worker = ScanWorker(input_path, exclude=[self.output_path.text().strip()])
+        scan_worker.first_supported_found.connect(lambda: self.on_scan_first_supported(scan_worker))
+        scan_worker.partial_counts.connect(lambda counts: self.on_scan_partial_counts(scan_worker, counts))
+        scan_worker.scan_finished.connect(lambda index: self.on_scan_finished(scan_worker, index))
+        scan_worker.scan_failed.connect(lambda error: self.on_scan_failed(scan_worker, error))
+        scan_worker.finished.connect(lambda: self.running_scans.discard(scan_worker))
+        self.scan_worker = scan_worker
+        self.running_scans.add(scan_worker)
+        scan_worker.start()
+
+    def cancel_input_scan(self):
+        """Folyamatban lévő háttérbejárás megszakítása (a késve érkező jelzései figyelmen kívül maradnak)"""
+        if self.scan_worker:
+            self.scan_worker.stop()
+            self.scan_worker = None
+
+    def on_scan_first_supported(self, scan_worker):
+        """Az első támogatott fájlnál a Start gomb azonnal aktív"""
+        if scan_worker is not self.scan_worker:
+            return
+        self.start_btn.setEnabled(True)
+        self.start_btn.setText(self.lang.get_text("start_button"))
 
-        try:
-            files = os.listdir(input_path)
-            for file in files:
-                file_path = os.path.join(input_path, file)
-                # Csak fájlokat vizsgálunk
-                if os.path.isfile(file_path):
-                    file_ext = os.path.splitext(file)[1].lower()
-                    if file_ext in supported_extensions:
-                        has_supported_files = True
-                        total_count += 1
-                        extension_counts[file_ext] = extension_counts.get(file_ext, 0) + 1
-        except Exception as e:
-            self.log_message(f"Hiba a mappa ellenőrzésekor: {str(e)}")
-            self.start_btn.setEnabled(False)
+    def on_scan_partial_counts(self, scan_worker, extension_counts):
+        """Részleges találatszám megjelenítése kiterjesztésenként"""
+        if scan_worker is not self.scan_worker:
             return
+        ext_stats = ", ".join([f"{ext}: {count}" for ext, count in extension_counts.items()])
+        self.status_label.setText(f"{self.lang.get_text('scanning')} {sum(extension_counts.values())} db ({ext_stats})")
+
+    def on_scan_finished(self, scan_worker, index):
+        """Bejárás vége - index eltárolása és összesítés"""
+        if scan_worker is not self.scan_worker:
+            return
+        self.scan_worker = None
+        self.input_index = index
+
+        extension_counts = index.extension_counts()
+        total_count = sum(extension_counts.values())
+        self.status_label.setText(self.lang.get_text("ready_status"))
 
         # Start gomb állapotának frissítése
-        if has_supported_files:
+        if total_count > 0:
             self.start_btn.setEnabled(True)
             self.start_btn.setText(self.lang.get_text("start_button"))
 
             # Részletes statisztika naplózása
             ext_stats = ", ".join([f"{ext}: {count}" for ext, count in extension_counts.items()])
             log_msg = f"Talált támogatott fájlok: {total_count} db ({ext_stats})"
-            self.log_message(log_msg)
+            self.log_message(log_msg, stage="scan")
         else:
+            supported_extensions = list(EXTENSION_MAP.keys())
             self.start_btn.setEnabled(False)
             self.start_btn.setText(self.lang.get_text("start_button") + " - Nincs támogatott fájl")
             supported_ext_list = ", ".join(supported_extensions[:10]) + "..." if len(supported_extensions) > 10 else ", ".join(supported_extensions)
-            self.log_message(f"Nem található támogatott fájl. Támogatott: .zip.cmpexport vagy {supported_ext_list}")
+            self.log_message(f"Nem található támogatott fájl. Támogatott: .zip.cmpexport vagy {supported_ext_list}",
+                             "warning", "scan")
+
+    def on_scan_failed(self, scan_worker, error):
+        """Bejárási hiba"""
+        if scan_worker is not self.scan_worker:
+            return
+        self.scan_worker = None
+        self.log_message(f"Hiba a mappa ellenőrzésekor: {error}", "error", "scan")
+        self.start_btn.setEnabled(False)
 
     def browse_output(self):
         """Kimeneti mappa kiválasztás"""
@@ -1545,15 +1053,22 @@ class LockMyPixDecrypter(QMainWindow):
         if not password:
             return
 
+        # Még futó háttérbejárás: a worker maga készít indexet
+        self.cancel_input_scan()
+
         # UI állapot
         self.start_btn.setEnabled(False)
         self.stop_btn.setEnabled(True)
         self.progress_bar.setValue(0)
         self.log_message(self.lang.get_text("decrypt_starting"))
 
-        # Worker indítása
-        self.worker = DecryptWorker(password, input_path, output_dir, self.lang)
+        # Worker indítása (archív formátumnál a kimenet egy .tar/.zip fájl)
+        output_format = self.format_combo.currentData()
+        output_target = archive_target_path(output_dir, output_format)
+        self.worker = DecryptWorker(password, input_path, output_target, self.lang, output_format,
+                                    input_index=self.input_index, order=self.order_combo.currentData())
         self.worker.progress_updated.connect(self.progress_bar.setValue)
+        self.worker.progress_stats.connect(self.update_progress_stats)
         self.worker.status_updated.connect(self.update_status)
         self.worker.finished.connect(self.decrypt_finished)
         self.worker.start()
@@ -1567,7 +1082,12 @@ class LockMyPixDecrypter(QMainWindow):
     def update_status(self, message):
         """Állapot frissítés"""
         self.status_label.setText(message)
-        self.log_message(message)
+        is_error = message.startswith((self.lang.get_text('error'), "Backup feldolgozási hiba"))
+        self.log_message(message, "error" if is_error else "info", "decrypt")
+
+    def update_progress_stats(self, stats):
+        """Bájt alapú haladás, MB/s, fájl/s és ETA megjelenítése"""
+        self.stats_label.setText(format_progress_stats(stats))
 
     def decrypt_finished(self, success, message):
         """Dekriptálás befejezés"""
@@ -1582,7 +1102,7 @@ class LockMyPixDecrypter(QMainWindow):
 
         self.status_label.setText(self.lang.get_text("finished_status"))
         finished_msg = f"{self.lang.get_text('finished')}: {message}"
-        self.log_message(finished_msg)
+        self.log_message(finished_msg, "info" if success else "error", "decrypt")
 
     def open_log(self):
         """Napló megnyitása"""
@@ -1604,8 +1124,111 @@ class LockMyPixDecrypter(QMainWindow):
             error_msg = f"{self.lang.get_text('log_open_error')}: {e}"
             QMessageBox.warning(self, self.lang.get_text("error_title"), error_msg)
 
+def run_cli(argv):
+    """
+    Parancssoros (GUI nélküli) futtatás
+
+    Példa: lockmypix-decrypter.py backup.zip.cmpexport -o - --format tar | tar -x -C /cél
+    """
+    parser = argparse.ArgumentParser(description="LockMyPix Decrypter")
+    parser.add_argument("input", help="Titkosított fájlok mappája vagy .zip.cmpexport fájl")
+    parser.add_argument("-o", "--output", required=True, help="Kimeneti mappa vagy archívum ('-' = stdout)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="dir", help="Kimeneti formátum")
+    parser.add_argument("--password", help="Jelszó (alapértelmezés: LOCKMYPIX_PASSWORD vagy bekérés)")
+    parser.add_argument("--manifest", help="Audit manifest SHA-256 hash-ekkel (.csv vagy .jsonl)")
+    parser.add_argument("--hash-source", action="store_true", help="A titkosított forrás hash-ét is rögzíti")
+    parser.add_argument("--no-recursive", action="store_true", help="Csak a bemeneti mappa legfelső szintje")
+    parser.add_argument("--memory-budget", type=int, default=MEMORY_BUDGET // (1024 * 1024), metavar="MB",
+                        help="Egyszerre feldolgozás alatt álló adat felső korlátja")
+    parser.add_argument("--chunk-size", type=int, metavar="KB", help="Darabméret kézi megadása (hangolás helyett)")
+    parser.add_argument("--workers", type=int, metavar="N", help="Párhuzamos szálak kézi megadása (hangolás helyett)")
+    parser.add_argument("--no-autotune", action="store_true", help="Hangolás kikapcsolása (alapértékek)")
+    parser.add_argument("--retune", action="store_true", help="Kimeneti eszköz újrakalibrálása")
+    parser.add_argument("--order", choices=ORDER_POLICIES, default=ORDER_POLICIES[0],
+                        help="Feldolgozási sorrend: bejárási / legnagyobb / képek és kicsik / album")
+    parser.add_argument("--cipher", choices=(CIPHER_AUTO,) + CIPHER_BACKENDS, default=CIPHER_AUTO,
+                        help="AES-CTR backend (auto: önteszt után a mérésben leggyorsabb)")
+    parser.add_argument("--plan", metavar="PLAN.json",
+                        help="Dry-run: csak fejlécek olvasása, a terv mentése, dekriptálás nélkül")
+    parser.add_argument("--execute-plan", metavar="PLAN.json", help="Korábban mentett terv végrehajtása")
+    parser.add_argument("--log-json", metavar="LOG.jsonl", help="Strukturált eseménynapló (JSON-lines)")
+    parser.add_argument("--daemon", metavar="SOCKET",
+                        help="Feladat átadása egy futó démonnak (python -m lockmypix.daemon SOCKET)")
+    parser.add_argument("--lang", choices=("hu", "en"), default="hu")
+    args = parser.parse_args(argv)
+
+    if args.log_json:
+        start_async_logging(None, args.log_json, console=False)
+
+    if args.output == "-" and args.format == "dir":
+        parser.error("stdout kimenet csak tar vagy zip formátummal használható")
+
+    password = args.password or os.environ.get("LOCKMYPIX_PASSWORD") or getpass.getpass()
+
+    if args.daemon:
+        return run_daemon_job(args, password)
+
+    # Dry-run: terv készítése és mentése
+    if args.plan:
+        plan = build_plan(args.input, args.output, password, recursive=not args.no_recursive)
+        save_plan(plan, args.plan)
+        print(format_plan_summary(plan), file=sys.stderr)
+        return 0
+
+    plan = load_plan(args.execute_plan) if args.execute_plan else None
+
+    # Állapotüzenetek stderr-re, hogy az stdout archívum tiszta maradjon (Qt nélkül, a Decryptor közvetlenül)
+    lang = LanguageManager()
+    lang.set_language(args.lang)
+    decryptor = Decryptor(password, args.input, archive_target_path(args.output, args.format), lang, args.format,
+                          manifest_path=args.manifest, hash_source=args.hash_source,
+                          recursive=not args.no_recursive, plan=plan,
+                          memory_budget=args.memory_budget * 1024 * 1024,
+                          chunk_size=args.chunk_size * 1024 if args.chunk_size else None,
+                          workers=args.workers, autotune=not args.no_autotune, retune=args.retune,
+                          order=args.order, cipher_backend=args.cipher,
+                          on_status=lambda message: print(message, file=sys.stderr))
+    success, message = decryptor.run()
+
+    print(message, file=sys.stderr)
+    return 0 if success else 1
+
+def run_daemon_job(args, password):
+    """Feladat futtatása a démon meleg folyamatkészletén - az események stderr-re"""
+    if args.output == "-":
+        print("a démon nem ír stdout-ra: adjon meg kimeneti fájlt", file=sys.stderr)
+        return 2
+    output_format = "dir" if args.plan else args.format
+    options = {
+        "output_format": output_format, "manifest_path": args.manifest and os.path.abspath(args.manifest),
+        "hash_source": args.hash_source, "recursive": not args.no_recursive,
+        "memory_budget": args.memory_budget * 1024 * 1024,
+        "chunk_size": args.chunk_size * 1024 if args.chunk_size else None, "workers": args.workers,
+        "autotune": not args.no_autotune, "retune": args.retune, "order": args.order,
+        "cipher_backend": args.cipher, "lang": args.lang,
+        "plan": os.path.abspath(args.plan or args.execute_plan) if (args.plan or args.execute_plan) else None,
+    }
+    request = {
+        "job": "plan" if args.plan else "decrypt",
+        "input": os.path.abspath(args.input),
+        "output": os.path.abspath(archive_target_path(args.output, output_format)),
+        "password": password,
+        "options": options,
+    }
+
+    for event in daemon_submit(args.daemon, request):
+        if event["event"] == "status":
+            print(event["message"], file=sys.stderr)
+        elif event["event"] in ("finished", "error"):
+            print(event["message"], file=sys.stderr)
+            return 0 if event.get("success") else 1
+    return 1
+
 def main():
     """Főprogram"""
+    if len(sys.argv) > 1:
+        sys.exit(run_cli(sys.argv[1:]))
+
     app = QApplication(sys.argv)
     window = LockMyPixDecrypter()
     window.show()
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+LockMyPix Decrypter - importálható, Qt-független mag
+
+    from lockmypix import Vault, Decryptor
+
+    with Vault("/mnt/export.zip.cmpexport", password) as vault:
+        for entry in vault.entries():
+            print(entry.name, entry.date, entry.size)
+
+    decryptor = Decryptor(password, "/mnt/export.zip.cmpexport", "/srv/out", on_status=print)
+    for result in decryptor.results():
+        print(result.source, "->", result.output)
+    success, message = decryptor.summary
+
+A GUI és a parancssor (lockmypix-decrypter.py) ennek a csomagnak vékony kliense.
+"""
+
+from .formats import EXTENSION_MAP, BACKUP_EXTENSION
+from .streaming import CHUNK_SIZE, OperationCancelled
+from .scheduling import DECRYPT_WORKERS, MEMORY_BUDGET, ORDER_POLICIES
+from .crypto import derive_key, EncryptedReader
+from .ciphers import CIPHER_AUTO, CIPHER_BACKENDS, available_backends, select_backend
+from .index import InputIndex
+from .progress import format_progress_stats
+from .logs import LOGGER, start_async_logging
+from .sinks import OUTPUT_FORMATS, archive_target_path
+from .plan import build_plan, save_plan, load_plan, format_plan_summary
+from .i18n import LanguageManager
+from .decryptor import Decryptor, DecryptResult
+from .vault import Vault, VaultEntry
+
+__all__ = [
+    "Vault", "VaultEntry", "Decryptor", "DecryptResult", "LanguageManager",
+    "build_plan", "save_plan", "load_plan", "format_plan_summary",
+    "InputIndex", "OperationCancelled", "EncryptedReader", "derive_key",
+    "format_progress_stats", "start_async_logging", "LOGGER", "archive_target_path",
+    "EXTENSION_MAP", "BACKUP_EXTENSION", "OUTPUT_FORMATS", "ORDER_POLICIES",
+    "CHUNK_SIZE", "DECRYPT_WORKERS", "MEMORY_BUDGET",
+    "CIPHER_AUTO", "CIPHER_BACKENDS", "available_backends", "select_backend",
+]
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""asyncio felület: a blokkoló Vault és Decryptor meghajtása eseményhurokból."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .vault import Vault
+from .decryptor import Decryptor
+
+# ======================================
+# ASYNCIO - Kezelt executor, visszanyomás és megszakítás
+# ======================================
+
+# Közös executor szálainak száma: egy futó feladat egyszerre legfeljebb egy szálat
+# foglal (a következő eredményre várva), az AES és a fájl I/O a Decryptor saját
+# szálkészletében fut - így egy eseményhurok sok tárolót hajthat párhuzamosan
+AIO_EXECUTOR_THREADS = 32
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# Jelölő a kimerült generátorhoz (a next() alapértéke)
+_DONE = object()
+
+def shared_executor():
+    """A modul közös executora (első használatkor jön létre, a folyamat végéig él)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=AIO_EXECUTOR_THREADS, thread_name_prefix="lockmypix-aio")
+        return _executor
+
+async def run_blocking(function, *args, executor=None):
+    """Blokkoló hívás futtatása az executorban"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor or shared_executor(), function, *args)
+
+async def iterate_blocking(generator, executor=None, on_cancel=None):
+    """
+    Blokkoló generátor async iterátorként
+
+    Visszanyomás: a generátor csak akkor lép tovább, amikor a fogyasztó a következő
+    elemet kéri (a Decryptor szálkészlete ilyenkor legfeljebb két környi munkát tart
+    függőben). Megszakításkor (task.cancel() vagy a ciklus elhagyása) az on_cancel
+    jelez a futó műveletnek, majd a generátor lezárul az executorban - a félkész
+    temp fájlok így ugyanúgy takarítódnak, mint szinkron leállításnál.
+    """
+    loop = asyncio.get_running_loop()
+    executor = executor or shared_executor()
+    future = None
+    finished = False
+    try:
+        while True:
+            future = loop.run_in_executor(executor, next, generator, _DONE)
+            item = await asyncio.shield(future)
+            if item is _DONE:
+                finished = True
+                return
+            yield item
+    finally:
+        if not finished:
+            # Megszakítás vagy hiba: leállítás jelzése, a még futó next() megvárása, majd lezárás
+            if on_cancel:
+                on_cancel()
+            if future is not None and not future.done():
+                await asyncio.wait([future])
+            await loop.run_in_executor(executor, generator.close)
+
+class AsyncVault:
+    """
+    Vault asyncio-ból: a ZIP megnyitás, a fejlécvizsgálat és a dekriptált olvasás
+    az executorban fut, az eseményhurok nem áll meg
+
+        async with AsyncVault(path, password) as vault:
+            async for entry in vault.entries():
+                data = await vault.read(entry)
+    """
+
+    def __init__(self, path, password, recursive=True, executor=None):
+        self.vault = Vault(path, password, recursive)
+        self.executor = executor
+
+    async def __aenter__(self):
+        await run_blocking(self.vault.open, executor=self.executor)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await run_blocking(self.vault.close, executor=self.executor)
+
+    def entries(self):
+        """VaultEntry elemek async iterátora (megszakítható)"""
+        stop = threading.Event()
+        return iterate_blocking(self.vault.entries(stop.is_set), self.executor, stop.set)
+
+    async def read(self, entry):
+        """Bejegyzés teljes dekriptált tartalma"""
+        return await run_blocking(self.vault.read, entry, executor=self.executor)
+
+    def decryptor(self, output_dir, **options):
+        """AsyncDecryptor ugyanerre a tárolóra"""
+        return AsyncDecryptor(self.vault.decryptor(output_dir, **options), self.executor)
+
+class AsyncDecryptor:
+    """
+    Decryptor asyncio-ból: results() async iterátor, run() awaitable (siker, üzenet)
+
+    Az on_status / on_progress callbackek a dekriptáló szálakon futnak - eseményhurok
+    felé loop.call_soon_threadsafe-fel érdemes továbbítani őket.
+    """
+
+    def __init__(self, decryptor, executor=None):
+        self.decryptor = decryptor
+        self.executor = executor
+
+    @property
+    def summary(self):
+        return self.decryptor.summary
+
+    def results(self):
+        """DecryptResult elemek a bemenet rögzített sorrendjében (a task megszakítása leállítja a futást)"""
+        return iterate_blocking(self.decryptor.results(), self.executor, self.decryptor.stop)
+
+    async def run(self):
+        """Teljes futás; az eredmény (siker, üzenet)"""
+        async for _ in self.results():
+            pass
+        return self.decryptor.summary
+
+async def decrypt(password, input_path, output_dir, executor=None, **options):
+    """
+    Mappa vagy .zip.cmpexport dekriptálása a kimeneti célba (dir / tar / zip) awaitable-ként
+
+    Returns:
+        tuple: (siker, üzenet) - megszakításkor asyncio.CancelledError
+    """
+    return await AsyncDecryptor(Decryptor(password, input_path, output_dir, **options), executor).run()
@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+"""Cserélhető AES-CTR backendek: megfelelőségi önteszt és a leggyorsabb kiválasztása."""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from Crypto.Cipher import AES
+from Crypto.Util.strxor import strxor
+
+# OpenSSL alapú AES (opcionális)
+try:
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+    HAS_CRYPTOGRAPHY = True
+except ImportError:
+    HAS_CRYPTOGRAPHY = False
+
+from .crypto import derive_key, create_ctr_cipher
+
+# ======================================
+# TITKOSÍTÁS - Backendek (mind ugyanazt az AES-CTR kulcsfolyamot adják)
+# ======================================
+
+CIPHER_AUTO = "auto"
+CIPHER_BACKENDS = ("pycryptodome", "cryptography", "xor")
+
+# A közös kulcsfolyam gyorsítótárának felső határa kulcsonként (a fájlok ennél
+# hosszabb része a háttér-backenddel dekriptálódik). A puffer egyszer, teljes
+# méretben foglalódik, és a szükséges hosszig töltődik (növeléskor nincs másolat);
+# a Decryptor a memóriakeretéből levonja (reserved_bytes)
+KEYSTREAM_CACHE_MAX = 16 * 1024 * 1024
+
+# Egyszerre megtartott kulcsfolyamok (a démon sok jelszóval is találkozhat)
+KEYSTREAM_KEYS = 2
+
+# A kulcsfolyam töltése ekkora darabokban (ennyi az átmeneti többletmemória)
+KEYSTREAM_FILL_CHUNK = 1024 * 1024
+
+def counter_block(key, block_offset):
+    """A block_offset-edik 16 bájtos blokk számlálója (IV = kulcs, 128 bites átfordulással)"""
+    return ((int.from_bytes(key, "big") + block_offset) % (1 << 128)).to_bytes(16, "big")
+
+class PycryptodomeBackend:
+    """Az eredeti megvalósítás (pycryptodome AES.MODE_CTR)"""
+    name = "pycryptodome"
+    reserved_bytes = 0
+
+    def create(self, key, block_offset=0):
+        return create_ctr_cipher(key, block_offset)
+
+class OpenSSLCipher:
+    """cryptography CTR kontextus a pycryptodome cipher felületével (decrypt / encrypt)"""
+    __slots__ = ("context",)
+
+    def __init__(self, key, block_offset):
+        self.context = Cipher(algorithms.AES(key), modes.CTR(counter_block(key, block_offset))).decryptor()
+
+    def decrypt(self, data):
+        return self.context.update(data)
+
+    encrypt = decrypt
+
+class CryptographyBackend:
+    """cryptography csomag (OpenSSL, AES-NI)"""
+    name = "cryptography"
+    reserved_bytes = 0
+
+    def create(self, key, block_offset=0):
+        return OpenSSLCipher(key, block_offset)
+
+class XorKeystreamCipher:
+    """
+    Egy fájl dekriptálása a közös kulcsfolyammal: a gyorsítótárazott részen egy
+    XOR, utána a háttér-backend cipherje (a gyorsítótár végétől indítva)
+    """
+    __slots__ = ("engine", "key", "position", "tail")
+
+    def __init__(self, engine, key, block_offset):
+        self.engine = engine
+        self.key = key
+        self.position = block_offset * 16
+        self.tail = None
+
+    def decrypt(self, data):
+        start = self.position
+        end = start + len(data)
+        cache_max = self.engine.cache_max
+        if end <= cache_max:
+            self.position = end
+            return strxor(data, memoryview(self.engine.keystream(self.key, end))[start:end])
+
+        if start < cache_max:
+            # A darab átnyúlik a gyorsítótár végén: két részben
+            split = cache_max - start
+            head = self.decrypt(memoryview(data)[:split])
+            return head + self.decrypt(memoryview(data)[split:])
+
+        if self.tail is None:
+            # Blokkhatáron: a gyorsítótár vége vagy a blokkeltolás (16 bájtra igazított)
+            self.tail = self.engine.base.create(self.key, start // 16)
+        self.position = end
+        return self.tail.decrypt(data)
+
+    encrypt = decrypt
+
+class XorKeystreamBackend:
+    """
+    Közös kulcsfolyam: az eredeti algoritmusban a kulcs és az IV minden fájlnál
+    azonos, így a kulcsfolyam is - egyszer kell kiszámolni, fájlonként már csak XOR
+    """
+    name = "xor"
+
+    def __init__(self, base=None, cache_max=KEYSTREAM_CACHE_MAX):
+        self.base = base or PycryptodomeBackend()
+        self.cache_max = cache_max - cache_max % 16
+        self.reserved_bytes = KEYSTREAM_KEYS * self.cache_max  # a gyorsítótár felső határa
+        self.keystreams = OrderedDict()  # kulcs -> [puffer (bytearray, cache_max), kitöltött hossz]
+        self.lock = threading.Lock()
+
+    def keystream(self, key, length):
+        """
+        Puffer, aminek legalább az első length bájtja kulcsfolyam (length <= cache_max)
+        A kitöltött rész nem változik, így zár nélkül olvasható
+        """
+        entry = self.keystreams.get(key)
+        if entry is not None and entry[1] >= length:
+            return entry[0]
+        with self.lock:
+            entry = self.keystreams.get(key)
+            if entry is None:
+                entry = self.keystreams[key] = [bytearray(self.cache_max), 0]
+            buffer, filled = entry
+            if filled < length:
+                # Duplázva nő (legfeljebb cache_max-ig), darabonként töltve a helyén
+                size = min(max(length, 2 * filled), self.cache_max)
+                size += -size % 16
+                cipher = self.base.create(key, filled // 16)
+                while filled < size:
+                    step = min(KEYSTREAM_FILL_CHUNK, size - filled)
+                    buffer[filled:filled + step] = cipher.decrypt(bytes(step))
+                    filled += step
+                entry[1] = filled
+            self.keystreams.move_to_end(key)
+            while len(self.keystreams) > KEYSTREAM_KEYS:
+                self.keystreams.popitem(last=False)
+            return buffer
+
+    def create(self, key, block_offset=0):
+        return XorKeystreamCipher(self, key, block_offset)
+
+def available_backends():
+    """A telepített csomagokkal elérhető backendek nevei"""
+    return tuple(name for name in CIPHER_BACKENDS if name != "cryptography" or HAS_CRYPTOGRAPHY)
+
+def new_backend(name, keystream_cache=KEYSTREAM_CACHE_MAX):
+    """Backend példány név szerint (a XOR motor alatt a leggyorsabb elérhető AES fut)"""
+    if name not in available_backends():
+        raise ValueError(f"cipher backend: {name} nem elérhető (elérhető: {', '.join(available_backends())})")
+    if name == "pycryptodome":
+        return PycryptodomeBackend()
+    if name == "cryptography":
+        return CryptographyBackend()
+    base = CryptographyBackend() if HAS_CRYPTOGRAPHY else PycryptodomeBackend()
+    return XorKeystreamBackend(base, keystream_cache)
+
+# ======================================
+# TITKOSÍTÁS - Megfelelőségi önteszt és mérés alapú kiválasztás
+# ======================================
+
+# Önteszt: kulcsok (a 128 bites számláló átfordulásával is), blokkeltolások és a darabolás mintája
+CONFORMANCE_KEYS = (derive_key("lockmypix"), bytes(16), b"\xff" * 15 + b"\xf0")
+CONFORMANCE_OFFSETS = (0, 1, 255, 4097)
+CONFORMANCE_CHUNKS = (1, 15, 16, 17, 4096, 65551)
+CONFORMANCE_BYTES = 160 * 1024
+
+# Mérés: egy kör "fájljai" (mindegyik friss cipherrel, darabonként) - fényképek és egy
+# a kulcsfolyam-gyorsítótárnál hosszabb videó, így a XOR backend a gyorsítótár utáni,
+# háttér-backenddel dekriptált részt is megfizeti; a legjobb kör számít
+BENCHMARK_FILES = (2 * 1024 * 1024,) * 4 + (2 * KEYSTREAM_CACHE_MAX,)
+BENCHMARK_CHUNK = 1024 * 1024
+BENCHMARK_ROUNDS = 3
+
+def reference_keystream(key, block_offset, length):
+    """Referencia kulcsfolyam a CTR definíciója szerint: a számlálóblokkok AES-ECB titkosítása"""
+    blocks = b"".join(counter_block(key, block_offset + i) for i in range(-(-length // 16)))
+    return AES.new(key, AES.MODE_ECB).encrypt(blocks)[:length]
+
+def check_conformance(name):
+    """
+    Bit-pontos egyezés a referenciával minden kulcson és blokkeltoláson, szabálytalan darabolással
+    (a XOR motor kis gyorsítótárral fut, hogy a gyorsítótár vége is próbára kerüljön)
+
+    Returns:
+        bool: A backend használható-e
+    """
+    backend = new_backend(name, keystream_cache=CONFORMANCE_BYTES // 2)
+    data = os.urandom(CONFORMANCE_BYTES)
+    for key in CONFORMANCE_KEYS:
+        for block_offset in CONFORMANCE_OFFSETS:
+            expected = strxor(data, reference_keystream(key, block_offset, len(data)))
+            cipher = backend.create(key, block_offset)
+            pieces, position = [], 0
+            while position < len(data):
+                # Szabálytalan darabolás: blokkhatáron belül, pontosan rajta és átlépve is
+                chunk_size = CONFORMANCE_CHUNKS[len(pieces) % len(CONFORMANCE_CHUNKS)]
+                pieces.append(bytes(cipher.decrypt(data[position:position + chunk_size])))
+                position += chunk_size
+            if b"".join(pieces) != expected:
+                return False
+    return True
+
+def measure_backend(name):
+    """Dekriptálási sebesség (MB/s) egy szálon, friss példánnyal, a BENCHMARK_FILES mintán"""
+    backend = new_backend(name)
+    key = derive_key("lockmypix-benchmark")
+    block = os.urandom(BENCHMARK_CHUNK)
+    total = sum(BENCHMARK_FILES)
+    best = 0.0
+    for _ in range(BENCHMARK_ROUNDS + 1):  # az első kör bemelegítés (XOR: kulcsfolyam építése)
+        started = time.perf_counter()
+        for size in BENCHMARK_FILES:
+            cipher = backend.create(key)
+            for _ in range(size // BENCHMARK_CHUNK):
+                cipher.decrypt(block)
+        best = max(best, total / max(time.perf_counter() - started, 1e-9) / (1024 * 1024))
+    return best
+
+_selected = {}
+_selected_lock = threading.Lock()
+
+def select_backend(name=CIPHER_AUTO):
+    """
+    Backend kiválasztása folyamatonként egyszer (az eredmény gyorsítótárazva)
+
+    auto: az önteszten átment backendek közül a mérésben leggyorsabb; név szerint
+    megadva az a backend (ha nem elérhető vagy nem megfelelő: ValueError)
+
+    Returns:
+        tuple: (backend, {név: MB/s} mérési eredmények)
+    """
+    with _selected_lock:
+        if name not in _selected:
+            if name == CIPHER_AUTO:
+                rates = {candidate: measure_backend(candidate) for candidate in available_backends()
+                         if check_conformance(candidate)}
+                if not rates:
+                    raise ValueError("cipher backend: egyik sem adja bit-pontosan az eredeti algoritmust")
+                chosen = max(rates, key=rates.get)
+            else:
+                if not check_conformance(name):
+                    raise ValueError(f"cipher backend: {name} nem adja bit-pontosan az eredeti algoritmust")
+                rates, chosen = {}, name
+            _selected[name] = (new_backend(chosen), rates)
+        return _selected[name]
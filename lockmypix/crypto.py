@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""AES-CTR kulcsképzés és titkosított fájlok olvasása."""
+
+import os
+import hashlib
+
+from Crypto.Cipher import AES
+from Crypto.Util import Counter
+
+# ======================================
+# TITKOSÍTÁS - Kulcs és véletlen hozzáférésű (seek) dekriptálás
+# ======================================
+
+def derive_key(password):
+    """AES kulcs a jelszóból (EREDETI ALGORITMUS: SHA-1 első 16 bájtja, IV = kulcs)"""
+    return hashlib.sha1(password.encode()).digest()[:16]
+
+def create_ctr_cipher(key, block_offset=0):
+    """AES-CTR cipher; block_offset > 0 esetén a kulcsfolyam a megadott 16 bájtos blokktól indul"""
+    initial_value = (int.from_bytes(key, "big") + block_offset) % (1 << 128)
+    counter = Counter.new(128, initial_value=initial_value)
+    return AES.new(key, AES.MODE_CTR, counter=counter)
+
+class EncryptedReader:
+    """
+    Titkosított fájl olvasása tetszőleges pozícióból dekriptálva
+    CTR módban minden blokk külön dekriptálható, így egy seek + kis olvasás
+    elég a fejlécekhez - nem kell a teljes fájlt dekriptálni
+    """
+
+    def __init__(self, raw, key, size=None):
+        self.raw = raw
+        self.key = key
+        self.size = size  # ismert méret (pl. tömörített ZIP bejegyzésnél a végére ugrás kitömörítene)
+        self.position = 0
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self.position
+        elif whence == os.SEEK_END:
+            offset += self.size if self.size is not None else self.raw.seek(0, os.SEEK_END)
+        self.position = max(offset, 0)
+        return self.position
+
+    def tell(self):
+        return self.position
+
+    def read(self, size=-1):
+        block, skip = divmod(self.position, 16)
+        self.raw.seek(block * 16)
+        data = self.raw.read() if size is None or size < 0 else self.raw.read(skip + size)
+        plain = create_ctr_cipher(self.key, block).decrypt(data)[skip:]
+        self.position += len(plain)
+        return plain
+
+    def close(self):
+        self.raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def open_media(file_path, key=None):
+    """Fájl megnyitása olvasásra - kulccsal a titkosított forrás közvetlenül olvasható"""
+    raw = open(file_path, "rb")
+    return EncryptedReader(raw, key) if key else raw
@@ -0,0 +1,429 @@
+# -*- coding: utf-8 -*-
+"""
+Háttérfolyamat (démon) Unix domain socketen: meleg munkafolyamat-készlet,
+igazságos feladatsor és haladási események visszaküldése
+
+Indítás:  python -m lockmypix.daemon /run/user/1000/lockmypix.sock --workers 4
+Kliens:   lockmypix-decrypter.py <input> -o <output> --daemon /run/user/1000/lockmypix.sock
+
+Protokoll: soronként egy JSON objektum mindkét irányban. A kérés
+{"job": "decrypt" | "plan", "input", "output", "password", "options": {...}};
+a válasz események sorozata ("queued", "started", "status", "progress",
+"result", végül "finished" vagy "error") a feladat azonosítójával.
+"""
+
+import os
+import sys
+import argparse
+import asyncio
+import json
+import multiprocessing
+import signal
+import socket
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from .scheduling import ORDER_POLICIES
+from .ciphers import CIPHER_AUTO, CIPHER_BACKENDS, select_backend
+from .sinks import OUTPUT_FORMATS
+from .plan import build_plan, save_plan, load_plan, format_plan_summary
+from .i18n import LanguageManager
+from .decryptor import Decryptor
+
+# ======================================
+# DÉMON - Munkafolyamatok (a készlet folyamataiban futnak)
+# ======================================
+
+# Párhuzamosan futó feladatok (folyamatok) száma; egy feladaton belül a Decryptor
+# saját szálkészlete dolgozik, így ennél több folyamat ritkán gyorsít
+DAEMON_WORKERS = min(4, os.cpu_count() or 1)
+
+# A feladatban átadható Decryptor beállítások (minden más kulcs elutasítva)
+DAEMON_OPTIONS = ("output_format", "manifest_path", "hash_source", "recursive", "memory_budget",
+                  "chunk_size", "workers", "autotune", "retune", "order", "cipher_backend", "plan", "lang")
+
+# Munkafolyamat oldali eseménysor (init_worker állítja be)
+_events = None
+
+# Ilyen gyakran (másodperc) nézi meg a munkafolyamat a feladat leállítási eseményét
+CANCEL_POLL = 0.2
+
+def init_worker(events):
+    """
+    Munkafolyamat inicializálása: eseménysor beállítása
+    (a csomag - AES, Pillow, metaadat olvasók - már a forkserverben betöltődött)
+    """
+    global _events
+    _events = events
+
+def warm_up():
+    """
+    Bemelegítés: a készlet összes folyamatának elindítása induláskor, a titkosító
+    backend önteszttel és méréssel együtt (a feladatok már a kész választást kapják)
+    """
+    select_backend(CIPHER_AUTO)
+    return os.getpid()
+
+def send_event(job_id, event, **fields):
+    """Esemény a démonnak (onnan a feladatot beküldő kliensnek)"""
+    _events.put((job_id, dict(fields, event=event, job=job_id)))
+
+def watch_cancel(cancel, done):
+    """
+    A feladat (Manager) leállítási eseményének figyelése háttérszálon, amíg a feladat tart
+    A visszaadott stop_check helyi jelzőt olvas, így a darabonkénti ellenőrzés nem IPC hívás
+    """
+    stopped = threading.Event()
+
+    def watch():
+        try:
+            while not done.is_set():
+                if cancel.wait(CANCEL_POLL):
+                    stopped.set()
+                    return
+        except (OSError, EOFError):
+            stopped.set()  # a démon leáll (a Manager már nem érhető el)
+
+    threading.Thread(target=watch, name="lockmypix-job-cancel", daemon=True).start()
+    return stopped.is_set
+
+def run_job(job_id, request, cancel=None):
+    """
+    Egy feladat végrehajtása a munkafolyamatban
+
+    A "finished" esemény is az eseménysoron megy, így a kliens a többi esemény
+    után, sorrendben kapja meg. cancel: a feladat leállítási eseménye (a démon a
+    kliens kapcsolatának bontásakor állítja be)
+    """
+    send_event(job_id, "started", pid=os.getpid())
+    done = threading.Event()
+    stop_check = watch_cancel(cancel, done) if cancel is not None else None
+    try:
+        options = dict(request.get("options") or {})
+        if request["job"] == "plan":
+            plan = build_plan(request["input"], request["output"], request["password"], stop_check,
+                              recursive=options.get("recursive", True))
+            if options.get("plan"):
+                save_plan(plan, options["plan"])
+            send_event(job_id, "finished", success=True, message=format_plan_summary(plan),
+                       total_files=plan["total_files"], required_bytes=plan["required_bytes"])
+            return
+
+        lang = LanguageManager()
+        lang.set_language(options.pop("lang", "hu"))
+        if options.get("plan"):
+            options["plan"] = load_plan(options["plan"])
+        decryptor = Decryptor(request["password"], request["input"], request["output"], lang,
+                              on_status=lambda message: send_event(job_id, "status", message=message),
+                              on_progress=lambda stats: send_event(job_id, "progress", **stats),
+                              stop_check=stop_check, **options)
+        for result in decryptor.results():
+            send_event(job_id, "result", source=result.source, output=result.output, name=result.name,
+                       size=result.size, timestamp=result.timestamp, error=result.error)
+        success, message = decryptor.summary or (False, lang.get_text("interrupted"))
+        send_event(job_id, "finished", success=success, message=message)
+
+    except Exception as e:
+        send_event(job_id, "error", message=str(e))
+
+    finally:
+        done.set()
+
+# ======================================
+# DÉMON - Igazságos feladatsor és socket szerver
+# ======================================
+
+# Kliensenként legfeljebb ennyi kiküldésre váró esemény; a sor felénél a haladási és
+# státusz események már eldobódnak, a teljes sor (nem olvasó kliens) bontja a kapcsolatot
+CLIENT_QUEUE_LIMIT = 1024
+DROPPABLE_EVENTS = ("progress", "status")
+
+class ClientChannel:
+    """
+    Egy kliens kimenő eseményei korlátos sorban, saját író taszkkal, ami minden
+    sor után megvárja a socket kiürülését (drain) - egy lassú vagy nem olvasó
+    kliens miatt a démon nem puffereli a feladat teljes kimenetét memóriában
+    """
+
+    def __init__(self, writer, limit=CLIENT_QUEUE_LIMIT):
+        self.writer = writer
+        self.queue = asyncio.Queue(limit)
+        self.closed = False
+        self.task = asyncio.get_running_loop().create_task(self.pump())
+
+    def send(self, event):
+        """Esemény sorba állítása (bontott kapcsolatnál eldobva)"""
+        if self.closed:
+            return
+        if event["event"] in DROPPABLE_EVENTS and self.queue.qsize() >= self.queue.maxsize // 2:
+            return  # a következő haladási / státusz esemény úgyis frissebb
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.close()  # a kliens nem olvas: a kapcsolat bontása leállítja a feladatait
+
+    async def pump(self):
+        """Események kiírása sorrendben, a kliens tempójában"""
+        try:
+            while True:
+                event = await self.queue.get()
+                self.writer.write((json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8"))
+                await self.writer.drain()
+        except (ConnectionError, OSError):
+            self.close()
+
+    def close(self):
+        """Kapcsolat bontása a még ki nem küldött események eldobásával (többször is hívható)"""
+        if self.closed:
+            return
+        self.closed = True
+        self.task.cancel()
+        self.writer.transport.abort()
+
+class FairJobQueue:
+    """
+    Kliensenkénti sorok körbeforgó kiszolgálással: egy sok feladatot beküldő
+    kliens nem éheztetheti ki a többit, a kis feladatok hamar sorra kerülnek
+    """
+
+    def __init__(self):
+        self.queues = OrderedDict()  # kliens -> deque[(job_id, request, leállítási esemény)]
+
+    def __len__(self):
+        return sum(len(jobs) for jobs in self.queues.values())
+
+    def put(self, client, job):
+        self.queues.setdefault(client, deque()).append(job)
+
+    def take(self):
+        """Következő feladat (a soron következő klienstől), vagy None"""
+        if not self.queues:
+            return None
+        client, jobs = next(iter(self.queues.items()))
+        job = jobs.popleft()
+        del self.queues[client]
+        if jobs:
+            self.queues[client] = jobs  # a kör végére
+        return job
+
+    def drop(self, client):
+        """Kliens még el nem indult feladatainak törlése (bontott kapcsolat)"""
+        return len(self.queues.pop(client, ()))
+
+def validate_request(request):
+    """Kérés ellenőrzése (hibánál ValueError)"""
+    if not isinstance(request, dict) or request.get("job") not in ("decrypt", "plan"):
+        raise ValueError("job: decrypt vagy plan")
+    for key in ("input", "output", "password"):
+        if not isinstance(request.get(key), str):
+            raise ValueError(f"hiányzó mező: {key}")
+    options = request.get("options") or {}
+    unknown = set(options) - set(DAEMON_OPTIONS)
+    if unknown:
+        raise ValueError(f"ismeretlen beállítás: {', '.join(sorted(unknown))}")
+    if options.get("output_format", "dir") not in OUTPUT_FORMATS:
+        raise ValueError(f"output_format: {', '.join(OUTPUT_FORMATS)}")
+    if options.get("order", ORDER_POLICIES[0]) not in ORDER_POLICIES:
+        raise ValueError(f"order: {', '.join(ORDER_POLICIES)}")
+    if options.get("cipher_backend", CIPHER_AUTO) not in (CIPHER_AUTO,) + CIPHER_BACKENDS:
+        raise ValueError(f"cipher_backend: {', '.join((CIPHER_AUTO,) + CIPHER_BACKENDS)}")
+
+class DecryptDaemon:
+    """Unix socket szerver meleg folyamatkészlettel"""
+
+    def __init__(self, socket_path, workers=DAEMON_WORKERS):
+        self.socket_path = socket_path
+        self.workers = workers
+        self.queue = FairJobQueue()
+        self.clients = {}  # job_id -> ClientChannel
+        self.cancels = {}  # futó job_id -> leállítási esemény (Manager Event)
+        self.running = 0
+        self.next_job_id = 1
+        self.loop = None
+        self.context = None
+        self.pool = None
+        self.events = None
+        self.manager = None
+
+    def new_pool(self):
+        """
+        Munkafolyamat-készlet saját eseménysorral és továbbító szállal (minden folyamat
+        elindul és bemelegít). Az eseménysor nem örökölhető: egy írás közben megölt
+        folyamat a sor írási zárát örökre lefoglalva hagyhatja
+        """
+        self.events = self.context.Queue()
+        threading.Thread(target=self.forward_events, args=(self.events,), name="lockmypix-daemon-events",
+                         daemon=True).start()
+        pool = ProcessPoolExecutor(self.workers, mp_context=self.context,
+                                   initializer=init_worker, initargs=(self.events,))
+        return pool, [pool.submit(warm_up) for _ in range(self.workers)]
+
+    def restart_pool(self):
+        """Összeomlott (BrokenProcessPool) készlet cseréje újra (a régi sor továbbítója magára marad)"""
+        self.pool.shutdown(wait=False)
+        self.pool, _ = self.new_pool()
+
+    def start_pool(self):
+        """
+        Folyamatkészlet indítása forkserverrel (a csomag előtöltve, a forkok olcsók)
+        A feladatonkénti leállítási események a Managerben élnek (a futó feladatnak átadhatók)
+        """
+        self.context = multiprocessing.get_context("forkserver")
+        self.context.set_forkserver_preload(["lockmypix"])
+        self.manager = self.context.Manager()
+        self.pool, warm_ups = self.new_pool()
+        # Minden folyamat elindul és betölti a modulokat, mielőtt az első kliens jön
+        for future in warm_ups:
+            future.result()
+
+    def forward_events(self, events):
+        """Munkafolyamatok eseményeinek továbbítása az eseményhurokba (külön szálon)"""
+        for job_id, event in iter(events.get, None):
+            self.loop.call_soon_threadsafe(self.deliver, job_id, event)
+
+    def deliver(self, job_id, event):
+        """Esemény kiküldése a feladat kliensének (bontott kapcsolatnál eldobva)"""
+        channel = self.clients.get(job_id)
+        if channel is not None:
+            channel.send(event)
+        if event["event"] in ("finished", "error"):
+            self.clients.pop(job_id, None)
+
+    def dispatch(self):
+        """
+        Szabad folyamatok feltöltése a feladatsorból
+        Ha egy munkafolyamat összeomlott, a készlet használhatatlan (BrokenProcessPool):
+        új készlet indul, az el nem indítható feladat hibaeseményt kap
+        """
+        while self.running < self.workers:
+            job = self.queue.take()
+            if job is None:
+                return
+            job_id, request, cancel = job
+            try:
+                future = self.pool.submit(run_job, job_id, request, cancel)
+            except BrokenProcessPool as e:
+                self.restart_pool()
+                self.deliver(job_id, {"event": "error", "job": job_id, "message": str(e)})
+                continue
+            self.running += 1
+            self.cancels[job_id] = cancel
+            future.add_done_callback(lambda future, job_id=job_id, pool=self.pool:
+                                     self.loop.call_soon_threadsafe(self.job_done, job_id, future, pool))
+
+    def job_done(self, job_id, future, pool):
+        """
+        Feladat vége: hely felszabadítása; folyamat összeomlásakor hibaesemény, és ha
+        a feladat készlete még az aktuális, új készlet a következő feladatoknak
+        """
+        self.running -= 1
+        self.cancels.pop(job_id, None)
+        if isinstance(future.exception(), BrokenProcessPool) and pool is self.pool:
+            self.restart_pool()
+        if future.exception() is not None:
+            self.deliver(job_id, {"event": "error", "job": job_id, "message": str(future.exception())})
+        self.dispatch()
+
+    async def handle_client(self, reader, writer):
+        """Egy kliens kapcsolat: soronként egy feladat, válaszként az események"""
+        client = object()
+        channel = ClientChannel(writer)
+        jobs = []
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    validate_request(request)
+                except ValueError as e:
+                    channel.send({"event": "error", "message": str(e)})
+                    continue
+
+                job_id = self.next_job_id
+                self.next_job_id += 1
+                jobs.append(job_id)
+                self.clients[job_id] = channel
+                self.queue.put(client, (job_id, request, self.manager.Event()))
+                self.deliver(job_id, {"event": "queued", "job": job_id, "position": len(self.queue)})
+                self.dispatch()
+        finally:
+            # Bontott kapcsolat: a még el nem indult feladatai törlődnek, a futók leállnak
+            self.queue.drop(client)
+            for job_id in jobs:
+                cancel = self.cancels.get(job_id)
+                if cancel is not None:
+                    cancel.set()
+                else:
+                    self.clients.pop(job_id, None)  # törölt (vagy már befejezett) feladat
+            channel.close()
+
+    async def serve(self):
+        """Szerver futtatása leállításig"""
+        self.loop = asyncio.get_running_loop()
+        self.start_pool()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        # A kérésekben jelszó utazik: a socket már 0600 joggal jön létre (nincs chmod előtti rés)
+        previous_umask = os.umask(0o177)
+        try:
+            server = await asyncio.start_unix_server(self.handle_client, path=self.socket_path)
+        finally:
+            os.umask(previous_umask)
+
+        # SIGTERM / SIGINT: rendezett leállás (socket törlése, készlet leállítása)
+        task = asyncio.current_task()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            self.loop.add_signal_handler(signum, task.cancel)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.events.put(None)
+            for cancel in self.cancels.values():
+                cancel.set()
+            self.pool.shutdown(cancel_futures=True)
+            self.manager.shutdown()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+# ======================================
+# DÉMON - Kliens
+# ======================================
+
+def submit(socket_path, request):
+    """
+    Feladat beküldése egy futó démonnak
+
+    Yields:
+        dict: Események a feladat végéig ("finished" vagy "error")
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall((json.dumps(request, ensure_ascii=False) + "\n").encode("utf-8"))
+        with sock.makefile("r", encoding="utf-8") as f:
+            for line in f:
+                event = json.loads(line)
+                yield event
+                if event["event"] in ("finished", "error"):
+                    return
+
+def main(argv=None):
+    """Démon indítása parancssorból"""
+    parser = argparse.ArgumentParser(description="LockMyPix Decrypter démon")
+    parser.add_argument("socket", help="Unix domain socket útvonala")
+    parser.add_argument("--workers", type=int, default=DAEMON_WORKERS, help="Párhuzamos feladatok száma")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(DecryptDaemon(args.socket, args.workers).serve())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    return 0
+
+if __name__ == "__main__":
+    # A lockmypix.daemon modulon keresztül, hogy a folyamatkészlet a run_job-ot név szerint érje el
+    from lockmypix.daemon import main as daemon_main
+    sys.exit(daemon_main())
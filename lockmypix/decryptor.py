@@ -0,0 +1,912 @@
+# -*- coding: utf-8 -*-
+"""Qt-független dekriptáló motor: a GUI, a CLI és a beágyazó szolgáltatások közös magja."""
+
+import os
+import binascii
+import zipfile
+import tempfile
+import shutil
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .formats import EXTENSION_MAP, BACKUP_EXTENSION
+from .streaming import (CHUNK_SIZE, OperationCancelled, TransformReader, check_cancelled, copy_stream,
+                        clean_member_path, extract_zip_member, zip_member_timestamp, remove_partial_file,
+                        PREFETCH_BYTES, SEQUENTIAL_MIN, advise, advise_path, prefetched)
+from .scheduling import DECRYPT_WORKERS, MEMORY_BUDGET, ORDER_POLICIES, order_work, MemoryBudget
+from .tuning import TUNING_FULL_INPUT_BYTES, device_tuning
+from .crypto import derive_key
+from .ciphers import CIPHER_AUTO, select_backend
+from .naming import (load_sort_db, probe_file, probe_source, generate_intelligent_filename, resolve_file_timestamp,
+                     rename_folder_by_timestamps)
+from .index import entry_sort_key, is_within, iter_parallel_walk
+from .progress import ProgressTracker
+from .logs import log_event
+from .manifest import AuditManifest
+from .sinks import STAGING_PREFIX, create_output_sink
+from .plan import backup_members, is_supported_member, open_backup_member, plan_source_key, nearest_existing_dir
+from .i18n import LanguageManager
+
+# ======================================
+# DEKRIPTÁLÓ MOTOR
+# ======================================
+
+class DecryptResult:
+    """Egy feldolgozott bemeneti fájl eredménye (a Decryptor.results() elemei)"""
+    __slots__ = ("source", "output", "name", "sort_id", "size", "timestamp", "error")
+
+    def __init__(self, source, output=None, name=None, sort_id=None, size=0, timestamp=None, error=None):
+        self.source = source        # bemeneti fájl vagy .encrypt/ bejegyzés
+        self.output = output        # kimeneti útvonal / archívum bejegyzés (None, ha nem készült el);
+                                    # mappa kimenetnél a következő fsync barrierben kerül a helyére
+        self.name = name            # végleges (intelligens) fájlnév
+        self.sort_id = sort_id      # sort.db azonosító backupnál
+        self.size = size            # dekriptált bájtok
+        self.timestamp = timestamp  # visszaállított időbélyeg (epoch másodperc)
+        self.error = error          # hibaüzenet, ha nem sikerült
+
+    @property
+    def success(self):
+        return self.error is None and self.output is not None
+
+    def __repr__(self):
+        return f"DecryptResult({self.source!r} -> {self.output!r}{', error=' + repr(self.error) if self.error else ''})"
+
+class StagedOutput:
+    """
+    Még el nem nevezett kimenet (a pool feladatainak eredménye): mappa kimenetnél a
+    dekriptált fájl a staging helyén, archívumnál csak a megvizsgált titkosított forrás
+    A név kiosztása és a kimeneti célba írás a főszálon, rögzített bemeneti sorrendben
+    történik, így az ütközési utótagok nem függnek attól, melyik szál végez előbb
+    """
+    __slots__ = ("key", "result", "temp_path", "open_source", "rel_dir", "name_for", "hashes", "duration")
+
+    def __init__(self, key, result, temp_path=None, open_source=None, rel_dir=None, name_for=None, hashes=None,
+                 duration=0.0):
+        self.key = key              # azonosító a rögzített sorrendben
+        self.result = result        # DecryptResult (hibánál már kitöltve)
+        self.temp_path = temp_path  # dekriptált fájl a staging helyen
+        self.open_source = open_source  # archívumnál: a titkosított forrás megnyitása (a főszálon)
+        self.rel_dir = rel_dir      # célmappa
+        self.name_for = name_for    # name_for(sort_order) -> javasolt név
+        self.hashes = hashes        # audit manifest hash objektumai
+        self.duration = duration    # dekriptálás ideje (naplóhoz)
+
+class Decryptor:
+    """
+    Mappa vagy .zip.cmpexport dekriptálása kimeneti célba, Qt nélkül
+
+    A haladás és az állapotüzenetek callbackeken keresztül érkeznek (on_status(str),
+    on_progress(dict)); a results() generátor fájlonként adja vissza az eredményt
+    a bemenet rögzített sorrendjében (a nevek kiosztásával együtt, így azonos bemenetre
+    minden futás ugyanazokat a neveket adja). Mappa kimenetnél a futás végén
+    a mappák időbélyeg szerint átnevezhetők - a korábban visszaadott útvonalak ezt
+    nem követik (az audit manifest igen).
+    """
+
+    def __init__(self, password, input_dir, output_dir, lang_manager=None, output_format="dir",
+                 manifest_path=None, hash_source=False, input_index=None, recursive=True, plan=None,
+                 memory_budget=MEMORY_BUDGET, chunk_size=None, workers=None, autotune=True, retune=False,
+                 order=ORDER_POLICIES[0], cipher_backend=CIPHER_AUTO, on_status=None, on_progress=None,
+                 stop_check=None):
+        self.password = password
+        self.input_dir = input_dir
+        self.input_index = input_index
+        self.input_index_checked = False
+        self.recursive = recursive
+        self.output_dir = output_dir
+        self.output_format = output_format
+        self.sink = None
+        self.manifest_path = manifest_path
+        self.hash_source = hash_source
+        self.manifest = None
+        self.progress = None
+        self.memory_budget = memory_budget
+        self.budget = MemoryBudget(memory_budget)
+
+        # Darabméret és szálszám: kézi érték, vagy hangolás (None = automatikus)
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.autotune = autotune
+        self.retune = retune
+
+        # Feldolgozási sorrend (ORDER_POLICIES)
+        self.order = order
+
+        # AES-CTR backend: név szerint, vagy "auto" (önteszt + mérés, folyamatonként egyszer)
+        self.cipher_backend = cipher_backend
+        self.backend = None
+        self.should_stop = False
+        self.stop_check = stop_check  # külső leállítás (pl. a démon feladatának eseménye)
+        self.lang = lang_manager or LanguageManager()
+
+        # Visszajelzés a hívónak (GUI szignálok, CLI kiírás, szolgáltatás naplója)
+        self.on_status = on_status
+        self.on_progress = on_progress
+
+        # Futás végeredménye: (siker, üzenet) - a results() kimerülése után érvényes
+        self.summary = None
+
+        # Mentett dry-run terv (--execute-plan): forrás -> tervezett cél
+        self.plan_targets = {entry["source"]: entry for entry in plan["entries"]} if plan else None
+
+        # Fájlkiterjesztés konverzió (KIBŐVÍTVE)
+        self.extension_map = dict(EXTENSION_MAP)
+
+        # ÚJ: Backup támogatás
+        self.extension_map[BACKUP_EXTENSION] = ".backup"
+
+    def emit_status(self, message):
+        """Állapotüzenet a hívónak (ha kért ilyet)"""
+        if self.on_status:
+            self.on_status(message)
+
+    def in_plan(self, source):
+        """Feldolgozandó-e a fájl (terv nélkül minden fájl az)"""
+        return self.plan_targets is None or source in self.plan_targets
+
+    def planned_target(self, source):
+        """Tervezett cél (rel_dir, name, timestamp) a mentett tervből, vagy None"""
+        return self.plan_targets.get(source) if self.plan_targets is not None else None
+
+    def new_hashes(self):
+        """Hash objektumok egy fájlhoz (üres listák, ha nincs audit manifest)"""
+        return self.manifest.new_hashes() if self.manifest else ([], [])
+
+    def record_manifest(self, source, sort_id, output, size, hashes):
+        """Feldolgozott fájl rögzítése az audit manifestben (ha be van kapcsolva)"""
+        if self.manifest:
+            self.manifest.add(source, sort_id, output, size, *hashes)
+
+    def start_progress(self, total_bytes, total_files, discovering=False):
+        """Bájt alapú haladáskövetés indítása előre ismert (vagy felfedezés közben növekvő) összmérettel"""
+        self.progress = ProgressTracker(total_bytes, total_files, discovering=discovering)
+        self.emit_progress(force=True)
+
+    def report_bytes(self, count):
+        """copy_stream progress callback"""
+        self.progress.add_bytes(count)
+        self.emit_progress()
+
+    def emit_progress(self, force=False):
+        """Haladás kiküldése (időben ritkítva)"""
+        if self.on_progress and self.progress and (self.progress.due() or force):
+            self.on_progress(self.progress.snapshot())
+
+    def get_input_index(self):
+        """
+        A hívótól kapott bemeneti index, ha még érvényes (különben None)
+        Futásonként egyszer ellenőrizve - a kimeneti mappa létrehozása már nem érvényteleníti
+        """
+        if not self.input_index_checked:
+            if self.input_index is not None and not self.input_index.is_current(self.input_dir):
+                self.input_index = None
+            self.input_index_checked = True
+        return self.input_index
+
+    def iter_input_entries(self):
+        """
+        Támogatott bemeneti fájlok: a kapott indexből, vagy index nélkül párhuzamos
+        rekurzív bejárással - ekkor minden fájl azonnal feldolgozható, amint előkerül
+        """
+        index = self.get_input_index()
+        if index is not None:
+            entries = index.supported_entries()
+        else:
+            entries = iter_parallel_walk(self.input_dir, [self.output_dir], self.is_stopped, self.recursive)
+
+        for entry in entries:
+            if (entry.ext in EXTENSION_MAP and not is_within(entry.path, self.output_dir)
+                    and self.in_plan(plan_source_key(entry.rel_dir, entry.name))):
+                yield entry
+
+    def estimate_input_bytes(self, limit):
+        """
+        A bemenet mérete a kalibráció méretezéséhez, legfeljebb limit-ig számolva
+        (mappánál a bejárás a limitnél megáll; a futás saját bejárása úgyis újraolvassa)
+        """
+        if os.path.isfile(self.input_dir) and self.input_dir.endswith(BACKUP_EXTENSION):
+            with zipfile.ZipFile(self.input_dir) as zip_ref:
+                return sum(info.file_size for info in zip_ref.infolist())
+        total = 0
+        entries = self.iter_input_entries()
+        try:
+            for entry in entries:
+                total += entry.size
+                if total >= limit:
+                    break
+        finally:
+            entries.close()
+        return total
+
+    def tune(self):
+        """
+        Darabméret és szálszám beállítása: kézi érték, eszközönkénti gyorsítótár vagy
+        kalibráció (a bemenet méretével arányos mintával; kis bemenetnél alapértékek)
+        """
+        tuning = {"chunk_size": CHUNK_SIZE, "workers": DECRYPT_WORKERS}
+        if self.autotune and not (self.chunk_size and self.workers) and self.output_dir != "-":
+            target = self.output_dir
+            if self.output_format != "dir":
+                target = os.path.dirname(os.path.abspath(self.output_dir))
+            try:
+                input_bytes = self.estimate_input_bytes(TUNING_FULL_INPUT_BYTES)
+                tuning = device_tuning(nearest_existing_dir(target), self.retune,
+                                       lambda: self.emit_status(self.lang.get_text("tuning")),
+                                       self.backend, derive_key(self.password), self.is_stopped,
+                                       input_bytes) or tuning
+            except (OSError, zipfile.BadZipFile) as e:
+                self.emit_status(f"{self.lang.get_text('error')}: {str(e)}")
+
+        self.chunk_size = self.chunk_size or tuning["chunk_size"]
+        self.workers = self.workers or tuning["workers"]
+        # A backend saját gyorsítótára (XOR: kulcsfolyam) a keretből
+        reserved = self.backend.reserved_bytes if self.backend else 0
+        self.budget = MemoryBudget(self.memory_budget - reserved, self.chunk_size)
+
+    def is_stopped(self):
+        """Leállítás kérve? (stop_check callback a streaming ciklusoknak; a külső stop_check is számít)"""
+        if not self.should_stop and self.stop_check is not None and self.stop_check():
+            self.should_stop = True
+        return self.should_stop
+
+    def select_cipher(self):
+        """Titkosító backend kiválasztása (a megfelelőségi önteszten átment leggyorsabb)"""
+        self.backend, rates = select_backend(self.cipher_backend)
+        rate = f" ({rates[self.backend.name]:.0f} MB/s)" if self.backend.name in rates else ""
+        self.emit_status(f"{self.lang.get_text('cipher_backend')}: {self.backend.name}{rate}")
+
+    def create_cipher(self):
+        """AES cipher létrehozása (EREDETI ALGORITMUS, a kiválasztott backenddel bit-pontosan)"""
+        if self.backend is None:
+            self.select_cipher()
+        return self.backend.create(derive_key(self.password))
+
+    def test_password(self):
+        """Jelszó validálása - KIBŐVÍTVE .zip.cmpexport támogatással"""
+        try:
+            # .zip.cmpexport fájl esetén nincs jelszó teszt szükséges
+            if os.path.isfile(self.input_dir) and self.input_dir.endswith('.zip.cmpexport'):
+                return True
+
+            # Keresés minden támogatott titkosított kiterjesztésben (index vagy bejárás az első találatig)
+            for entry in self.iter_input_entries():
+                if self.is_stopped():
+                    return False
+
+                cipher = self.create_cipher()
+                with open(entry.path, "rb") as f:
+                    encrypted_data = f.read(16)
+                decrypted_data = cipher.decrypt(encrypted_data)
+                header = binascii.hexlify(decrypted_data).decode("utf8")
+
+                # Különböző fájltípusok header ellenőrzése
+                if (header.startswith("ffd8ff") or  # JPEG
+                    header.startswith("89504e") or  # PNG
+                    header.startswith("474946") or  # GIF
+                    header.startswith("424d") or    # BMP
+                    header.startswith("000000") or  # Video files
+                    len(decrypted_data) > 0):       # Bármilyen dekriptált adat
+                    return True
+            return False
+        except OperationCancelled:
+            return False
+        except Exception as e:
+            error_msg = f"{self.lang.get_text('password_test_error')}: {str(e)}"
+            self.emit_status(error_msg)
+            return False
+
+    def iter_pool(self, items, size_of, task):
+        """
+        Elemek párhuzamos feldolgozása a megadott sorrendben, a memóriakeret szerinti
+        beengedéssel; az eredmények elkészülési sorrendben érkeznek
+
+        Args:
+            items: Feldolgozandó elemek (iterátor is lehet - a beengedés a bejárást is visszafogja)
+            size_of (callable): Elem mérete bájtban (memóriakerethez)
+            task (callable): task(item, chunk_size) -> StagedOutput, a szálkészletben fut
+
+        Yields:
+            StagedOutput: Fájlonkénti eredmények
+        """
+        workers = self.workers or DECRYPT_WORKERS
+        pending = set()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                for item in items:
+                    check_cancelled(self.is_stopped)
+
+                    # Beengedés a memóriakeret szerint
+                    chunk_size, cost = self.budget.acquire(size_of(item), self.is_stopped)
+                    future = executor.submit(task, item, chunk_size)
+                    future.add_done_callback(lambda _, cost=cost: self.budget.release(cost))
+                    pending.add(future)
+
+                    # Legfeljebb két környi feladat várakozik a szálakra
+                    if len(pending) >= 2 * workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield future.result()
+
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+
+            except BaseException:
+                # Leállítás, hiba vagy a hívó abbahagyta az iterálást:
+                # a még el nem indult fájlok törlése a sorból
+                self.should_stop = True
+                for future in pending:
+                    future.cancel()
+                raise
+
+    def iter_in_input_order(self, staged, input_order):
+        """
+        Pool eredmények véglegesítése rögzített bemeneti sorrendben (commit_output)
+        A korábban elkészült fájlok megvárják az előttük állókat - a staging helyen,
+        memóriakeret nélkül -, így a kiosztott nevek minden futásnál azonosak
+
+        Args:
+            staged: StagedOutput elemek elkészülési sorrendben (iter_pool)
+            input_order (callable): A kulcsok rögzített sorrendje listaként (a futás
+                közben bővülhet), vagy None, amíg nem ismert
+
+        Yields:
+            DecryptResult: Fájlonkénti eredmények a rögzített sorrendben
+        """
+        waiting = {}
+        position = 0
+        for item in staged:
+            waiting[item.key] = item
+            order = input_order()
+            while order is not None and position < len(order) and order[position] in waiting:
+                position += 1
+                yield self.commit_output(waiting.pop(order[position - 1]), position)
+
+        for key in input_order()[position:]:
+            position += 1
+            yield self.commit_output(waiting.pop(key), position)
+
+    def commit_output(self, staged, sort_order):
+        """Staged kimenet véglegesítése: név (sort_order a sorrend alapú fallbackhez), ütközéskezelés, manifest"""
+        result = staged.result
+        if result.error is not None:
+            return result
+        try:
+            if staged.temp_path is None:
+                output_ref = self.write_entry(staged, staged.name_for(sort_order))
+            else:
+                output_ref = self.sink.commit(staged.temp_path, staged.rel_dir, staged.name_for(sort_order),
+                                              result.timestamp)
+            self.record_manifest(result.source, result.sort_id, output_ref, result.size, staged.hashes)
+
+            result.output, result.name = output_ref, os.path.basename(output_ref)
+            completed_msg = f"{self.lang.get_text('completed')}: {result.name}"
+            self.emit_status(completed_msg)
+            log_event("decrypt", completed_msg, file=result.source, output=output_ref, bytes=result.size,
+                      duration=round(staged.duration, 3))
+        except OperationCancelled:
+            remove_partial_file(staged.temp_path)
+            raise
+        except Exception as e:
+            self.report_failure(result, e, staged.duration)
+            remove_partial_file(staged.temp_path)
+        return result
+
+    def write_entry(self, staged, name):
+        """
+        Archív kimenet: a titkosított forrás darabonként dekriptálva, közvetlenül a
+        bejegyzésbe íródik (temp fájl nélkül); a hash-ek és a haladás olvasás közben
+        """
+        result = staged.result
+        self.progress.start_file(result.size)
+        started = time.monotonic()
+        try:
+            with staged.open_source() as raw:
+                source = TransformReader(raw, self.create_cipher().decrypt, self.is_stopped,
+                                         staged.hashes[0], staged.hashes[1], self.report_bytes)
+                return self.sink.write(staged.rel_dir, name, result.timestamp, result.size, source,
+                                       self.chunk_size or CHUNK_SIZE)
+        finally:
+            staged.duration += time.monotonic() - started
+            self.progress.finish_file()
+            self.emit_progress(force=True)
+
+    def report_failure(self, result, error, duration):
+        """Sikertelen fájl: hibaüzenet a hívónak és a naplóba, az eredményben a hiba"""
+        error_msg = f"{self.lang.get_text('error')} {os.path.basename(result.source)}: {str(error)}"
+        self.emit_status(error_msg)
+        log_event("decrypt", error_msg, logging.ERROR, file=result.source, error=str(error),
+                  duration=round(duration, 3))
+        result.error = str(error)
+
+    def handle_cmpexport_file(self, zip_path, output_dir):
+        """
+        ÚJ: .zip.cmpexport fájl teljes feldolgozása
+        Sort.db alapú mapping + intelligens névgenerálás
+        """
+        try:
+            # 1. Temp mappa létrehozása (csak a sort.db kerül ide) - futásonként egyedi,
+            #    így ugyanaz a backup párhuzamosan több feladatban is feldolgozható
+            temp_dir = tempfile.mkdtemp(prefix="temp_cmpexport_", dir=os.path.dirname(os.path.abspath(zip_path)))
+
+            self.emit_status(f"{self.lang.get_text('cmpexport_detected')}: {os.path.basename(zip_path)}")
+
+            # 2. Központi könyvtár: összméret a .encrypt bejegyzésekből + sort.db
+            self.emit_status(self.lang.get_text('extracting_zip'))
+            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+                sort_db_info = zip_ref.getinfo("sort.db") if "sort.db" in zip_ref.namelist() else None
+                # Ugyanaz a szűrés és sorszámozás, mint a tervben és a Vaultban
+                encrypted_members = [(sort_order, info) for sort_order, info, rel_path in backup_members(zip_ref)
+                                     if is_supported_member(rel_path) and self.in_plan(info.filename)]
+                total_bytes = sum(info.file_size for _, info in encrypted_members)
+                if sort_db_info:
+                    total_bytes += sort_db_info.file_size
+                self.start_progress(total_bytes, len(encrypted_members))
+
+                # 3. Sort.db kicsomagolása és elemzése
+                if sort_db_info:
+                    extract_zip_member(zip_ref, sort_db_info, temp_dir, self.is_stopped, self.report_bytes)
+            self.emit_status(self.lang.get_text('analyzing_sortdb'))
+            file_mapping = self.analyze_sort_db(temp_dir)
+
+            # 4. .encrypt bejegyzések dekriptálása közvetlenül a ZIP-ből
+            self.emit_status(self.lang.get_text('decrypting_folder'))
+            if not encrypted_members:
+                raise Exception(f".encrypt mappa nem található: {zip_path}")
+
+            success_count = 0
+            for result in self.decrypt_zip_members(zip_path, encrypted_members, file_mapping):
+                success_count += result.success
+                yield result
+
+            # 5. Mappák átnevezése időbélyeg alapján (csak mappa kimenetnél,
+            #    a kimenet lezárása után - minden fájl a végleges helyén)
+            if self.sink.renames_folders:
+                self.sink.close()
+                self.emit_status(self.lang.get_text('folder_rename'))
+                self.rename_output_folders(output_dir)
+
+            # 6. Temp mappa takarítása
+            self.emit_status(self.lang.get_text('cleanup_temp'))
+            shutil.rmtree(temp_dir)
+
+            self.summary = (success_count > 0,
+                            f"1 {self.lang.get_text('backup_processed')} ({success_count} fájl)")
+
+        except OperationCancelled:
+            # Leállítás: a kész kimeneti fájlok megmaradnak
+            self.summary = (False, self.lang.get_text("interrupted"))
+
+        except Exception as e:
+            error_msg = f"Backup feldolgozási hiba: {str(e)}"
+            self.emit_status(error_msg)
+            self.summary = (False, error_msg)
+
+        finally:
+            # Temp mappa takarítása leállításkor, hibánál és abbahagyott iterálásnál is
+            if 'temp_dir' in locals() and os.path.exists(temp_dir):
+                shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def analyze_sort_db(self, temp_dir):
+        """Sort.db elemzés fájlnév mapping kinyeréséhez - KIBŐVÍTVE dátum támogatással"""
+        sort_db_path = os.path.join(temp_dir, "sort.db")
+        file_mapping = {}
+
+        if not os.path.exists(sort_db_path):
+            self.emit_status("sort.db nem található - folytatás mapping nélkül")
+            return file_mapping
+
+        try:
+            file_mapping = load_sort_db(sort_db_path)
+            self.emit_status(f"Sort.db: {len(file_mapping)} fájl mapping betöltve")
+
+        except Exception as e:
+            self.emit_status(f"Sort.db elemzési hiba: {str(e)}")
+
+        return file_mapping
+
+    def decrypt_zip_members(self, zip_path, numbered, file_mapping):
+        """
+        .encrypt bejegyzések párhuzamos kitömörítése és dekriptálása
+        Minden szál saját ZipFile kezelővel dolgozik a policy szerint rendezett
+        bejegyzéseken - nagy exportoknál a kitömörítés a szűk keresztmetszet.
+        A nevek kiosztása a központi könyvtár sorrendjében (numbered: (sorszám, ZipInfo)).
+        """
+
+        def album_of(item):
+            sort_order, info = item
+            file_basename = os.path.splitext(os.path.basename(info.filename))[0]
+            if file_basename in file_mapping:
+                mapping_info = file_mapping[file_basename]
+                return mapping_info['directory'], mapping_info['sort_order'], info.filename
+            return os.path.dirname(info.filename), sort_order, info.filename
+
+        # Szálankénti ZipFile kezelő (a futás végén mind lezárva)
+        local = threading.local()
+        handles = []
+        handles_lock = threading.Lock()
+
+        def member_range(info):
+            # Helyi fejléc (30 bájt + név + extra) és a tömörített adat
+            return info.header_offset, 30 + len(info.orig_filename.encode("utf-8")) + len(info.extra) + info.compress_size
+
+        def thread_zip_ref():
+            # Archív kimenetnél a főszál is olvas (a bejegyzések írásakor)
+            zip_ref = getattr(local, "zip_ref", None)
+            if zip_ref is None:
+                zip_ref = local.zip_ref = zipfile.ZipFile(zip_path, 'r')
+                advise(zip_ref.fp.fileno(), 0, 0, "SEQUENTIAL")
+                with handles_lock:
+                    handles.append(zip_ref)
+            return zip_ref
+
+        def decrypt_member(item, chunk_size):
+            sort_order, info = item
+            zip_ref = thread_zip_ref()
+            try:
+                return self.decrypt_zip_member(zip_path, zip_ref, info, file_mapping, sort_order, chunk_size,
+                                               open_member=lambda: thread_zip_ref().open(info))
+            finally:
+                # A bejegyzés lapjai elengedhetők (a futás nem olvassa újra)
+                advise(zip_ref.fp.fileno(), *member_range(info), "DONTNEED")
+
+        # Előreolvasás: a következő bejegyzések tartománya a beengedésük előtt (WILLNEED)
+        prefetch_fd = os.open(zip_path, os.O_RDONLY)
+
+        def prefetch(item):
+            offset, length = member_range(item[1])
+            advise(prefetch_fd, offset, min(length, PREFETCH_BYTES), "WILLNEED")
+
+        ordered = order_work(numbered, self.order, lambda item: item[1].file_size,
+                             lambda item: item[1].filename, album_of)
+        input_order = [sort_order for sort_order, _ in numbered]
+        try:
+            staged = self.iter_pool(prefetched(ordered, prefetch), lambda item: item[1].file_size, decrypt_member)
+            yield from self.iter_in_input_order(staged, lambda: input_order)
+        finally:
+            os.close(prefetch_fd)
+            for zip_ref in handles:
+                zip_ref.close()
+
+    def decrypt_zip_member(self, zip_path, zip_ref, info, file_mapping, sort_order, chunk_size=CHUNK_SIZE,
+                           open_member=None):
+        """
+        Egy .encrypt bejegyzés kitömörítése és dekriptálása egy menetben a staging helyre
+        (archív kimenetnél csak a titkosított bejegyzés vizsgálata; az írás a write_entry-ben)
+        KIBŐVÍTVE intelligens név- és dátumkezeléssel (a név a commit_output-ban kerül kiosztásra)
+        """
+        rel_path = clean_member_path(info.filename[len(".encrypt/"):])  # '..' és abszolút út nélkül
+        file = os.path.basename(rel_path)
+        staging = self.sink.stages_files
+        if staging:
+            self.progress.start_file(info.file_size)
+        started = time.monotonic()
+
+        # Fájlnév és kiterjesztés
+        file_basename, file_ext = os.path.splitext(file)
+        sort_id = file_basename if file_basename in file_mapping else None
+        result = DecryptResult(info.filename, sort_id=sort_id)
+        staged = StagedOutput(sort_order, result)
+
+        # Kimeneti (relatív) könyvtár meghatározása
+        planned = self.planned_target(info.filename)
+        if planned:
+            output_subdir = planned["rel_dir"]
+        elif file_basename in file_mapping:
+            output_subdir = file_mapping[file_basename]['directory'].rstrip('/')
+        else:
+            # Mapping nélkül - relatív útvonal megtartása
+            output_subdir = os.path.dirname(rel_path)
+
+        temp_file_path = None
+        try:
+            hashes = self.new_hashes()
+            if staging:
+                # Temp fájl létrehozása dekriptáláshoz (a kimeneti cél adja a helyét)
+                temp_file_path = self.sink.staging_path(output_subdir, f"temp_{file_basename}{file_ext}")
+
+                # Dekriptálás (EREDETI ALGORITMUS, darabonként)
+                cipher = self.create_cipher()
+                with zip_ref.open(info, 'r') as f_in, open(temp_file_path, 'wb') as f_out:
+                    size = copy_stream(f_in, f_out, cipher.decrypt, self.is_stopped, chunk_size,
+                                       source_hashes=hashes[0], target_hashes=hashes[1],
+                                       progress=self.report_bytes)
+                open_probe = lambda: open(temp_file_path, "rb")
+            else:
+                # Archív kimenet: a méret a titkosítottal azonos (CTR), a vizsgálat a
+                # titkosított bejegyzésen - mint a tervben
+                size = info.file_size
+                open_probe = lambda: open_backup_member(zip_path, zip_ref, info, derive_key(self.password))
+
+            if planned:
+                # Név és dátum a mentett tervből
+                name_for, timestamp = lambda _: planned["name"], planned["timestamp"]
+            else:
+                # Intelligens fájlnév generálás
+                self.emit_status(self.lang.get_text('intelligent_naming'))
+                if file_basename in file_mapping:
+                    sort_order = file_mapping[file_basename]['sort_order']
+                probe = probe_source(open_probe, rel_path, file_mapping, file_basename)
+                intelligent_name = generate_intelligent_filename(file_mapping, file_basename, None,
+                                                                 sort_order, probe)
+                name_for = lambda _: intelligent_name
+
+                # Időbélyeg helyreállítás
+                self.emit_status(self.lang.get_text('timestamp_restore'))
+                timestamp = resolve_file_timestamp(None, None, file_mapping, file_basename, probe,
+                                                   zip_member_timestamp(info))
+
+            staged.temp_path, staged.rel_dir, staged.name_for, staged.hashes = (
+                temp_file_path, output_subdir, name_for, hashes)
+            if not staging:
+                staged.open_source = open_member
+            result.size, result.timestamp = size, timestamp
+
+        except OperationCancelled:
+            # Félbeszakadt temp fájl visszagörgetése
+            remove_partial_file(temp_file_path)
+            raise
+
+        except Exception as e:
+            self.report_failure(result, e, time.monotonic() - started)
+
+            # Temp fájl törlése hiba esetén
+            remove_partial_file(temp_file_path)
+
+        # Haladás frissítése
+        staged.duration = time.monotonic() - started
+        if staging:
+            self.progress.finish_file()
+            self.emit_progress(force=True)
+        return staged
+
+    def rename_output_folders(self, output_dir):
+        """Kimeneti mappák átnevezése időbélyeg alapján"""
+        try:
+            # Almappák keresése és átnevezése
+            for item in os.listdir(output_dir):
+                item_path = os.path.join(output_dir, item)
+                if os.path.isdir(item_path) and not item.startswith(STAGING_PREFIX):
+                    self.rename_folder(item_path)
+        except Exception as e:
+            self.emit_status(f"Mappa átnevezési hiba: {str(e)}")
+
+    def rename_folder(self, folder_path):
+        """Mappa átnevezése időbélyeg alapján, az audit manifest frissítésével"""
+        new_path = rename_folder_by_timestamps(folder_path)
+        if self.manifest and new_path != folder_path:
+            self.manifest.rename_prefix(folder_path, new_path)
+        return new_path
+
+    def process_files(self):
+        """
+        Fájlok feldolgozása - HIBRID: .zip.cmpexport + egyedi fájlok
+        Generátor: fájlonként DecryptResult, a végén self.summary = (siker, üzenet)
+        """
+
+        # Kimeneti cél megnyitása (mappa, TAR vagy ZIP)
+        self.sink = create_output_sink(self.output_format, self.output_dir)
+        self.sink.open()
+
+        # Audit manifest (opcionális)
+        if self.manifest_path:
+            self.manifest = AuditManifest(self.manifest_path, self.hash_source,
+                                          deferred=self.sink.renames_folders)
+
+        try:
+            # .zip.cmpexport fájl kezelése
+            if os.path.isfile(self.input_dir) and self.input_dir.endswith('.zip.cmpexport'):
+                yield from self.handle_cmpexport_file(self.input_dir, self.output_dir)
+            else:
+                yield from self.process_individual_files()
+        finally:
+            self.sink.close()
+            if self.manifest:
+                self.manifest.close()
+
+        # Félbeszakadt bejegyzés: az archívum nem került a helyére
+        if self.sink.failed and self.summary and self.summary[0]:
+            self.summary = (False, self.lang.get_text("archive_incomplete"))
+
+    def process_individual_files(self):
+        """
+        Egyedi titkosított fájlok feldolgozása a bemeneti mappából (rekurzívan)
+        Az alkönyvtár-szerkezet a kimeneten megmarad; a fájlok párhuzamosan,
+        a memóriakeret által beengedett mértékben futnak
+        """
+
+        # Támogatott fájlok: előre elkészült index, vagy felfedezés közbeni feldolgozás
+        # (sorrend-policy esetén a bejárás végét meg kell várni a rendezéshez)
+        discovering = self.get_input_index() is None and self.order == "discovery"
+        if discovering:
+            files = self.iter_input_entries()
+            self.start_progress(0, 0, discovering=True)
+            input_keys = None
+        else:
+            files = sorted(self.iter_input_entries(), key=entry_sort_key)
+            self.start_progress(sum(entry.size for entry in files), len(files))
+            input_keys = [entry_sort_key(entry) for entry in files]
+            files = order_work(files, self.order, lambda entry: entry.size, lambda entry: entry.name,
+                               entry_sort_key)
+
+        successful_count = 0
+        discovered = []
+
+        def counted():
+            # Felfedezés közben a beengedéskor nő az összméret; a sorszámozás (file_NNN)
+            # és a névkiosztás sorrendje az InputIndex rendezése, ami a bejárás végén ismert
+            nonlocal input_keys
+            for entry in files:
+                discovered.append(entry_sort_key(entry))
+                if discovering:
+                    self.progress.add_total(entry.size)
+                yield entry
+            if input_keys is None:
+                input_keys = sorted(discovered)
+
+        # A következő bemenetek eleje már a beengedésük előtt olvasódik (WILLNEED)
+        upcoming = prefetched(counted(), lambda entry: advise_path(entry.path, "WILLNEED", 0, PREFETCH_BYTES))
+
+        try:
+            staged = self.iter_pool(upcoming, lambda entry: entry.size, self.decrypt_input_entry)
+            for result in self.iter_in_input_order(staged, lambda: input_keys):
+                successful_count += result.success
+                yield result
+
+        except OperationCancelled:
+            self.summary = (False, self.lang.get_text("interrupted"))
+            return
+
+        self.progress.finish_discovery()
+
+        total_count = len(discovered)
+        if total_count == 0:
+            self.summary = (False, self.lang.get_text("no_files"))
+            return
+
+        # Kimeneti mappa átnevezése (ha van egyedi fájl és mappa a kimenet)
+        if successful_count > 0 and self.sink.renames_folders:
+            self.sink.close()
+            self.emit_status(self.lang.get_text('folder_rename'))
+            self.rename_folder(self.output_dir)
+
+        result_msg = f"{successful_count}/{total_count} {self.lang.get_text('files_processed')}"
+        self.summary = (True, result_msg)
+
+    def decrypt_input_entry(self, entry, chunk_size=CHUNK_SIZE):
+        """
+        Egy bemeneti fájl dekriptálása a staging helyre (elnevezés és kimenet: commit_output)
+        Archív kimenetnél csak a titkosított forrás vizsgálata; az írás a write_entry-ben
+        """
+        filename = entry.name
+        staging = self.sink.stages_files
+        if staging:
+            self.progress.start_file(entry.size)
+        started = time.monotonic()
+        temp_path = None
+        result = DecryptResult(entry.path)
+        staged = StagedOutput(entry_sort_key(entry), result)
+
+        try:
+            input_path = entry.path
+            planned = self.planned_target(plan_source_key(entry.rel_dir, filename))
+            status_msg = f"{self.lang.get_text('processing')}: {os.path.join(entry.rel_dir, filename)}"
+            self.emit_status(status_msg)
+
+            hashes = self.new_hashes()
+            if staging:
+                # Temp fájl létrehozása (a relatív mappaszerkezet tükrözve)
+                temp_path = self.sink.staging_path(entry.rel_dir, f"temp_{filename}")
+
+                # Dekriptálás (EREDETI ALGORITMUS, darabonként - kis fájlnál egy menetben)
+                cipher = self.create_cipher()
+                with open(input_path, "rb") as f_in, open(temp_path, "wb") as f_out:
+                    if entry.size >= SEQUENTIAL_MIN:
+                        advise(f_in.fileno(), 0, 0, "SEQUENTIAL")
+                    size = copy_stream(f_in, f_out, cipher.decrypt, self.is_stopped, chunk_size,
+                                       source_hashes=hashes[0], target_hashes=hashes[1],
+                                       progress=self.report_bytes)
+                    # A bemenetet ez a futás nem olvassa újra
+                    advise(f_in.fileno(), 0, 0, "DONTNEED")
+                probe_path, probe_key = temp_path, None
+            else:
+                # Archív kimenet: a méret a titkosítottal azonos (CTR), a vizsgálat a
+                # titkosított forráson - mint a tervben
+                size = entry.size
+                probe_path, probe_key = input_path, derive_key(self.password)
+                staged.open_source = lambda: open(input_path, "rb")
+
+            if planned:
+                # Cél, név és dátum a mentett tervből
+                output_subdir = planned["rel_dir"]
+                name_for, timestamp = lambda _: planned["name"], planned["timestamp"]
+            else:
+                # Intelligens névgenerálás (a sorrend alapú fallback a kiosztáskori sorszámmal)
+                self.emit_status(self.lang.get_text('intelligent_naming'))
+                output_subdir = entry.rel_dir
+                probe = probe_file(probe_path, key=probe_key)
+                name_for = lambda number: generate_intelligent_filename(None, None, probe_path, number, probe)
+
+                # Időbélyeg helyreállítás
+                self.emit_status(self.lang.get_text('timestamp_restore'))
+                timestamp = resolve_file_timestamp(input_path, probe_path, probe=probe)
+
+            staged.temp_path, staged.rel_dir, staged.name_for, staged.hashes = (
+                temp_path, output_subdir, name_for, hashes)
+            result.size, result.timestamp = size, timestamp
+
+        except OperationCancelled:
+            # Félbeszakadt temp fájl visszagörgetése
+            remove_partial_file(temp_path)
+            raise
+
+        except Exception as e:
+            self.report_failure(result, e, time.monotonic() - started)
+
+            # Temp fájl törlése hiba esetén
+            remove_partial_file(temp_path)
+
+        # Haladás frissítése
+        staged.duration = time.monotonic() - started
+        if staging:
+            self.progress.finish_file()
+            self.emit_progress(force=True)
+        return staged
+
+    def stop(self):
+        """Műveletek leállítása (bármely szálból hívható)"""
+        self.should_stop = True
+
+    def results(self):
+        """
+        Teljes futás generátorként: jelszó ellenőrzés, hangolás, majd fájlonként
+        egy DecryptResult a bemenet rögzített sorrendjében. A végeredmény ezután a self.summary-ben.
+        Az iterálás abbahagyása (close()) leállítja a még el nem indult fájlokat.
+        """
+        try:
+            # Titkosító backend (hibás név vagy nem megfelelő backend esetén itt áll meg)
+            self.select_cipher()
+
+            # Jelszó ellenőrzés
+            self.emit_status(self.lang.get_text("password_checking"))
+            if not self.test_password():
+                if self.is_stopped():
+                    self.summary = (False, self.lang.get_text("interrupted"))
+                else:
+                    self.summary = (False, self.lang.get_text("wrong_password"))
+                return
+
+            # Darabméret és szálszám hangolása a kimeneti eszközhöz
+            self.tune()
+
+            # Fájlok feldolgozása
+            self.emit_status(self.lang.get_text("decrypting"))
+            started = time.monotonic()
+            yield from self.process_files()
+            success, message = self.summary
+            log_event("run", message, logging.INFO if success else logging.ERROR, file=self.input_dir,
+                      output=self.output_dir, bytes=self.progress.bytes_done if self.progress else None,
+                      duration=round(time.monotonic() - started, 3), error=None if success else message)
+
+        except OperationCancelled:
+            # Leállítás a hangolás (kalibráció) közben
+            self.summary = (False, self.lang.get_text("interrupted"))
+
+        except Exception as e:
+            error_msg = f"{self.lang.get_text('error')}: {str(e)}"
+            self.summary = (False, error_msg)
+
+    def run(self):
+        """
+        Teljes futás blokkolva
+
+        Returns:
+            tuple: (siker, üzenet)
+        """
+        for _ in self.results():
+            pass
+        return self.summary
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""Támogatott fájlformátumok és kiterjesztések."""
+
+import os
+
+# ======================================
+# TÁMOGATOTT FORMÁTUMOK
+# ======================================
+
+# Titkosított kiterjesztés -> eredeti kiterjesztés (LockMyPix)
+EXTENSION_MAP = {
+    ".vp3": ".mp4", ".vo1": ".webm", ".v27": ".mpg", ".vb9": ".avi",
+    ".v77": ".mov", ".v78": ".wmv", ".v82": ".dv", ".vz9": ".divx",
+    ".vi3": ".ogv", ".v1u": ".h261", ".v6m": ".h264", ".6zu": ".jpg",
+    ".tr7": ".gif", ".p5o": ".png", ".8ur": ".bmp", ".33t": ".tiff",
+    ".20i": ".webp", ".v93": ".heic", ".v91": ".flv", ".v80": ".3gpp",
+    ".vo4": ".ts", ".v99": ".mkv", ".vr2": ".mpeg", ".vv3": ".dpg",
+    ".v81": ".rmvb", ".vz8": ".vob", ".wi2": ".asf", ".vi4": ".h263",
+    ".v2u": ".f4v", ".v76": ".m4v", ".v75": ".ram", ".v74": ".rm",
+    ".v3u": ".mts", ".v92": ".dng", ".r89": ".ps", ".v79": ".3gp",
+}
+
+# LockMyPix backup fájl kiterjesztése
+BACKUP_EXTENSION = ".zip.cmpexport"
+
+def real_extension(file_path):
+    """Valódi kiterjesztés (titkosított LockMyPix kiterjesztésnél a megfelelő eredeti)"""
+    ext = os.path.splitext(file_path)[1].lower()
+    return EXTENSION_MAP.get(ext, ext)
+
+IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.heic', '.heif', '.tiff', '.tif', '.dng', '.bmp', '.gif', '.webp'})
+VIDEO_EXTENSIONS = frozenset({'.mp4', '.mov', '.avi', '.mkv', '.wmv', '.flv', '.webm', '.m4v', '.3gp', '.3gpp'})
+
+def is_image_file(file_path):
+    """Ellenőrzi hogy képfájl-e"""
+    return real_extension(file_path) in IMAGE_EXTENSIONS
+
+def is_video_file(file_path):
+    """Ellenőrzi hogy videófájl-e"""
+    return real_extension(file_path) in VIDEO_EXTENSIONS
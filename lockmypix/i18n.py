@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""Többnyelvű felület szövegei."""
+
+class LanguageManager:
+    """Nyelvkezelő osztály"""
+    def __init__(self):
+        self.current_language = "hu"  # Alapértelmezett: magyar
+
+        # Szöveg fordítások
+        self.texts = {
+            "hu": {
+                # Főablak
+                "window_title": "LockMyPix Decrypter",
+                "app_title": "🔓 LockMyPix Decrypter",
+
+                # Csoportok
+                "folders_group": "📁 Mappák",
+                "controls_group": "🎛️ Vezérlés",
+                "progress_group": "📊 Haladás",
+                "log_group": "📝 Napló",
+                "log_level_label": "Szint:",
+                "log_level_info": "Minden",
+                "log_level_warning": "Figyelmeztetések és hibák",
+                "log_level_error": "Csak hibák",
+                "log_stage_label": "Szakasz:",
+                "log_stage_all": "Mind",
+                "log_stage_app": "Alkalmazás",
+                "log_stage_scan": "Keresés",
+                "log_stage_decrypt": "Dekriptálás",
+                "log_cap_label": "Megtartott sorok:",
+
+                # Mezők
+                "input_label": "Bemenet:",
+                "output_label": "Kimenet:",
+                "format_label": "Formátum:",
+                "format_dir": "Mappa (külön fájlok)",
+                "format_tar": "TAR archívum",
+                "format_zip": "ZIP archívum (tömörítés nélkül)",
+                "order_label": "Sorrend:",
+                "order_largest": "Legnagyobb elöl (leggyorsabb teljes futás)",
+                "order_smallest": "Képek és kis fájlok elöl",
+                "order_album": "Album sorrend",
+                "order_discovery": "Bejárási sorrend",
+                "input_placeholder": "Titkosított fájlok vagy .zip.cmpexport...",
+                "output_placeholder": "Dekriptált fájlok helye...",
+
+                # Gombok
+                "browse_button": "Tallózás",
+                "start_button": "▶️ Indítás",
+                "stop_button": "⏹️ Leállítás",
+                "log_button": "📋 Napló",
+
+                # Állapotok
+                "ready_status": "Kész - Backup és egyedi fájlok támogatva",
+                "scanning": "Keresés...",
+                "tuning": "Darabméret és szálszám kalibrálása a kimeneti eszközhöz...",
+                "cipher_backend": "Titkosító backend",
+                "finished_status": "Kész",
+
+                # Üzenetek - Worker
+                "password_test_error": "Jelszó teszt hiba",
+                "no_files": "Nincsenek támogatott titkosított fájlok!",
+                "interrupted": "Megszakítva",
+                "archive_incomplete": "Egy bejegyzés írása félbeszakadt - az archívum nem készült el",
+                "processing": "Feldolgozás",
+                "completed": "Kész",
+                "error": "Hiba",
+                "password_checking": "Jelszó ellenőrzése...",
+                "wrong_password": "Helytelen jelszó!",
+                "decrypting": "Dekriptálás...",
+                "files_processed": "fájl sikeresen dekriptálva",
+
+                # .zip.cmpexport üzenetek
+                "cmpexport_detected": "LockMyPix backup észlelve",
+                "extracting_zip": "ZIP kicsomagolása",
+                "analyzing_sortdb": "Sort.db elemzése",
+                "loading_keyfiles": "Kulcs fájlok betöltése",
+                "decrypting_folder": "Titkosított mappa dekriptálása",
+                "mapping_files": "Fájlnév mapping alkalmazása",
+                "cleanup_temp": "Temp fájlok törlése",
+                "backup_processed": "backup sikeresen feldolgozva",
+                "intelligent_naming": "Intelligens névgenerálás",
+                "timestamp_restore": "Időbélyegek helyreállítása",
+                "folder_rename": "Mappák átnevezése",
+
+                # Üzenetek - UI
+                "app_started": "Alkalmazás elindítva",
+                "input_selected": "Bemenet",
+                "output_selected": "Kimenet",
+                "password_prompt": "Add meg a jelszót:",
+                "password_title": "Jelszó szükséges",
+                "error_title": "Hiba",
+                "missing_folders": "Adja meg a mappákat!",
+                "folder_not_exists": "A bemeneti mappa nem létezik!",
+                "decrypt_starting": "Dekriptálás indítása...",
+                "stopping": "Leállítás...",
+                "success_title": "Siker",
+                "finished": "Befejezve",
+                "log_opened": "Napló megnyitva",
+                "info_title": "Info",
+                "no_log_file": "Nincs napló fájl",
+                "log_open_error": "Napló megnyitási hiba",
+
+                # Dialógusok
+                "input_folder_dialog": "Bemeneti mappa vagy fájl",
+                "output_folder_dialog": "Kimeneti mappa",
+            },
+            "en": {
+                # Main window
+                "window_title": "LockMyPix Decrypter",
+                "app_title": "🔓 LockMyPix Decrypter",
+
+                # Groups
+                "folders_group": "📁 Folders",
+                "controls_group": "🎛️ Controls",
+                "progress_group": "📊 Progress",
+                "log_group": "📝 Log",
+                "log_level_label": "Level:",
+                "log_level_info": "All",
+                "log_level_warning": "Warnings and errors",
+                "log_level_error": "Errors only",
+                "log_stage_label": "Stage:",
+                "log_stage_all": "All",
+                "log_stage_app": "Application",
+                "log_stage_scan": "Scan",
+                "log_stage_decrypt": "Decryption",
+                "log_cap_label": "Lines kept:",
+
+                # Fields
+                "input_label": "Input:",
+                "output_label": "Output:",
+                "format_label": "Format:",
+                "format_dir": "Folder (individual files)",
+                "format_tar": "TAR archive",
+                "format_zip": "ZIP archive (stored)",
+                "order_label": "Order:",
+                "order_largest": "Largest first (shortest total run)",
+                "order_smallest": "Images and small files first",
+                "order_album": "Album order",
+                "order_discovery": "Discovery order",
+                "input_placeholder": "Encrypted files or .zip.cmpexport...",
+                "output_placeholder": "Decrypted files location...",
+
+                # Buttons
+                "browse_button": "Browse",
+                "start_button": "▶️ Start",
+                "stop_button": "⏹️ Stop",
+                "log_button": "📋 Log",
+
+                # Status
+                "ready_status": "Ready - Backup and individual files supported",
+                "scanning": "Scanning...",
+                "tuning": "Calibrating chunk size and worker count for the output device...",
+                "cipher_backend": "Cipher backend",
+                "finished_status": "Finished",
+
+                # Messages - Worker
+                "password_test_error": "Password test error",
+                "no_files": "No supported encrypted files found!",
+                "interrupted": "Interrupted",
+                "archive_incomplete": "Writing an entry was interrupted - the archive was not created",
+                "processing": "Processing",
+                "completed": "Completed",
+                "error": "Error",
+                "password_checking": "Checking password...",
+                "wrong_password": "Wrong password!",
+                "decrypting": "Decrypting...",
+                "files_processed": "files successfully decrypted",
+
+                # .zip.cmpexport messages
+                "cmpexport_detected": "LockMyPix backup detected",
+                "extracting_zip": "Extracting ZIP",
+                "analyzing_sortdb": "Analyzing sort.db",
+                "loading_keyfiles": "Loading key files",
+                "decrypting_folder": "Decrypting encrypted folder",
+                "mapping_files": "Applying filename mapping",
+                "cleanup_temp": "Cleaning temp files",
+                "backup_processed": "backup successfully processed",
+                "intelligent_naming": "Intelligent name generation",
+                "timestamp_restore": "Timestamp restoration",
+                "folder_rename": "Folder renaming",
+
+                # Messages - UI
+                "app_started": "Application started",
+                "input_selected": "Input",
+                "output_selected": "Output",
+                "password_prompt": "Enter password:",
+                "password_title": "Password Required",
+                "error_title": "Error",
+                "missing_folders": "Please specify folders!",
+                "folder_not_exists": "Input folder does not exist!",
+                "decrypt_starting": "Starting decryption...",
+                "stopping": "Stopping...",
+                "success_title": "Success",
+                "finished": "Finished",
+                "log_opened": "Log file opened",
+                "info_title": "Info",
+                "no_log_file": "No log file",
+                "log_open_error": "Log file open error",
+
+                # Dialogs
+                "input_folder_dialog": "Input Folder or File",
+                "output_folder_dialog": "Output Folder",
+            }
+        }
+
+    def set_language(self, lang_code):
+        """Nyelv beállítása"""
+        if lang_code in self.texts:
+            self.current_language = lang_code
+
+    def get_text(self, key):
+        """Szöveg lekérdezése aktuális nyelven"""
+        return self.texts[self.current_language].get(key, key)
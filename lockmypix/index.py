@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""Bemeneti könyvtár indexelése és gyorsítótárazása."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .formats import EXTENSION_MAP
+from .streaming import check_cancelled
+
+# ======================================
+# BEMENETI INDEX - Egyszeri os.scandir bejárás, közösen használva
+# ======================================
+
+# Párhuzamos könyvtárbejárás szálainak száma (hálózati fájlrendszeren a késleltetés dominál)
+WALK_WORKERS = 8
+
+class InputEntry:
+    """Egy bemeneti fájl scandir alapú adatai (név, út, relatív mappa, méret, inode, mtime)"""
+    __slots__ = ("name", "path", "rel_dir", "size", "inode", "mtime", "ext")
+
+    def __init__(self, name, path, size, inode, mtime, rel_dir=""):
+        self.name = name
+        self.path = path
+        self.rel_dir = rel_dir
+        self.size = size
+        self.inode = inode
+        self.mtime = mtime
+        self.ext = os.path.splitext(name)[1].lower()
+
+    @classmethod
+    def from_dir_entry(cls, dir_entry, rel_dir=""):
+        stat = dir_entry.stat()
+        return cls(dir_entry.name, dir_entry.path, stat.st_size, dir_entry.inode(), stat.st_mtime, rel_dir)
+
+    @classmethod
+    def from_path(cls, file_path):
+        stat = os.stat(file_path)
+        return cls(os.path.basename(file_path), file_path, stat.st_size, stat.st_ino, stat.st_mtime)
+
+def entry_sort_key(entry):
+    """Rögzített bemeneti sorrend (index, terv, sorszámozás és névkiosztás): relatív mappa, majd név"""
+    return (entry.rel_dir, entry.name)
+
+def is_within(path, folder):
+    """Az útvonal a megadott mappán belül van-e (vagy azonos vele)"""
+    if not folder:
+        return False
+    path = os.path.normcase(os.path.abspath(path))
+    folder = os.path.normcase(os.path.abspath(folder))
+    return path == folder or path.startswith(os.path.join(folder, ""))
+
+def iter_parallel_walk(root, exclude=(), stop_check=None, recursive=True,
+                       max_workers=WALK_WORKERS, dir_mtimes=None):
+    """
+    Bemeneti fájlok felfedezése os.scandir-rel, alkönyvtáranként párhuzamosan
+    A fájlok azonnal visszaadódnak, ahogy egy könyvtár bejárása elkészül,
+    nem kell megvárni a teljes bejárást
+
+    Args:
+        root (str): Bemeneti mappa (vagy egyetlen fájl)
+        exclude: Kihagyandó mappák (pl. a bemeneten belüli kimeneti mappa)
+        stop_check (callable): True esetén OperationCancelled
+        recursive (bool): Alkönyvtárak bejárása
+        max_workers (int): Párhuzamos scandir szálak száma
+        dir_mtimes (dict): Ha megadva, a bejárt mappák st_mtime_ns értékei ide kerülnek
+
+    Yields:
+        InputEntry: Talált fájlok (rel_dir a gyökérhez képest)
+    """
+    if os.path.isfile(root):
+        yield InputEntry.from_path(root)
+        return
+
+    def scan_directory(dir_path, rel_dir):
+        files, subdirs = [], []
+        with os.scandir(dir_path) as iterator:
+            for dir_entry in iterator:
+                if stop_check and stop_check():
+                    break
+                try:
+                    if dir_entry.is_dir(follow_symlinks=False):
+                        if recursive and not any(is_within(dir_entry.path, folder) for folder in exclude):
+                            subdirs.append((dir_entry.path, os.path.join(rel_dir, dir_entry.name)))
+                    elif dir_entry.is_file():
+                        files.append(InputEntry.from_dir_entry(dir_entry, rel_dir))
+                except OSError:
+                    continue
+        return os.stat(dir_path).st_mtime_ns, files, subdirs
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        pending = {executor.submit(scan_directory, root, ""): root}
+        while pending:
+            check_cancelled(stop_check)
+            done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            for future in done:
+                dir_path = pending.pop(future)
+                try:
+                    mtime_ns, files, subdirs = future.result()
+                except OSError:
+                    if dir_path == root:
+                        raise
+                    continue  # Olvashatatlan alkönyvtár kihagyása
+                if dir_mtimes is not None:
+                    dir_mtimes[dir_path] = mtime_ns
+                for subdir_path, subdir_rel in subdirs:
+                    pending[executor.submit(scan_directory, subdir_path, subdir_rel)] = subdir_path
+                for entry in files:
+                    yield entry
+        check_cancelled(stop_check)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+class InputIndex:
+    """
+    Bemeneti mappa (vagy egyetlen fájl) indexe egyetlen (párhuzamos) scandir bejárásból
+    A GUI, a jelszóellenőrzés és a worker ugyanezt az indexet használja,
+    így fájlonként nincs újabb listdir/isfile/stat hívás
+    """
+
+    def __init__(self, root, entries, dir_mtimes=None, exclude=()):
+        self.root = root
+        self.entries = entries
+        self.dir_mtimes = dir_mtimes
+        self.exclude = tuple(exclude)
+
+    @classmethod
+    def scan(cls, root, stop_check=None, on_entry=None, exclude=(), recursive=True):
+        """
+        Bejárás os.scandir-rel (a DirEntry típusinformációja miatt nincs külön isfile)
+
+        Args:
+            root (str): Bemeneti mappa vagy egyetlen fájl
+            stop_check (callable): True esetén a bejárás OperationCancelled-del megszakad
+            on_entry (callable): Minden talált fájlnál hívva (InputEntry) - részeredményekhez
+            exclude: Kihagyandó mappák (pl. kimeneti mappa a bemeneten belül)
+            recursive (bool): Alkönyvtárak bejárása
+        """
+        dir_mtimes = None if os.path.isfile(root) else {}
+        entries = []
+        for entry in iter_parallel_walk(root, exclude, stop_check, recursive, dir_mtimes=dir_mtimes):
+            entries.append(entry)
+            if on_entry:
+                on_entry(entry)
+
+        # Determinisztikus sorrend (a párhuzamos bejárás sorrendje véletlenszerű)
+        entries.sort(key=entry_sort_key)
+        return cls(root, entries, dir_mtimes, exclude)
+
+    def is_current(self, root):
+        """Érvényes-e még az index (ugyanaz a gyökér és egyik bejárt mappa sem változott)"""
+        if os.path.normpath(root) != os.path.normpath(self.root):
+            return False
+        if self.dir_mtimes is None:
+            return os.path.isfile(root)
+        try:
+            return all(os.stat(dir_path).st_mtime_ns == mtime_ns
+                       for dir_path, mtime_ns in self.dir_mtimes.items())
+        except OSError:
+            return False
+
+    def supported_entries(self):
+        """Támogatott titkosított fájlok (backup fájl nélkül)"""
+        return [entry for entry in self.entries if entry.ext in EXTENSION_MAP]
+
+    def extension_counts(self):
+        """Támogatott fájlok száma kiterjesztésenként"""
+        counts = {}
+        for entry in self.supported_entries():
+            counts[entry.ext] = counts.get(entry.ext, 0) + 1
+        return counts
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""Strukturált naplózás: szöveges és JSON-lines kimenet, aszinkron listener."""
+
+from datetime import datetime
+import logging
+from logging.handlers import QueueHandler, QueueListener
+import queue
+import atexit
+import json
+
+# ======================================
+# NAPLÓZÁS - Sor alapú (háttérszálas) naplózás, JSON-lines strukturált napló
+# ======================================
+
+LOGGER = logging.getLogger("lockmypix")
+LOGGER.addHandler(logging.NullHandler())  # Beállított naplózás nélkül az események csendben elvesznek
+
+# Strukturált eseménymezők (logging extra=...), a JSON-lines naplóba kerülnek
+LOG_EVENT_FIELDS = ("stage", "file", "output", "bytes", "duration", "error")
+
+def log_event(stage, message, level=logging.INFO, **fields):
+    """
+    Strukturált esemény naplózása (pl. fájlonként: file, bytes, duration, error)
+    Csak a JSON-lines naplóba kerül, az olvasható napló változatlan marad
+    """
+    LOGGER.log(level, message, extra={"stage": stage, **fields})
+
+class PlainLogFilter(logging.Filter):
+    """Olvasható naplóhoz: a strukturált események kiszűrése (azok a JSON naplóba mennek)"""
+
+    def filter(self, record):
+        return not hasattr(record, "stage")
+
+class JsonLinesFormatter(logging.Formatter):
+    """Egy napló esemény = egy JSON sor a strukturált mezőkkel"""
+
+    def format(self, record):
+        event = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        for field in LOG_EVENT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                event[field] = value
+        return json.dumps(event, ensure_ascii=False)
+
+def start_async_logging(log_file, json_log_file=None, console=True):
+    """
+    Naplózás háttérszálon: a hívó (GUI vagy dekriptáló szál) csak sorba tesz,
+    a fájl- és konzolírást egy QueueListener végzi
+
+    Returns:
+        QueueListener: a futó listener (kilépéskor automatikusan leáll és kiüríti a sort)
+    """
+    plain_formatter = logging.Formatter('%(asctime)s - %(message)s')
+    handlers = [logging.FileHandler(log_file, encoding='utf-8')] if log_file else []
+    if console:
+        handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(plain_formatter)
+        handler.addFilter(PlainLogFilter())
+
+    if json_log_file:
+        json_handler = logging.FileHandler(json_log_file, encoding='utf-8')
+        json_handler.setFormatter(JsonLinesFormatter())
+        handlers.append(json_handler)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))  # A végleges formázás a listeneré
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler], force=True)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
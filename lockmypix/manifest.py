@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""Audit manifest írása."""
+
+import os
+import hashlib
+import csv
+import json
+import threading
+
+# ======================================
+# AUDIT MANIFEST - Kimeneti fájlok hash-e (chain of custody)
+# ======================================
+
+MANIFEST_FIELDS = ("source", "sort_id", "output", "size", "sha256", "source_sha256")
+
+class AuditManifest:
+    """
+    Audit manifest írása CSV vagy JSONL formátumban (a kiterjesztés alapján)
+    A hash-ek a dekriptálási ciklusban készülnek, külön olvasási menet nélkül
+
+    deferred=True esetén a sorok elkészüléskor egy mellette lévő rejtett naplóba
+    (JSONL) kerülnek, és csak lezáráskor íródnak át a manifestbe, hogy a mappák
+    utólagos átnevezése (rename_prefix) még érvényesíthető legyen - memóriában csak
+    az átnevezések listája marad, a sorok nem
+    """
+
+    def __init__(self, manifest_path, hash_source=False, deferred=False):
+        self.manifest_path = manifest_path
+        self.hash_source = hash_source
+        self.deferred = deferred
+        self.renames = []  # (régi mappa előtag, új mappa) a lezáráskor alkalmazva
+        self.is_jsonl = manifest_path.lower().endswith((".jsonl", ".json"))
+        self.lock = threading.Lock()
+        self.file = open(manifest_path, "w", encoding="utf-8", newline="")
+        if not self.is_jsonl:
+            self.writer = csv.DictWriter(self.file, fieldnames=MANIFEST_FIELDS)
+            self.writer.writeheader()
+        self.journal_path = None
+        self.journal = None
+        if deferred:
+            directory, name = os.path.split(os.path.abspath(manifest_path))
+            self.journal_path = os.path.join(directory, f".{name}.journal")
+            self.journal = open(self.journal_path, "w", encoding="utf-8")
+
+    def new_hashes(self):
+        """Hash objektumok egy fájlhoz: (forrás hash-ek, kimeneti hash-ek)"""
+        source_hashes = [hashlib.sha256()] if self.hash_source else []
+        return source_hashes, [hashlib.sha256()]
+
+    def add(self, source, sort_id, output, size, source_hashes, target_hashes):
+        """Egy feldolgozott fájl rögzítése"""
+        record = {
+            "source": source,
+            "sort_id": sort_id or "",
+            "output": output,
+            "size": size,
+            "sha256": target_hashes[0].hexdigest(),
+            "source_sha256": source_hashes[0].hexdigest() if source_hashes else "",
+        }
+        with self.lock:
+            if self.deferred:
+                self.journal.write(json.dumps(record, ensure_ascii=False) + "\n")
+                self.journal.flush()
+            else:
+                self.write_record(record)
+                self.file.flush()
+
+    def write_record(self, record):
+        if self.is_jsonl:
+            self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        else:
+            self.writer.writerow(record)
+
+    def rename_prefix(self, old_path, new_path):
+        """Átnevezett mappa érvényesítése a még ki nem írt sorokban (lezáráskor)"""
+        with self.lock:
+            self.renames.append((os.path.join(old_path, ""), new_path))
+
+    def renamed_output(self, output):
+        """Kimeneti útvonal az átnevezések után (sorrendben alkalmazva)"""
+        for old_prefix, new_path in self.renames:
+            if output.startswith(old_prefix):
+                output = os.path.join(new_path, output[len(old_prefix):])
+        return output
+
+    def close(self):
+        """Naplózott sorok átírása a manifestbe az átnevezésekkel, napló törlése (többször is hívható)"""
+        with self.lock:
+            if self.journal:
+                self.journal.close()
+                self.journal = None
+                with open(self.journal_path, "r", encoding="utf-8") as journal:
+                    for line in journal:
+                        record = json.loads(line)
+                        record["output"] = self.renamed_output(record["output"])
+                        self.write_record(record)
+                os.remove(self.journal_path)
+            if not self.file.closed:
+                self.file.close()
@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+"""Videó és kép metaadatok kiolvasása időbélyeghez."""
+
+import os
+import re
+import struct
+from datetime import datetime
+
+from .formats import real_extension
+from .crypto import open_media
+
+# ======================================
+# VIDEÓ METAADATOK - ISO-BMFF (MP4/MOV/M4V/3GP) atomok seek alapú olvasása
+# ======================================
+
+# mvhd időbélyegek 1904-01-01 UTC-től számolva
+MP4_EPOCH_OFFSET = 2082844800
+
+ISO_BMFF_EXTENSIONS = {'.mp4', '.mov', '.m4v', '.3gp', '.3gpp'}
+
+def iter_bmff_boxes(f, start, end):
+    """
+    ISO-BMFF dobozok bejárása [start, end) tartományban, csak a fejlécek olvasásával
+
+    Yields:
+        tuple: (doboz típus, tartalom kezdete, doboz vége)
+    """
+    offset = start
+    while offset + 8 <= end:
+        f.seek(offset)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, box_type = struct.unpack(">I4s", header)
+        header_len = 8
+        if size == 1:
+            extended = f.read(8)
+            if len(extended) < 8:
+                return
+            size = struct.unpack(">Q", extended)[0]
+            header_len = 16
+        elif size == 0:
+            size = end - offset
+        if size < header_len:
+            return
+        yield box_type, offset + header_len, min(offset + size, end)
+        offset += size
+
+def find_bmff_box(f, start, end, box_type):
+    """Első adott típusú gyerekdoboz (tartalom kezdete, vége) vagy None"""
+    for child_type, child_start, child_end in iter_bmff_boxes(f, start, end):
+        if child_type == box_type:
+            return child_start, child_end
+    return None
+
+def parse_media_date_string(value):
+    """Videó dátum szöveg (pl. '2020-01-02T03:04:05+0100', '...Z') -> helyi idejű datetime"""
+    value = value.strip().strip("\x00")
+    value = re.sub(r"Z$", "+00:00", value)
+    value = re.sub(r"([+-]\d{2})(\d{2})$", r"\1:\2", value)
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+def read_udta_day(f, udta_start, udta_end):
+    """©day dátum a udta dobozból (QuickTime és iTunes/ilst formátum)"""
+    day_box = find_bmff_box(f, udta_start, udta_end, b"\xa9day")
+    if day_box:
+        f.seek(day_box[0])
+        payload = f.read(min(day_box[1] - day_box[0], 256))
+        # QuickTime: u16 hossz, u16 nyelv, szöveg
+        if len(payload) >= 4 and payload[4:8] != b"data":
+            length = struct.unpack(">H", payload[:2])[0]
+            return parse_media_date_string(payload[4:4 + length].decode("utf-8", "replace"))
+
+    # iTunes stílus: udta/meta (full box) /ilst/©day/data
+    meta_box = find_bmff_box(f, udta_start, udta_end, b"meta")
+    if meta_box:
+        ilst_box = find_bmff_box(f, meta_box[0] + 4, meta_box[1], b"ilst")
+        if ilst_box:
+            day_box = find_bmff_box(f, ilst_box[0], ilst_box[1], b"\xa9day")
+            if day_box:
+                data_box = find_bmff_box(f, day_box[0], day_box[1], b"data")
+                if data_box:
+                    f.seek(data_box[0] + 8)  # típus + locale
+                    payload = f.read(min(data_box[1] - data_box[0] - 8, 256))
+                    return parse_media_date_string(payload.decode("utf-8", "replace"))
+    return None
+
+def read_mvhd_datetime(f, mvhd_start):
+    """moov/mvhd creation_time (UTC, 1904 epoch) -> helyi idejű datetime"""
+    f.seek(mvhd_start)
+    data = f.read(12)
+    if len(data) < 8:
+        return None
+    if data[0] == 1 and len(data) >= 12:
+        creation_time = struct.unpack(">Q", data[4:12])[0]
+    else:
+        creation_time = struct.unpack(">I", data[4:8])[0]
+    if creation_time <= MP4_EPOCH_OFFSET:
+        return None  # 0 vagy 1970 előtti érték = nincs kitöltve
+    try:
+        return datetime.fromtimestamp(creation_time - MP4_EPOCH_OFFSET)
+    except (OverflowError, OSError, ValueError):
+        return None
+
+def get_video_datetime(file_path, key=None):
+    """
+    Videó felvételi dátuma az MP4/MOV atomokból (udta ©day, különben moov/mvhd)
+    Csak a dobozfejlécek és a két érintett atom kerül beolvasásra; kulccsal a még
+    titkosított forrásfájlból is olvasható (véletlen hozzáférésű dekriptálás)
+    """
+    if real_extension(file_path) not in ISO_BMFF_EXTENSIONS:
+        return None
+
+    try:
+        with open_media(file_path, key) as f:
+            return read_video_datetime(f)
+    except (OSError, struct.error):
+        return None
+
+def read_video_datetime(f):
+    """Videó felvételi dátuma egy megnyitott (kereshető) fájlobjektumból"""
+    file_end = f.seek(0, os.SEEK_END)
+    moov_box = find_bmff_box(f, 0, file_end, b"moov")
+    if not moov_box:
+        return None
+
+    udta_box = find_bmff_box(f, moov_box[0], moov_box[1], b"udta")
+    if udta_box:
+        day = read_udta_day(f, *udta_box)
+        if day:
+            return day
+
+    mvhd_box = find_bmff_box(f, moov_box[0], moov_box[1], b"mvhd")
+    if mvhd_box:
+        return read_mvhd_datetime(f, mvhd_box[0])
+    return None
+
+# ======================================
+# KÉP METAADATOK - Natív EXIF olvasás (TIFF IFD, JPEG APP1, HEIF iloc, PNG, WebP)
+# ======================================
+
+# EXIF dátum tagek prioritás szerint (DateTime, DateTimeOriginal, DateTimeDigitized)
+EXIF_DATE_TAGS = (0x0132, 0x9003, 0x9004)
+EXIF_IFD_POINTER = 0x8769
+EXIF_MAX_ENTRIES = 1024
+
+def read_at(f, offset, size):
+    """Pontosan size bájt olvasása az adott pozícióról (rövidebb olvasásnál struct.error)"""
+    f.seek(offset)
+    data = f.read(size)
+    if len(data) < size:
+        raise struct.error("rövid olvasás")
+    return data
+
+def parse_exif_date(value):
+    """EXIF dátum ('YYYY:MM:DD HH:MM:SS') -> datetime vagy None"""
+    try:
+        return datetime.strptime(value.strip(" \x00")[:19], "%Y:%m:%d %H:%M:%S")
+    except ValueError:
+        return None
+
+def read_tiff_ifd(f, base, offset, endian):
+    """Egy TIFF IFD bejegyzései: {tag: (típus, darabszám, érték/offset nyers 4 bájt)}"""
+    count = struct.unpack(endian + "H", read_at(f, base + offset, 2))[0]
+    if count > EXIF_MAX_ENTRIES:
+        return {}
+    raw = read_at(f, base + offset + 2, count * 12)
+    entries = {}
+    for i in range(count):
+        tag, field_type, value_count = struct.unpack(endian + "HHI", raw[i * 12:i * 12 + 8])
+        entries[tag] = (field_type, value_count, raw[i * 12 + 8:i * 12 + 12])
+    return entries
+
+def read_tiff_ascii(f, base, entry, endian):
+    """ASCII típusú IFD érték beolvasása (4 bájtig helyben, egyébként offsetről)"""
+    field_type, value_count, value = entry
+    if field_type != 2 or value_count > 64:
+        return None
+    if value_count <= 4:
+        data = value[:value_count]
+    else:
+        data = read_at(f, base + struct.unpack(endian + "I", value)[0], value_count)
+    return data.decode("ascii", "replace")
+
+def read_tiff_datetime(f, base=0):
+    """
+    Dátum a TIFF struktúrából (IFD0 DateTime, Exif IFD DateTimeOriginal/Digitized)
+    Csak az IFD táblák és a dátum szövegek kerülnek beolvasásra
+    """
+    header = read_at(f, base, 8)
+    if header[:2] == b"II":
+        endian = "<"
+    elif header[:2] == b"MM":
+        endian = ">"
+    else:
+        return None
+    if struct.unpack(endian + "H", header[2:4])[0] != 42:
+        return None
+
+    ifd0 = read_tiff_ifd(f, base, struct.unpack(endian + "I", header[4:8])[0], endian)
+    tags = dict(ifd0)
+    if EXIF_IFD_POINTER in ifd0:
+        exif_offset = struct.unpack(endian + "I", ifd0[EXIF_IFD_POINTER][2])[0]
+        for tag, entry in read_tiff_ifd(f, base, exif_offset, endian).items():
+            tags.setdefault(tag, entry)
+
+    for tag in EXIF_DATE_TAGS:
+        if tag in tags:
+            value = read_tiff_ascii(f, base, tags[tag], endian)
+            date = parse_exif_date(value) if value else None
+            if date:
+                return date
+    return None
+
+def find_jpeg_exif(f):
+    """JPEG: APP1 'Exif' szegmens TIFF fejlécének pozíciója (a képadat előtt megállva)"""
+    offset = 2
+    for _ in range(64):
+        marker = read_at(f, offset, 4)
+        if marker[0] != 0xFF or marker[1] in (0xDA, 0xD9):
+            return None
+        length = struct.unpack(">H", marker[2:4])[0]
+        if marker[1] == 0xE1 and read_at(f, offset + 4, 6) == b"Exif\x00\x00":
+            return offset + 10
+        offset += 2 + length
+    return None
+
+def find_png_exif(f):
+    """PNG: eXIf chunk tartalmának pozíciója (IDAT előtt)"""
+    offset = 8
+    for _ in range(256):
+        length, chunk_type = struct.unpack(">I4s", read_at(f, offset, 8))
+        if chunk_type == b"eXIf":
+            return offset + 8
+        if chunk_type in (b"IDAT", b"IEND"):
+            return None
+        offset += 12 + length
+    return None
+
+def find_webp_exif(f):
+    """WebP (RIFF): EXIF chunk tartalmának pozíciója"""
+    offset = 12
+    for _ in range(64):
+        chunk_type, length = struct.unpack("<4sI", read_at(f, offset, 8))
+        if chunk_type == b"EXIF":
+            start = offset + 8
+            return start + 6 if read_at(f, start, 6) == b"Exif\x00\x00" else start
+        offset += 8 + length + (length & 1)
+    return None
+
+def read_sized_int(data, pos, size):
+    """Változó méretű (0/4/8 bájtos) big-endian egész az iloc dobozból"""
+    if size == 0:
+        return 0, pos
+    return int.from_bytes(data[pos:pos + size], "big"), pos + size
+
+def find_heif_exif(f, file_end):
+    """
+    HEIF/HEIC: meta/iinf alapján az 'Exif' elem azonosítója, meta/iloc alapján
+    a helye - csak a meta doboz kerül beolvasásra, a képadat nem
+    """
+    meta_box = find_bmff_box(f, 0, file_end, b"meta")
+    if not meta_box:
+        return None
+    meta_start, meta_end = meta_box[0] + 4, meta_box[1]  # full box: verzió + flagek
+
+    # 1. Exif elem azonosító (iinf/infe)
+    iinf_box = find_bmff_box(f, meta_start, meta_end, b"iinf")
+    if not iinf_box:
+        return None
+    version = read_at(f, iinf_box[0], 1)[0]
+    entries_start = iinf_box[0] + (6 if version == 0 else 8)
+    exif_item_id = None
+    for box_type, start, end in iter_bmff_boxes(f, entries_start, iinf_box[1]):
+        if box_type != b"infe":
+            continue
+        infe = read_at(f, start, min(end - start, 16))
+        infe_version = infe[0]
+        if infe_version == 2:
+            item_id, item_type = struct.unpack(">H", infe[4:6])[0], infe[8:12]
+        elif infe_version == 3:
+            item_id, item_type = struct.unpack(">I", infe[4:8])[0], infe[10:14]
+        else:
+            continue
+        if item_type == b"Exif":
+            exif_item_id = item_id
+            break
+    if exif_item_id is None:
+        return None
+
+    # 2. Elem helye (iloc)
+    iloc_box = find_bmff_box(f, meta_start, meta_end, b"iloc")
+    if not iloc_box:
+        return None
+    data = read_at(f, iloc_box[0], min(iloc_box[1] - iloc_box[0], 64 * 1024))
+    version = data[0]
+    offset_size, length_size = data[4] >> 4, data[4] & 0x0F
+    base_offset_size, index_size = data[5] >> 4, (data[5] & 0x0F if version in (1, 2) else 0)
+    pos = 6
+    if version < 2:
+        item_count, pos = struct.unpack(">H", data[pos:pos + 2])[0], pos + 2
+    else:
+        item_count, pos = struct.unpack(">I", data[pos:pos + 4])[0], pos + 4
+
+    for _ in range(item_count):
+        if version < 2:
+            item_id, pos = struct.unpack(">H", data[pos:pos + 2])[0], pos + 2
+        else:
+            item_id, pos = struct.unpack(">I", data[pos:pos + 4])[0], pos + 4
+        construction_method = 0
+        if version in (1, 2):
+            construction_method, pos = struct.unpack(">H", data[pos:pos + 2])[0] & 0x0F, pos + 2
+        pos += 2  # data_reference_index
+        base_offset, pos = read_sized_int(data, pos, base_offset_size)
+        extent_count, pos = struct.unpack(">H", data[pos:pos + 2])[0], pos + 2
+        first_extent = None
+        for _ in range(extent_count):
+            _, pos = read_sized_int(data, pos, index_size)
+            extent_offset, pos = read_sized_int(data, pos, offset_size)
+            _, pos = read_sized_int(data, pos, length_size)
+            if first_extent is None:
+                first_extent = extent_offset
+        if item_id == exif_item_id:
+            if construction_method != 0 or first_extent is None:
+                return None  # idat alapú tárolás - ritka, nem támogatott
+            item_start = base_offset + first_extent
+            # Exif elem: 4 bájtos offset a TIFF fejlécig (általában az 'Exif\0\0' után)
+            tiff_offset = struct.unpack(">I", read_at(f, item_start, 4))[0]
+            return item_start + 4 + tiff_offset
+    return None
+
+def read_image_datetime(f):
+    """Natív dátumkinyerés képből a tartalom (magic) alapján, csak fejléc olvasással"""
+    file_end = f.seek(0, os.SEEK_END)
+    header = read_at(f, 0, 16)
+
+    if header.startswith(b"\xff\xd8"):
+        tiff_base = find_jpeg_exif(f)
+    elif header.startswith(b"\x89PNG"):
+        tiff_base = find_png_exif(f)
+    elif header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        tiff_base = find_webp_exif(f)
+    elif header[:4] in (b"II*\x00", b"MM\x00*"):
+        tiff_base = 0  # TIFF és DNG
+    elif header[4:8] == b"ftyp":
+        tiff_base = find_heif_exif(f, file_end)
+    else:
+        return None  # GIF, BMP: nincs EXIF
+
+    return read_tiff_datetime(f, tiff_base) if tiff_base is not None else None
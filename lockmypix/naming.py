@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+"""Intelligens fájl- és mappaelnevezés."""
+
+import os
+import struct
+import sqlite3
+from pathlib import Path
+from datetime import datetime
+
+# EXIF támogatás (opcionális)
+try:
+    from PIL import Image, ExifTags
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+from .formats import IMAGE_EXTENSIONS, VIDEO_EXTENSIONS, real_extension
+from .crypto import open_media
+from .streaming import clean_member_path
+from .metadata import ISO_BMFF_EXTENSIONS, read_image_datetime, read_video_datetime
+
+# ======================================
+# SEGÉDFÜGGVÉNYEK - Intelligens név- és dátumkezelés
+# ======================================
+
+def set_file_timestamps(file_path, datetime_obj):
+    """Fájl időbélyegek beállítása"""
+    timestamp = datetime_obj.timestamp()
+    os.utime(file_path, (timestamp, timestamp))  # (access_time, modified_time)
+
+def get_exif_datetime(image_path, key=None):
+    """
+    EXIF DateTime kinyerése képfájlból
+    Elsőként a natív fejléc olvasó (JPEG, TIFF, DNG, HEIC, PNG, WebP - néhány KB I/O),
+    csak ha az nem talál dátumot, akkor a Pillow alapú teljes megnyitás
+    """
+    try:
+        with open_media(image_path, key) as f:
+            native_date = read_image_datetime(f)
+        if native_date:
+            return native_date
+    except (OSError, struct.error, ValueError, IndexError):
+        pass
+
+    if not HAS_PIL or key:
+        return None
+    return read_pillow_datetime(image_path)
+
+def read_pillow_datetime(image):
+    """EXIF DateTime a Pillow teljes megnyitásával (útvonal vagy seekelhető fájlobjektum)"""
+    try:
+        with Image.open(image) as img:
+            exif_data = img._getexif()
+            if exif_data:
+                for tag_id, value in exif_data.items():
+                    tag = ExifTags.TAGS.get(tag_id, tag_id)
+                    if tag == "DateTime":
+                        return datetime.strptime(value, "%Y:%m:%d %H:%M:%S")
+    except:
+        pass
+    return None
+
+def detect_extension_by_header(file_path, key=None):
+    """Fájl tartalom alapján kiterjesztés meghatározás"""
+    default_ext = Path(file_path).suffix or '.bin'
+    try:
+        with open_media(file_path, key) as f:
+            header = f.read(16)
+    except:
+        return default_ext
+    return extension_from_header(header, default_ext)
+
+def extension_from_header(header, default_ext='.bin'):
+    """Kiterjesztés az első 16 bájt alapján"""
+    # JPEG
+    if header.startswith(b'\xff\xd8\xff'):
+        return '.jpg'
+    # PNG
+    elif header.startswith(b'\x89PNG'):
+        return '.png'
+    # MP4
+    elif b'ftyp' in header:
+        return '.mp4'
+    # GIF
+    elif header.startswith(b'GIF8'):
+        return '.gif'
+    # BMP
+    elif header.startswith(b'BM'):
+        return '.bmp'
+
+    return default_ext
+
+def load_sort_db(sort_db_path):
+    """Sort.db sortorder tábla beolvasása: {id: {directory, sort_order, original_name, date_modified}}"""
+    file_mapping = {}
+    conn = sqlite3.connect(sort_db_path)
+    try:
+        cursor = conn.cursor()
+
+        # sortorder tábla lekérdezése bővített mezőkkel
+        try:
+            cursor.execute("SELECT id, dir, sort, date_modified FROM sortorder ORDER BY sort")
+        except sqlite3.OperationalError:
+            # Ha nincs date_modified mező, csak az alapokat kérjük le
+            cursor.execute("SELECT id, dir, sort FROM sortorder ORDER BY sort")
+
+        rows = cursor.fetchall()
+
+        for row in rows:
+            if len(row) >= 3:
+                id_hash, dir_hash, sort_order = row[0], row[1], row[2]
+                date_modified = row[3] if len(row) > 3 else None
+
+                file_mapping[id_hash] = {
+                    'directory': clean_member_path(dir_hash),  # a kimeneti gyökéren belül marad
+                    'sort_order': int(sort_order),
+                    'original_name': f"file_{sort_order:03d}",
+                    'date_modified': date_modified
+                }
+    finally:
+        conn.close()
+    return file_mapping
+
+class FileProbe:
+    """
+    Egy fájl egyszer kiszámolt metaadatai (típus, kiterjesztés, felvételi dátum, sort.db adatok)
+    A névgenerálás és az időbélyeg helyreállítás ugyanezt használja, így a kép/videó
+    metaadatai fájlonként csak egyszer kerülnek beolvasásra
+    """
+    __slots__ = ("kind", "extension", "capture_date", "sort_info", "header_extension")
+
+    def __init__(self, kind, extension, capture_date=None, sort_info=None, header_extension=None):
+        self.kind = kind
+        self.extension = extension
+        self.capture_date = capture_date
+        self.sort_info = sort_info
+        self.header_extension = header_extension
+
+def probe_file(decrypted_path, file_mapping=None, filename_key=None, key=None):
+    """
+    Fájl metaadatainak egyszeri kinyerése
+
+    Args:
+        decrypted_path (str): Dekriptált (kulccsal: még titkosított) fájl útvonala
+        file_mapping (dict): Sort.db mapping adatok (opcionális)
+        filename_key (str): Fájl azonosító a mapping-ben (opcionális)
+        key (bytes): AES kulcs, ha a fájl még titkosított (opcionális)
+
+    Returns:
+        FileProbe: A fájl metaadatai
+    """
+    return probe_source(lambda: open_media(decrypted_path, key), decrypted_path, file_mapping, filename_key)
+
+def probe_source(open_source, name, file_mapping=None, filename_key=None):
+    """
+    FileProbe egy dekriptált tartalmú, seekelhető nézetből - a valódi futás (kész
+    temp fájl), a dry-run terv és a Vault (titkosított forrás, véletlen hozzáférésű
+    dekriptálással) ugyanezt használja, így ugyanarra a bemenetre ugyanazt a nevet adják
+
+    Args:
+        open_source (callable): Megnyitja a dekriptált nézetet (context manager)
+        name (str): Fájl- vagy bejegyzésnév (a kiterjesztés innen jön)
+        file_mapping (dict): Sort.db mapping adatok (opcionális)
+        filename_key (str): Fájl azonosító a mapping-ben (opcionális)
+    """
+    extension = real_extension(name)
+    sort_info = file_mapping.get(filename_key) if file_mapping and filename_key else None
+    kind = "image" if extension in IMAGE_EXTENSIONS else "video" if extension in VIDEO_EXTENSIONS else "other"
+
+    capture_date = None
+    header = b""
+    try:
+        with open_source() as f:
+            try:
+                if kind == "image":
+                    capture_date = read_image_datetime(f)
+                elif kind == "video" and extension in ISO_BMFF_EXTENSIONS:
+                    capture_date = read_video_datetime(f)
+            except (OSError, struct.error, ValueError, IndexError):
+                pass
+
+            # Natív olvasó nélkül a Pillow teljes megnyitása (képeknél)
+            if kind == "image" and capture_date is None and HAS_PIL:
+                f.seek(0)
+                capture_date = read_pillow_datetime(f)
+
+            # Header alapú kiterjesztés csak a sorrend alapú fallback névhez kell
+            if capture_date is None:
+                f.seek(0)
+                header = f.read(16)
+    except OSError:
+        pass
+
+    header_extension = None
+    if capture_date is None:
+        header_extension = extension_from_header(header, os.path.splitext(name)[1] or '.bin')
+
+    return FileProbe(kind, extension, capture_date, sort_info, header_extension)
+
+def generate_intelligent_filename(file_mapping, hash_id, decrypted_path, sort_order, probe=None):
+    """
+    Intelligens fájlnév generálás hibrid módszerrel
+
+    Args:
+        file_mapping (dict): Sort.db mapping adatok
+        hash_id (str): Fájl hash azonosító
+        decrypted_path (str): Dekriptált fájl útvonala
+        sort_order (int): Rendezési sorszám
+        probe (FileProbe): Előre kiszámolt metaadatok (ha nincs, itt készül)
+
+    Returns:
+        str: Generált fájlnév
+    """
+    if probe is None:
+        probe = probe_file(decrypted_path, file_mapping, hash_id)
+
+    # 1. IMGPATH tábla ellenőrzés (ha implementált) - csak a fájlnév, mappák nélkül
+    original_path = clean_member_path(probe.sort_info.get('original_path')) if probe.sort_info else ""
+    if original_path:
+        return original_path.rsplit('/', 1)[-1]
+
+    # 2. EXIF alapú névgenerálás (képfájlokhoz)
+    # 3. Videó fájlok: felvételi dátum az MP4/MOV atomokból (mvhd / ©day)
+    if probe.capture_date:
+        prefix = "IMG" if probe.kind == "image" else "VID"
+        date_str = probe.capture_date.strftime("%Y%m%d_%H%M%S")
+        return f"{prefix}_{date_str}{probe.extension}"
+
+    # 4. Sorrend alapú fallback
+    file_ext = probe.header_extension or detect_extension_by_header(decrypted_path)
+    return f"file_{sort_order:03d}{file_ext}"
+
+def resolve_file_timestamp(encrypted_path, decrypted_path, file_mapping=None, filename_key=None, probe=None,
+                           source_timestamp=None):
+    """
+    Fájl dátumának meghatározása prioritás alapján (fájl módosítása nélkül)
+
+    Args:
+        encrypted_path (str): Eredeti titkosított fájl útvonala
+        decrypted_path (str): Dekriptált fájl útvonala
+        file_mapping (dict): Sort.db mapping adatok (opcionális)
+        filename_key (str): Fájl azonosító a mapping-ben (opcionális)
+        probe (FileProbe): Előre kiszámolt metaadatok (ha nincs, itt készül)
+        source_timestamp (float): Forrás dátuma, ha nincs fájlja (pl. ZIP bejegyzés)
+
+    Returns:
+        float: Unix időbélyeg
+    """
+    if probe is None:
+        probe = probe_file(decrypted_path, file_mapping, filename_key)
+
+    # 1. ELSŐDLEGES: Sort.db adatbázis dátum
+    if probe.sort_info and probe.sort_info.get('date_modified'):
+        try:
+            return datetime.fromisoformat(probe.sort_info['date_modified']).timestamp()
+        except:
+            pass
+
+    # 2. MÁSODLAGOS: Felvételi dátum (EXIF képeknél, MP4/MOV atomok videóknál)
+    if probe.capture_date:
+        return probe.capture_date.timestamp()
+
+    # 3. HARMADLAGOS: Eredeti fájl OS metadatai (ZIP bejegyzésnél a bejegyzés dátuma)
+    if source_timestamp is not None:
+        return source_timestamp
+    if encrypted_path and os.path.exists(encrypted_path):
+        try:
+            return os.stat(encrypted_path).st_mtime
+        except:
+            pass
+
+    # 4. NEGYEDLEGES: Aktuális idő (fallback)
+    return datetime.now().timestamp()
+
+def restore_file_timestamps(encrypted_path, decrypted_path, file_mapping=None, filename_key=None):
+    """
+    Fájldátumok helyreállítása prioritás alapján
+
+    Args:
+        encrypted_path (str): Eredeti titkosított fájl útvonala
+        decrypted_path (str): Dekriptált fájl útvonala  
+        file_mapping (dict): Sort.db mapping adatok (opcionális)
+        filename_key (str): Fájl azonosító a mapping-ben (opcionális)
+    """
+    timestamp = resolve_file_timestamp(encrypted_path, decrypted_path, file_mapping, filename_key)
+    os.utime(decrypted_path, (timestamp, timestamp))
+
+def rename_folder_by_timestamps(folder_path):
+    """
+    Mappa átnevezése a benne lévő fájlok legkorábbi és legkésőbbi dátuma alapján
+    """
+    if not os.path.exists(folder_path):
+        return folder_path
+
+    timestamps = []
+    for root, dirs, files in os.walk(folder_path):
+        for filename in files:
+            file_path = os.path.join(root, filename)
+            try:
+                ctime = os.path.getctime(file_path)
+                timestamps.append(ctime)
+            except:
+                continue
+
+    if not timestamps:
+        return folder_path  # Nincs fájl a mappában
+
+    # Legkorábbi és legkésőbbi timestamp
+    earliest = datetime.fromtimestamp(min(timestamps)).strftime("%Y%m%d")
+    latest = datetime.fromtimestamp(max(timestamps)).strftime("%Y%m%d")
+
+    # Új mappanév
+    parent = os.path.dirname(folder_path)
+    if earliest == latest:
+        new_name = earliest
+    else:
+        new_name = f"{earliest}-{latest}"
+    new_path = os.path.join(parent, new_name)
+
+    # Ütközés kezelése
+    suffix = 1
+    temp_path = new_path
+    while os.path.exists(temp_path) and temp_path != folder_path:
+        temp_path = f"{new_path}_{suffix}"
+        suffix += 1
+    new_path = temp_path
+
+    # Átnevezés
+    if new_path != folder_path:
+        try:
+            os.rename(folder_path, new_path)
+            print(f"📂 Mappa átnevezve: {os.path.basename(folder_path)} → {os.path.basename(new_path)}")
+            return new_path
+        except Exception as e:
+            print(f"⚠️ Mappa átnevezési hiba: {e}")
+
+    return folder_path
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""Dry-run terv készítése, mentése és betöltése."""
+
+import os
+import zipfile
+import tempfile
+import shutil
+from pathlib import Path
+from datetime import datetime
+import json
+
+from .formats import BACKUP_EXTENSION, EXTENSION_MAP
+from .streaming import check_cancelled, clean_member_path, extract_zip_member, open_stored_member, zip_member_timestamp
+from .crypto import EncryptedReader, derive_key
+from .naming import generate_intelligent_filename, load_sort_db, probe_file, probe_source, resolve_file_timestamp
+from .index import InputIndex
+from .sinks import NameAllocator
+
+# ======================================
+# TERVEZÉS (dry-run) - Csak fejlécek olvasása, a futás előzetes terve
+# ======================================
+
+PLAN_VERSION = 1
+
+def plan_source_key(rel_dir, name):
+    """Bemeneti fájl azonosítója a tervben (a bemeneti gyökérhez képest, '/' elválasztóval)"""
+    return Path(rel_dir, name).as_posix()
+
+def backup_members(zip_ref):
+    """
+    .encrypt bejegyzések a központi könyvtár sorrendjében: (sorszám, ZipInfo, tisztított
+    relatív út) - a terv, a Vault és a valódi futás ugyanígy számoz (sort.db nélküli fallback név)
+    """
+    members = []
+    for info in zip_ref.infolist():
+        if not info.is_dir() and info.filename.startswith(".encrypt/"):
+            members.append((len(members) + 1, info, clean_member_path(info.filename[len(".encrypt/"):])))
+    return members
+
+def is_supported_member(rel_path):
+    """Feldolgozható-e a bejegyzés (biztonságos név, ismert titkosított kiterjesztés)"""
+    return bool(rel_path) and os.path.splitext(rel_path)[1].lower() in EXTENSION_MAP
+
+def open_backup_member(zip_path, zip_ref, info, key):
+    """
+    Backup bejegyzés dekriptált, seekelhető nézete: tömörítetlennél közvetlenül a ZIP
+    fájlból, tömörítettnél a kitömörítő folyamon (előre ugrás olvasással, vissza újrakezdéssel)
+    """
+    if info.compress_type == zipfile.ZIP_STORED:
+        return EncryptedReader(open_stored_member(zip_path, info), key)
+    return EncryptedReader(zip_ref.open(info), key, size=info.file_size)
+
+def nearest_existing_dir(path):
+    """Legközelebbi létező szülőmappa (szabad hely lekérdezéséhez)"""
+    path = os.path.abspath(path)
+    while not os.path.isdir(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return path
+
+def add_plan_entry(plan, allocator, source, sort_id, rel_dir, proposed_name, size, probe, timestamp):
+    """Egy kimeneti fájl felvétele a tervbe (ütközés esetén az allokált névvel)"""
+    name = allocator.allocate(rel_dir, proposed_name)
+    plan["entries"].append({
+        "source": source,
+        "sort_id": sort_id,
+        "rel_dir": rel_dir,
+        "name": name,
+        "proposed_name": proposed_name,
+        "collision": name != proposed_name,
+        "kind": probe.kind,
+        "date": datetime.fromtimestamp(timestamp).isoformat(timespec="seconds"),
+        "timestamp": timestamp,
+        "size": size,
+    })
+
+def build_plan(input_path, output_dir, password, stop_check=None, recursive=True):
+    """
+    Futási terv készítése dekriptálás nélkül: célmappák, végleges nevek, dátumok,
+    méretek, ütközések, ismeretlen típusok és a szükséges lemezterület
+
+    A fejlécek véletlen hozzáférésű dekriptálással olvashatók (néhány KB fájlonként),
+    ugyanazzal a vizsgálattal és névadással, mint a valódi futásnál. Tömörített backup
+    bejegyzésnél a fejlécig (a végén álló moov atomig) ki kell tömöríteni a bejegyzést.
+    """
+    key = derive_key(password)
+    existing_names = lambda rel_dir: (os.listdir(os.path.join(output_dir, rel_dir))
+                                      if os.path.isdir(os.path.join(output_dir, rel_dir)) else [])
+    allocator = NameAllocator(existing_names)
+    plan = {
+        "version": PLAN_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "input": os.path.abspath(input_path),
+        "output": os.path.abspath(output_dir),
+        "entries": [],
+        "unknown": [],
+        "temp_bytes": 0,
+    }
+
+    if os.path.isfile(input_path) and input_path.endswith(BACKUP_EXTENSION):
+        plan_backup(plan, allocator, input_path, key, stop_check)
+    else:
+        plan_individual_files(plan, allocator, input_path, output_dir, key, stop_check, recursive)
+
+    directories = {}
+    for entry in plan["entries"]:
+        directories[entry["rel_dir"]] = directories.get(entry["rel_dir"], 0) + 1
+    plan["directories"] = directories
+    plan["total_files"] = len(plan["entries"])
+    plan["collisions"] = sum(1 for entry in plan["entries"] if entry["collision"])
+    plan["required_bytes"] = sum(entry["size"] for entry in plan["entries"])  # CTR: azonos méret
+    plan["free_bytes"] = shutil.disk_usage(nearest_existing_dir(output_dir)).free
+    return plan
+
+def plan_individual_files(plan, allocator, input_path, output_dir, key, stop_check, recursive):
+    """Terv egyedi titkosított fájlokhoz (ugyanaz a bejárás, mint a valódi futásnál)"""
+    index = InputIndex.scan(input_path, stop_check, exclude=[output_dir], recursive=recursive)
+    sort_order = 0
+    for entry in index.entries:
+        check_cancelled(stop_check)
+        source = plan_source_key(entry.rel_dir, entry.name)
+        if entry.ext not in EXTENSION_MAP:
+            plan["unknown"].append(source)
+            continue
+
+        sort_order += 1
+        probe = probe_file(entry.path, key=key)
+        proposed_name = generate_intelligent_filename(None, None, entry.path, sort_order, probe)
+        timestamp = resolve_file_timestamp(entry.path, entry.path, probe=probe)
+        add_plan_entry(plan, allocator, source, None, entry.rel_dir, proposed_name, entry.size, probe, timestamp)
+
+def plan_backup(plan, allocator, zip_path, key, stop_check):
+    """Terv .zip.cmpexport backuphoz: központi könyvtár + sort.db + a bejegyzések fejlécei"""
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        members = zip_ref.infolist()
+        plan["temp_bytes"] = sum(info.file_size for info in members)
+
+        # Sort.db ideiglenes kibontása (az sqlite fájlt igényel)
+        file_mapping = {}
+        if "sort.db" in zip_ref.namelist():
+            temp_dir = tempfile.mkdtemp(prefix="lockmypix_plan_")
+            try:
+                file_mapping = load_sort_db(extract_zip_member(zip_ref, zip_ref.getinfo("sort.db"), temp_dir))
+            finally:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+
+        for sort_order, info, rel_path in backup_members(zip_ref):
+            check_cancelled(stop_check)
+            if not is_supported_member(rel_path):
+                plan["unknown"].append(info.filename)
+                continue
+
+            file_basename = os.path.splitext(os.path.basename(rel_path))[0]
+            if file_basename in file_mapping:
+                output_subdir = file_mapping[file_basename]['directory'].rstrip('/')
+                sort_order = file_mapping[file_basename]['sort_order']
+            else:
+                output_subdir = os.path.dirname(rel_path)
+
+            probe = probe_source(lambda: open_backup_member(zip_path, zip_ref, info, key), rel_path,
+                                 file_mapping, file_basename)
+            proposed_name = generate_intelligent_filename(file_mapping, file_basename, rel_path, sort_order, probe)
+
+            timestamp = resolve_file_timestamp(None, rel_path, file_mapping, file_basename, probe,
+                                               zip_member_timestamp(info))
+
+            sort_id = file_basename if file_basename in file_mapping else None
+            add_plan_entry(plan, allocator, info.filename, sort_id, output_subdir, proposed_name,
+                           info.file_size, probe, timestamp)
+
+def save_plan(plan, plan_path):
+    """Terv mentése JSON-ként (a valódi futás --execute-plan kapcsolóval végrehajtja)"""
+    with open(plan_path, "w", encoding="utf-8") as f:
+        json.dump(plan, f, ensure_ascii=False, indent=1)
+
+def load_plan(plan_path):
+    """Mentett terv betöltése"""
+    with open(plan_path, "r", encoding="utf-8") as f:
+        plan = json.load(f)
+    if plan.get("version") != PLAN_VERSION:
+        raise ValueError(f"Nem támogatott terv verzió: {plan.get('version')}")
+    return plan
+
+def format_plan_summary(plan):
+    """Terv összefoglaló emberi olvasásra"""
+    mb = 1024 * 1024
+    lines = [
+        f"Fájlok: {plan['total_files']} ({len(plan['directories'])} célmappa)",
+        f"Ütközések: {plan['collisions']}, ismeretlen típus: {len(plan['unknown'])}",
+        f"Szükséges hely: {plan['required_bytes'] / mb:.1f} MB"
+        + (f" + {plan['temp_bytes'] / mb:.1f} MB temp" if plan['temp_bytes'] else "")
+        + f", szabad: {plan['free_bytes'] / mb:.1f} MB",
+    ]
+    for rel_dir, count in sorted(plan["directories"].items()):
+        lines.append(f"  {rel_dir or '.'}: {count}")
+    return "\n".join(lines)
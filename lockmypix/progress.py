@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""Haladáskövetés byte alapon."""
+
+import threading
+import time
+
+# ======================================
+# HALADÁS - Bájt alapú haladás, átviteli sebesség és becsült hátralévő idő
+# ======================================
+
+class ProgressTracker:
+    """
+    Bájt alapú haladáskövetés előre kiszámolt összmérettel
+    A kiküldés időben ritkítva történik (emit_interval), hogy a GUI ne fulladjon el
+    Szálbiztos: a folyamatban lévő fájlok szálanként külön követve
+    """
+
+    def __init__(self, total_bytes, total_files, emit_interval=0.1, discovering=False):
+        self.total_bytes = max(int(total_bytes), 0)
+        self.total_files = total_files
+        self.discovering = discovering
+        self.bytes_done = 0
+        self.files_done = 0
+        self.emit_interval = emit_interval
+        self.started = time.monotonic()
+        self.last_emit = 0.0
+        self.open_files = {}  # szál azonosító -> [várt méret, számolt bájtok]
+        self.lock = threading.Lock()
+
+    def add_total(self, size, files=1):
+        """Felfedezés közbeni feldolgozásnál az összméret növelése"""
+        with self.lock:
+            self.total_bytes += size
+            self.total_files += files
+
+    def finish_discovery(self):
+        """A bejárás véget ért - az összméret innentől végleges"""
+        self.discovering = False
+
+    def start_file(self, expected_size):
+        """Új fájl feldolgozásának kezdete (várható méret a bájtkerethez)"""
+        with self.lock:
+            self.open_files[threading.get_ident()] = [expected_size, 0]
+
+    def add_bytes(self, count):
+        """Feldolgozott bájtok hozzáadása"""
+        with self.lock:
+            self.bytes_done += count
+            current = self.open_files.get(threading.get_ident())
+            if current:
+                current[1] += count
+
+    def finish_file(self):
+        """Fájl lezárása - hiba vagy eltérő méret esetén is a teljes várt méret számít"""
+        with self.lock:
+            expected, counted = self.open_files.pop(threading.get_ident(), (0, 0))
+            self.bytes_done += max(expected - counted, 0)
+            self.files_done += 1
+
+    def due(self):
+        """Esedékes-e újabb kiküldés (időalapú ritkítás)"""
+        now = time.monotonic()
+        with self.lock:
+            if now - self.last_emit >= self.emit_interval:
+                self.last_emit = now
+                return True
+        return False
+
+    def snapshot(self):
+        """Aktuális állapot szótárként (progress_stats signal tartalma)"""
+        with self.lock:
+            bytes_done, files_done = self.bytes_done, self.files_done
+        elapsed = max(time.monotonic() - self.started, 1e-6)
+        bytes_per_s = bytes_done / elapsed
+        remaining = max(self.total_bytes - bytes_done, 0)
+        percent = 100 if not self.total_bytes else min(int(bytes_done * 100 / self.total_bytes), 100)
+        return {
+            "bytes_done": bytes_done,
+            "total_bytes": self.total_bytes,
+            "files_done": files_done,
+            "total_files": self.total_files,
+            "percent": percent,
+            "elapsed": elapsed,
+            "mb_per_s": bytes_per_s / (1024 * 1024),
+            "files_per_s": files_done / elapsed,
+            "eta_seconds": remaining / bytes_per_s if bytes_per_s > 0 and not self.discovering else None,
+            "discovering": self.discovering,
+        }
+
+def format_progress_stats(stats):
+    """Haladási statisztika emberi olvasásra (pl. státusz sorhoz)"""
+    mb_done = stats["bytes_done"] / (1024 * 1024)
+    mb_total = stats["total_bytes"] / (1024 * 1024)
+    eta = stats["eta_seconds"]
+    eta_text = "--:--:--" if eta is None else time.strftime("%H:%M:%S", time.gmtime(eta))
+    return (f"{mb_done:.1f} / {mb_total:.1f} MB · {stats['mb_per_s']:.1f} MB/s · "
+            f"{stats['files_done']}/{stats['total_files']} · {stats['files_per_s']:.1f}/s · ETA {eta_text}")
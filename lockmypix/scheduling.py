@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""Párhuzamos visszafejtés ütemezése: sorrend, munkasor és memóriakeret."""
+
+import os
+import threading
+
+from .formats import is_image_file
+from .streaming import CHUNK_SIZE, check_cancelled
+
+# ======================================
+# ÜTEMEZÉS - Párhuzamos dekriptálás memóriakerettel
+# ======================================
+
+# Párhuzamos dekriptáló szálak (a zlib és az AES a GIL-t elengedi)
+DECRYPT_WORKERS = min(8, os.cpu_count() or 1)
+
+# Egyszerre feldolgozás alatt álló adat felső korlátja (alapértelmezés)
+MEMORY_BUDGET = 256 * 1024 * 1024
+
+# Efölött a fájl mindig darabonként (streaming) kerül feldolgozásra
+IN_MEMORY_MAX = 8 * 1024 * 1024
+
+# Feldolgozási sorrendek (az első az alapértelmezés)
+ORDER_POLICIES = ("discovery", "largest", "smallest", "album")
+
+def order_work(items, policy, size_of, name_of, album_of):
+    """
+    Elemek feldolgozási sorrendje a választott policy szerint
+
+      discovery - bejárási / ZIP központi könyvtár sorrend: index nélkül a dekriptálás
+                  már a bejárás közben indul
+      largest   - legnagyobb elöl: legrövidebb teljes futás (egy későn induló
+                  hosszú videó nem foglal egyedül egy szálat a végén)
+      smallest  - képek, majd a kisebb fájlok elöl: leggyorsabb első eredmények
+      album     - album és sort.db sorrend szerint: egy mappa fájljai együtt készülnek
+    """
+    if policy == "largest":
+        return sorted(items, key=size_of, reverse=True)
+    if policy == "smallest":
+        return sorted(items, key=lambda item: (not is_image_file(name_of(item)), size_of(item)))
+    if policy == "album":
+        return sorted(items, key=album_of)
+    return list(items)
+
+class MemoryBudget:
+    """
+    In-flight bájtkeret: egy fájl csak akkor indul, ha a becsült memóriaigénye belefér
+    Kis fájlok egy menetben, teljesen memóriában (titkosított + dekriptált példány),
+    a nagyobbak kényszerítetten streaming módban, CHUNK_SIZE darabokban futnak.
+    Így a csúcs memória kiszámítható, a kis fájlok mégis teljes párhuzamossággal mennek.
+    """
+
+    def __init__(self, limit=MEMORY_BUDGET, chunk_size=CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.limit = max(int(limit), 2 * chunk_size)
+        self.in_flight = 0
+        self.condition = threading.Condition()
+
+    def plan(self, size):
+        """Feldolgozási mód egy fájlhoz: (darabméret, lefoglalt bájtok)"""
+        if size <= IN_MEMORY_MAX and 2 * size <= self.limit:
+            return max(size, 1), 2 * size
+        return self.chunk_size, 2 * self.chunk_size
+
+    def acquire(self, size, stop_check=None):
+        """
+        Keret lefoglalása (blokkol, amíg be nem fér; üres keretnél mindig indul)
+
+        Returns:
+            tuple: (darabméret a copy_stream-hez, lefoglalt bájtok a release-hez)
+        """
+        chunk_size, cost = self.plan(size)
+        with self.condition:
+            while self.in_flight and self.in_flight + cost > self.limit:
+                check_cancelled(stop_check)
+                self.condition.wait(0.1)
+            self.in_flight += cost
+        return chunk_size, cost
+
+    def release(self, cost):
+        """Lefoglalt keret visszaadása"""
+        with self.condition:
+            self.in_flight -= cost
+            self.condition.notify_all()
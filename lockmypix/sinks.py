@@ -0,0 +1,472 @@
+# -*- coding: utf-8 -*-
+"""Kimeneti célok: könyvtár, tar és zip."""
+
+import sys
+import os
+import stat
+import zipfile
+import tarfile
+import tempfile
+import shutil
+from pathlib import Path
+from datetime import datetime
+import threading
+import json
+
+# Kizárólagos fájlzár a futó staging mappák jelöléséhez
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+from .streaming import CHUNK_SIZE, copy_stream, remove_partial_file, advise, clean_member_path
+from .index import is_within
+
+# ======================================
+# KIMENETI CÉLOK - Mappa, streaming TAR, tárolt (store) ZIP
+# ======================================
+
+OUTPUT_FORMATS = ("dir", "tar", "zip")
+
+# Rejtett staging mappa előtagja a kimeneti mappában (utána a létrehozó PID-je)
+STAGING_PREFIX = ".lockmypix-staging-"
+
+# Zárfájl a staging mappában: a futás végig kizárólagosan zárolja, így a mappa akkor
+# félbehagyott (a következő megnyitáskor feldolgozható), ha a zár megszerezhető
+STAGING_LOCK = "run.lock"
+
+# Commit napló a staging mappában: soronként [méret, staging fájl, végleges relatív út]
+# JSON-ként - összeomlás után a következő futás ez alapján teszi a helyére a kész fájlokat
+COMMIT_JOURNAL = "commit.journal"
+
+# fsync barrier: ennyi kész fájlonként vagy ennyi másodpercenként (ami előbb jön)
+FSYNC_BATCH_FILES = 256
+FSYNC_INTERVAL = 2.0
+
+def fsync_path(path, drop_cache=False):
+    """
+    Fájl vagy mappa tartalmának lemezre kényszerítése (Windows alatt mappára nincs ilyen)
+    drop_cache: a már kiírt lapok elengedése (DONTNEED) - a kész kimenetet ez a
+    futás nem olvassa újra, ne szorítsa ki a még hátralévő bemeneteket
+    """
+    is_dir = os.path.isdir(path)
+    if is_dir and os.name == "nt":
+        return
+    fd = os.open(path, os.O_RDWR if os.name == "nt" else os.O_RDONLY)
+    try:
+        os.fsync(fd)
+        if drop_cache:
+            advise(fd, 0, 0, "DONTNEED")
+    finally:
+        os.close(fd)
+
+def try_lock(f, wait=False):
+    """
+    Kizárólagos zár a megnyitott fájlon (False, ha más tartja; wait: rövid várakozással)
+    A zárat a fájl lezárása - vagy a folyamat kilépése, összeomlása - elengedi
+    """
+    try:
+        if os.name == "nt":
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK if wait else msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | (0 if wait else fcntl.LOCK_NB))
+    except OSError:
+        return False
+    return True
+
+def current_umask():
+    """A folyamat umask-ja (az os.umask csak cserélni tud, ezért visszaállítva)"""
+    mask = os.umask(0o022)
+    os.umask(mask)
+    return mask
+
+def free_path(path, claimed=()):
+    """Az útvonal, vagy ha foglalt (létezik vagy claimed), az első szabad '_1', '_2', ... változata"""
+    stem, ext = os.path.splitext(path)
+    candidate = path
+    suffix = 1
+    while os.path.lexists(candidate) or candidate in claimed:
+        candidate = f"{stem}_{suffix}{ext}"
+        suffix += 1
+    return candidate
+
+def publish_files(moves, output_dir):
+    """
+    Kész fájlok tartóssá tétele és atomi áthelyezése: előbb a fájlok fsync-je, aztán
+    az átnevezések, végül mappánként egy fsync (moves: (staging fájl, végleges útvonal))
+    """
+    # 1. Adatok lemezre (a kernel addigra többnyire már kiírta őket), lapok elengedése
+    for temp_path, _ in moves:
+        fsync_path(temp_path, drop_cache=True)
+
+    # 2. Atomi átnevezések a célmappákba
+    directories = set()
+    for temp_path, final_path in moves:
+        target_dir = os.path.dirname(final_path)
+        os.makedirs(target_dir, exist_ok=True)
+        os.rename(temp_path, final_path)
+        while target_dir not in directories and os.path.abspath(target_dir) != os.path.abspath(
+                os.path.dirname(output_dir)):
+            directories.add(target_dir)
+            target_dir = os.path.dirname(target_dir)
+
+    # 3. Mappánként egy fsync (az új bejegyzések és az új almappák tartóssága)
+    for directory in directories:
+        fsync_path(directory)
+
+def journaled_moves(output_dir, staging_dir):
+    """
+    Egy félbehagyott futás commit naplójában szereplő, még a staging helyen lévő kész
+    fájlok (staging fájl, szabad végleges útvonal) párjai; a csonka sorok, a már
+    áthelyezett és a naplózott mérettől eltérő fájlok kimaradnak
+    """
+    try:
+        with open(os.path.join(staging_dir, COMMIT_JOURNAL), "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return []
+
+    moves = []
+    claimed = set()
+    for line in lines:
+        try:
+            size, temp_name, relpath = json.loads(line)
+            temp_path = os.path.join(staging_dir, os.path.basename(temp_name))
+            if os.path.getsize(temp_path) != size:
+                continue
+            final_path = free_path(contained_path(output_dir, relpath), claimed)
+        except (ValueError, TypeError, OSError):
+            continue
+        claimed.add(final_path)
+        moves.append((temp_path, final_path))
+    return moves
+
+def recover_stale_staging(output_dir):
+    """
+    Összeomlott / megszakított futások staging mappáinak feldolgozása: a commit naplóban
+    szereplő kész fájlok a helyükre kerülnek (foglalt névnél utótaggal), a többi -
+    félbehagyott dekriptálás - a mappával együtt törlődik. Csak az a mappa számít
+    félbehagyottnak, aminek a zárfájlját senki nem tartja, és már van commit naplója
+    (a futókat és az épp létrejövő - még napló nélküli - mappákat békén hagyja)
+    """
+    try:
+        names = os.listdir(output_dir)
+    except OSError:
+        return
+    for name in names:
+        if not name.startswith(STAGING_PREFIX):
+            continue
+        staging_dir = os.path.join(output_dir, name)
+        try:
+            lock_file = open(os.path.join(staging_dir, STAGING_LOCK), "r+b")
+        except OSError:
+            continue
+        try:
+            if not try_lock(lock_file) or not os.path.exists(os.path.join(staging_dir, COMMIT_JOURNAL)):
+                continue
+            publish_files(journaled_moves(output_dir, staging_dir), output_dir)
+        finally:
+            lock_file.close()  # Windows alatt nyitott fájllal a mappa nem törölhető
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+def output_relpath(rel_dir, name):
+    """
+    Kimeneti fájl relatív útvonala '/' elválasztóval: a mappa tisztítva (lásd
+    clean_member_path), a név csak egyszerű fájlnév lehet (különben ValueError)
+    """
+    if name in ("", ".", "..") or clean_member_path(name) != name:
+        raise ValueError(f"Érvénytelen kimeneti fájlnév: {name!r}")
+    return "/".join(part for part in (clean_member_path(rel_dir), name) if part)
+
+def contained_path(root, relpath):
+    """
+    A relatív útvonal helye a gyökérben; ValueError, ha a (szimbolikus linkekkel
+    feloldott) cél a gyökéren kívülre mutat
+    """
+    path = os.path.join(root, *relpath.split("/"))
+    if os.path.realpath(path) == os.path.realpath(root) or not is_within(os.path.realpath(path),
+                                                                         os.path.realpath(root)):
+        raise ValueError(f"A cél a kimeneti mappán kívülre mutat: {relpath}")
+    return path
+
+class NameAllocator:
+    """
+    Ütközésmentes kimeneti nevek kiosztása mappánként, memóriában tartott indexszel
+    Azonos nevű fájlok (pl. egy másodpercen belüli sorozatképek) determinisztikus
+    '_1', '_2', ... utótagot kapnak; szálbiztos, párhuzamos kiosztásnál is helyes.
+    A mappák meglévő tartalma mappánként egyszer (listdir) kerül az indexbe.
+    """
+
+    def __init__(self, existing_names=None):
+        self.existing_names = existing_names  # callable(rel_dir) -> meglévő nevek
+        self.assigned = {}
+        self.lock = threading.Lock()
+
+    def allocate(self, rel_dir, name):
+        """Szabad név lefoglalása a mappában"""
+        rel_dir = os.path.normpath(rel_dir) if rel_dir else ""
+        with self.lock:
+            taken = self.assigned.get(rel_dir)
+            if taken is None:
+                existing = self.existing_names(rel_dir) if self.existing_names else ()
+                taken = self.assigned[rel_dir] = {existing_name.casefold() for existing_name in existing}
+
+            stem, ext = os.path.splitext(name)
+            candidate = name
+            suffix = 1
+            while candidate.casefold() in taken:
+                candidate = f"{stem}_{suffix}{ext}"
+                suffix += 1
+            taken.add(candidate.casefold())
+            return candidate
+
+class DirectorySink:
+    """
+    Kimenet különálló fájlokként egy mappában
+
+    A dekriptálás a kimeneti mappán belüli rejtett staging mappába ír (azonos
+    fájlrendszer, így az átnevezés atomi). A kész fájlok periodikus barrierben
+    (batch_files fájlonként, illetve egy időzítő szálból interval másodpercenként)
+    kerülnek a helyükre: előbb a fájlok fsync-je, aztán az átnevezések, végül
+    mappánként egy fsync. Áramszünet után így nincs félig írt végleges fájl, és
+    minden a barrier előtt elkészült fájl tartós - fájlonkénti fsync nélkül.
+    A kiosztott cél a commit naplóba is bekerül: a barrier előtt megszakadt futás
+    kész fájljait a következő megnyitás teszi a helyükre.
+    """
+    renames_folders = True
+    stages_files = True
+    failed = False
+
+    def __init__(self, output_dir, batch_files=FSYNC_BATCH_FILES, interval=FSYNC_INTERVAL):
+        self.output_dir = output_dir
+        self.names = NameAllocator(self.list_existing)
+        self.staging_dir = None
+        self.batch_files = batch_files
+        self.interval = interval
+        self.pending = []  # (staging fájl, végleges útvonal) a következő barrierig
+        self.file_mode = 0o644
+        self.journal = None
+        self.lock_file = None
+        self.timer = None
+        self.timer_stop = threading.Event()
+        self.barrier_error = None
+        self.lock = threading.Lock()
+        self.barrier_lock = threading.Lock()
+
+    def list_existing(self, rel_dir):
+        """Célmappa meglévő fájlnevei (az allokátor mappánként egyszer hívja)"""
+        try:
+            return os.listdir(os.path.join(self.output_dir, rel_dir))
+        except OSError:
+            return []
+
+    def open(self):
+        """
+        Kimeneti mappa, a futás saját (zárolt) staging mappája és commit naplója,
+        időzített barrier. A korábbi, félbehagyott futások kész fájljai előbb a helyükre kerülnek
+        """
+        Path(self.output_dir).mkdir(parents=True, exist_ok=True)
+        fsync_path(os.path.dirname(os.path.abspath(self.output_dir)))
+        recover_stale_staging(self.output_dir)
+        self.file_mode = 0o666 & ~current_umask()  # mint egy open()-nel létrehozott fájlnál
+        self.staging_dir = tempfile.mkdtemp(prefix=f"{STAGING_PREFIX}{os.getpid()}-", dir=self.output_dir)
+        self.lock_file = open(os.path.join(self.staging_dir, STAGING_LOCK), "w+b")
+        # Egy párhuzamos helyreállítás épp vizsgálhatja (napló nélkül elengedi): várakozással
+        if not try_lock(self.lock_file, wait=True):
+            raise OSError(f"A staging mappa nem zárolható: {self.staging_dir}")
+        self.journal = open(os.path.join(self.staging_dir, COMMIT_JOURNAL), "a", encoding="utf-8")
+        self.timer_stop.clear()
+        self.timer = threading.Thread(target=self.barrier_timer, name="lockmypix-barrier", daemon=True)
+        self.timer.start()
+
+    def barrier_timer(self):
+        """Időzített barrier: a kész fájlok akkor is a helyükre kerülnek, ha épp nem jön commit"""
+        while not self.timer_stop.wait(self.interval):
+            try:
+                self.barrier()
+            except Exception as e:
+                self.barrier_error = e  # a lezárás (close) jelzi
+                return
+
+    def staging_path(self, rel_dir, temp_name):
+        """Temp fájl helye dekriptáláshoz (a staging mappában, egyedi néven - a kiterjesztés megmarad)"""
+        fd, temp_path = tempfile.mkstemp(prefix="temp_", suffix=f"_{temp_name}", dir=self.staging_dir)
+        os.close(fd)
+        os.chmod(temp_path, self.file_mode)  # a mkstemp 0600-at ad, a végleges fájl az umask szerint
+        return temp_path
+
+    def commit(self, temp_path, rel_dir, final_name, timestamp):
+        """
+        Végleges (ütközésmentes) név lefoglalása és időbélyeg beállítása; a fájl a
+        következő barrierben kerül a helyére (a visszaadott útvonal addig foglalt)
+        """
+        rel_dir = clean_member_path(rel_dir)
+        final_name = self.names.allocate(rel_dir, final_name)
+        relpath = output_relpath(rel_dir, final_name)
+        final_path = contained_path(self.output_dir, relpath)
+        os.utime(temp_path, (timestamp, timestamp))  # az átnevezés megtartja
+        size = os.path.getsize(temp_path)
+        with self.lock:
+            self.journal.write(json.dumps([size, os.path.basename(temp_path), relpath]) + "\n")
+            self.journal.flush()
+            self.pending.append((temp_path, final_path))
+            due = len(self.pending) >= self.batch_files
+        if due:
+            self.barrier()
+        return final_path
+
+    def barrier(self):
+        """Várakozó kész fájlok tartóssá tétele és atomi áthelyezése a végleges helyükre"""
+        with self.barrier_lock:
+            with self.lock:
+                pending, self.pending = self.pending, []
+            if pending:
+                publish_files(pending, self.output_dir)
+
+    def close(self):
+        """Időzítő leállítása, utolsó barrier és a staging mappa törlése (többször is hívható)"""
+        try:
+            if self.timer:
+                self.timer_stop.set()
+                self.timer.join()
+                self.timer = None
+            self.barrier()
+            if self.barrier_error:
+                error, self.barrier_error = self.barrier_error, None
+                raise error
+        finally:
+            if self.journal:
+                self.journal.close()
+                self.journal = None
+            if self.lock_file:
+                self.lock_file.close()
+                self.lock_file = None
+            if self.staging_dir:
+                shutil.rmtree(self.staging_dir, ignore_errors=True)
+                self.staging_dir = None
+
+class ArchiveSink:
+    """
+    Közös alap az archív kimenetekhez: temp fájl nélkül, a bejegyzés tartalmát a
+    forrásból olvasás közben dekriptálva írja (a méret előre ismert - CTR-nél a
+    titkosítottal azonos). Egyszerre egy író; félbeszakadt bejegyzés után az
+    archívum hibás, ezért nem kerül a végleges helyére.
+    """
+    renames_folders = False
+    stages_files = False
+
+    def __init__(self, target):
+        self.target = target
+        self.partial_path = None
+        self.stream = None
+        self.failed = False
+        self.names = NameAllocator()
+        self.lock = threading.Lock()
+
+    def open(self):
+        """
+        Archívum megnyitása fájlba vagy stdout-ra ('-')
+        Fájlnál rejtett részleges fájlba ír, ami lezáráskor fsync után atomian kapja meg a végleges nevet
+        """
+        if self.target == "-":
+            self.stream = sys.stdout.buffer
+        else:
+            parent = os.path.dirname(os.path.abspath(self.target))
+            os.makedirs(parent, exist_ok=True)
+            self.partial_path = os.path.join(parent, f".{os.path.basename(self.target)}.partial")
+            self.stream = open(self.partial_path, "wb")
+        self.open_archive(self.stream)
+
+    def write(self, rel_dir, final_name, timestamp, size, source, chunk_size=CHUNK_SIZE):
+        """
+        Bejegyzés írása a végleges (ütközésmentes) névvel és időbélyeggel
+        source: olvasható folyam pontosan size bájttal (pl. TransformReader)
+        """
+        rel_dir = clean_member_path(rel_dir)
+        arcname = output_relpath(rel_dir, self.names.allocate(rel_dir, final_name))
+        with self.lock:
+            try:
+                self.add_stream(source, arcname, timestamp, size, chunk_size)
+            except BaseException:
+                self.failed = True  # a fejléc már kiment: a bejegyzés nem fejezhető be
+                raise
+        return arcname
+
+    def close(self):
+        """Archívum lezárása; hibás archívumnál a részleges fájl törlése (többször is hívható)"""
+        if not self.stream:
+            return
+        try:
+            if self.failed:
+                try:
+                    self.close_archive()
+                except Exception:
+                    pass
+                if self.partial_path:
+                    self.stream.close()
+                    remove_partial_file(self.partial_path)
+                    self.partial_path = None
+                return
+            self.close_archive()
+            self.stream.flush()
+            if self.stream is not sys.stdout.buffer:
+                os.fsync(self.stream.fileno())
+                self.stream.close()
+                os.replace(self.partial_path, self.target)
+                fsync_path(os.path.dirname(os.path.abspath(self.target)))
+                self.partial_path = None
+        finally:
+            self.stream = None
+
+class TarSink(ArchiveSink):
+    """Streaming TAR kimenet (nem kereshető célra, pl. pipe is írható)"""
+
+    def open_archive(self, stream):
+        self.archive = tarfile.open(fileobj=stream, mode="w|", format=tarfile.PAX_FORMAT)
+
+    def add_stream(self, source, arcname, timestamp, size, chunk_size):
+        tarinfo = tarfile.TarInfo(arcname)
+        tarinfo.size = size
+        tarinfo.mtime = timestamp
+        tarinfo.mode = 0o644
+        self.archive.copybufsize = chunk_size
+        self.archive.addfile(tarinfo, source)
+
+    def close_archive(self):
+        self.archive.close()
+
+class ZipSink(ArchiveSink):
+    """Tömörítés nélküli (ZIP_STORED) ZIP kimenet"""
+
+    def open_archive(self, stream):
+        self.archive = zipfile.ZipFile(stream, "w", zipfile.ZIP_STORED, allowZip64=True)
+
+    def add_stream(self, source, arcname, timestamp, size, chunk_size):
+        date_time = max(datetime.fromtimestamp(timestamp), datetime(1980, 1, 1)).timetuple()[:6]
+        zinfo = zipfile.ZipInfo(arcname, date_time)
+        zinfo.compress_type = zipfile.ZIP_STORED
+        zinfo.file_size = size
+        zinfo.external_attr = (stat.S_IFREG | 0o644) << 16
+        with self.archive.open(zinfo, "w", force_zip64=True) as target:
+            copy_stream(source, target, chunk_size=chunk_size)
+
+    def close_archive(self):
+        self.archive.close()
+
+def create_output_sink(output_format, target):
+    """Kimeneti cél létrehozása formátum alapján ('dir', 'tar', 'zip')"""
+    if output_format == "tar":
+        return TarSink(target)
+    if output_format == "zip":
+        return ZipSink(target)
+    if output_format == "dir":
+        return DirectorySink(target)
+    raise ValueError(f"Ismeretlen kimeneti formátum: {output_format}")
+
+def archive_target_path(output_path, output_format):
+    """Archív formátumnál a kimeneti útvonal kiegészítése a kiterjesztéssel"""
+    if output_format == "dir" or output_path == "-":
+        return output_path
+    suffix = f".{output_format}"
+    return output_path if output_path.lower().endswith(suffix) else output_path + suffix
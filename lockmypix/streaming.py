@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""Darabolt másolás, zip tagok kezelése és részleges fájlok takarítása."""
+
+import os
+import struct
+import zipfile
+import time
+from collections import deque
+
+# ======================================
+# SEGÉDFÜGGVÉNYEK - Streaming feldolgozás és leállítás
+# ======================================
+
+# Darabméret a streaming dekriptáláshoz (16 bájtos AES blokkhatárra igazítva)
+CHUNK_SIZE = 1024 * 1024
+
+class OperationCancelled(Exception):
+    """Felhasználói leállítás jelzése a feldolgozási ciklusokból"""
+
+def check_cancelled(stop_check):
+    """OperationCancelled kivétel dobása, ha leállítás volt kérve"""
+    if stop_check and stop_check():
+        raise OperationCancelled()
+
+def copy_stream(source, target, transform=None, stop_check=None, chunk_size=CHUNK_SIZE,
+                source_hashes=(), target_hashes=(), progress=None):
+    """
+    Adatfolyam másolása darabonként, minden darab előtt leállítás ellenőrzéssel
+
+    Args:
+        source: Olvasható bináris fájlobjektum
+        target: Írható bináris fájlobjektum
+        transform (callable): Darabonkénti átalakítás (pl. cipher.decrypt)
+        stop_check (callable): True-t ad vissza, ha le kell állni
+        chunk_size (int): Darabméret bájtban
+        source_hashes: hashlib objektumok a bemeneti (titkosított) adatokhoz
+        target_hashes: hashlib objektumok a kimeneti (dekriptált) adatokhoz
+        progress (callable): Darabonként hívva a feldolgozott bájtszámmal
+
+    Returns:
+        int: Másolt bájtok száma
+    """
+    total = 0
+    while True:
+        check_cancelled(stop_check)
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        for hasher in source_hashes:
+            hasher.update(chunk)
+        if transform:
+            chunk = transform(chunk)
+        for hasher in target_hashes:
+            hasher.update(chunk)
+        target.write(chunk)
+        total += len(chunk)
+        if progress:
+            progress(len(chunk))
+    return total
+
+class TransformReader:
+    """
+    Olvasható folyam, ami olvasás közben alakít (pl. dekriptál): a hash-ek, a haladás és
+    a leállítás ellenőrzése darabonként, mint a copy_stream-nél - így a cél (pl. egy tar
+    bejegyzés) maga olvashatja a dekriptált adatot, temp fájl nélkül
+    """
+
+    def __init__(self, raw, transform=None, stop_check=None, source_hashes=(), target_hashes=(), progress=None):
+        self.raw = raw
+        self.transform = transform
+        self.stop_check = stop_check
+        self.source_hashes = source_hashes
+        self.target_hashes = target_hashes
+        self.progress = progress
+
+    def read(self, size=-1):
+        check_cancelled(self.stop_check)
+        chunk = self.raw.read(size)
+        for hasher in self.source_hashes:
+            hasher.update(chunk)
+        if self.transform and chunk:
+            chunk = self.transform(chunk)
+        for hasher in self.target_hashes:
+            hasher.update(chunk)
+        if self.progress and chunk:
+            self.progress(len(chunk))
+        return chunk
+
+    def close(self):
+        self.raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def clean_member_path(member_name):
+    """
+    ZIP bejegyzés (vagy sort.db mappa) relatív, '/' elválasztós alakja a zipfile
+    kicsomagolásához hasonlóan: meghajtóbetű, abszolút gyökér, '.' és '..' elemek nélkül
+    """
+    parts = [part for part in str(member_name or "").replace('\\', '/').split('/')
+             if part not in ('', '.', '..')]
+    if parts and len(parts[0]) == 2 and parts[0][1] == ':' and parts[0][0].isalpha():
+        parts = parts[1:]  # "C:" meghajtóbetű
+    return "/".join(parts)
+
+def safe_member_path(target_dir, member_name):
+    """ZIP bejegyzés biztonságos célútvonala (abszolút út és '..' kiszűrése)"""
+    parts = clean_member_path(member_name).split('/')
+    return os.path.join(target_dir, *parts) if parts != [''] else None
+
+def extract_zip_member(zip_ref, info, target_dir, stop_check=None, progress=None):
+    """
+    Egy ZIP bejegyzés kicsomagolása darabonként (extractall helyett, megszakítható)
+    Félbeszakadt kicsomagolás esetén a részleges fájl törlődik
+    """
+    target_path = safe_member_path(target_dir, info.filename)
+    if not target_path:
+        return None
+
+    if info.is_dir():
+        os.makedirs(target_path, exist_ok=True)
+        return target_path
+
+    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+    try:
+        with zip_ref.open(info, 'r') as source, open(target_path, 'wb') as target:
+            copy_stream(source, target, stop_check=stop_check, progress=progress)
+    except BaseException:
+        remove_partial_file(target_path)
+        raise
+    return target_path
+
+class FileSlice:
+    """Fájl egy tartományának önálló, seekelhető nézete (pl. tömörítetlen ZIP bejegyzés)"""
+
+    def __init__(self, raw, start, size):
+        self.raw = raw
+        self.start = start
+        self.size = size
+        self.position = 0
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self.position
+        elif whence == os.SEEK_END:
+            offset += self.size
+        self.position = min(max(offset, 0), self.size)
+        return self.position
+
+    def tell(self):
+        return self.position
+
+    def read(self, size=-1):
+        remaining = self.size - self.position
+        size = remaining if size is None or size < 0 else min(size, remaining)
+        self.raw.seek(self.start + self.position)
+        data = self.raw.read(size)
+        self.position += len(data)
+        return data
+
+    def close(self):
+        self.raw.close()
+
+def open_stored_member(zip_path, info):
+    """
+    Tömörítetlen (ZIP_STORED) bejegyzés megnyitása közvetlenül a ZIP fájlból
+    A lokális fejléc után az adat változatlanul áll, így tetszőlegesen seekelhető
+    """
+    raw = open(zip_path, "rb")
+    raw.seek(info.header_offset)
+    header = raw.read(30)
+    if header[:4] != b"PK\x03\x04":
+        raw.close()
+        raise zipfile.BadZipFile(f"Hibás lokális fejléc: {info.filename}")
+    name_length, extra_length = struct.unpack("<HH", header[26:30])
+    return FileSlice(raw, info.header_offset + 30 + name_length + extra_length, info.file_size)
+
+def zip_member_timestamp(info):
+    """ZIP bejegyzés dátuma Unix időbélyegként (helyi idő)"""
+    return time.mktime(info.date_time + (0, 0, -1))
+
+def remove_partial_file(file_path):
+    """Részleges (félbeszakadt) kimeneti fájl törlése"""
+    if file_path and os.path.exists(file_path):
+        try:
+            os.remove(file_path)
+        except:
+            pass
+
+# ======================================
+# OLDAL-GYORSÍTÓTÁR - posix_fadvise tanácsok (Linux; máshol hatástalan)
+# ======================================
+
+# Ennyi következő bemenet olvasása kérhető előre (WILLNEED), amíg az aktuális dekriptálódik
+PREFETCH_FILES = 8
+
+# Előreolvasás bemenetenként legfeljebb ennyi bájt (nagy fájlnál innen a SEQUENTIAL readahead viszi)
+PREFETCH_BYTES = 4 * 1024 * 1024
+
+# Ekkora bemenettől SEQUENTIAL tanács (agresszívebb readahead)
+SEQUENTIAL_MIN = 8 * 1024 * 1024
+
+HAS_FADVISE = hasattr(os, "posix_fadvise")
+
+def advise(fd, offset, length, advice):
+    """
+    posix_fadvise tanács, ahol elérhető (advice: "WILLNEED", "SEQUENTIAL", "DONTNEED")
+    Csak tanács - hibánál vagy nem támogatott rendszeren nincs hatása
+    """
+    if HAS_FADVISE:
+        try:
+            os.posix_fadvise(fd, offset, length, getattr(os, "POSIX_FADV_" + advice))
+        except OSError:
+            pass
+
+def advise_path(path, advice, offset=0, length=0):
+    """Tanács fájlútvonal alapján (az előreolvasás a lezárás után is folytatódik)"""
+    if not HAS_FADVISE:
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        advise(fd, offset, length, advice)
+    finally:
+        os.close(fd)
+
+def prefetched(items, prefetch, depth=PREFETCH_FILES):
+    """
+    Elemek továbbadása `depth` elemnyi előretekintéssel: minden elemre a sorra
+    kerülése előtt depth elemmel meghívódik a prefetch (pl. WILLNEED), így a
+    következő bemenetek olvasása átfed az aktuális dekriptálásával
+    """
+    window = deque()
+    for item in items:
+        prefetch(item)
+        window.append(item)
+        if len(window) > depth:
+            yield window.popleft()
+    while window:
+        yield window.popleft()
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""Darabméret és szálszám kalibrálása kimeneti eszközönként."""
+
+import os
+import tempfile
+from datetime import datetime
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .streaming import check_cancelled, remove_partial_file
+from .crypto import derive_key
+from .ciphers import PycryptodomeBackend
+
+# ======================================
+# HANGOLÁS - Darabméret és szálszám kalibrálása kimeneti eszközönként
+# ======================================
+
+# Kipróbált darabméretek (mind 16 bájtos AES blokkhatárra igazítva)
+TUNING_CHUNK_SIZES = (256 * 1024, 1024 * 1024, 4 * 1024 * 1024)
+
+# Mérésenként legfeljebb ennyi írt adat (fsync-kel, hogy az eszköz is számítson)
+TUNING_SAMPLE_BYTES = 4 * 1024 * 1024
+
+# Legnagyobb kipróbált szálszám (hálózati meghajtón a CPU-k számánál több is segíthet)
+TUNING_MAX_WORKERS = 8
+
+# Mérések száma egy kalibrációban: darabméretenként egy, majd 2, 4, ... szál
+TUNING_MEASUREMENTS = len(TUNING_CHUNK_SIZES) + TUNING_MAX_WORKERS.bit_length() - 1
+
+# A kalibráció összesen legfeljebb a bemenet ekkora hányadát írja ki a célra; ha így
+# a mérésenkénti minta ennél kisebb lenne, nincs kalibráció (a futás az alapértékekkel megy)
+TUNING_INPUT_SHARE = 0.05
+TUNING_MIN_SAMPLE_BYTES = 1024 * 1024
+
+# Ekkora bemenettől jár a teljes minta (a bemenet méretét eddig érdemes összeszámolni)
+TUNING_FULL_INPUT_BYTES = int(TUNING_SAMPLE_BYTES * TUNING_MEASUREMENTS / TUNING_INPUT_SHARE)
+
+def tuning_cache_path():
+    """Hangolási gyorsítótár helye (XDG_CACHE_HOME vagy ~/.cache)"""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "lockmypix-decrypter", "tuning.json")
+
+def calibration_sample(input_bytes, retune=False):
+    """
+    Mérésenkénti mintaméret a bemenet méretéhez (None: a bemenet túl kicsi, nincs kalibráció)
+    input_bytes None: ismeretlen bemenet, teljes minta; retune: legalább a legkisebb minta
+    """
+    if input_bytes is None:
+        return TUNING_SAMPLE_BYTES
+    sample_bytes = min(TUNING_SAMPLE_BYTES, int(input_bytes * TUNING_INPUT_SHARE / TUNING_MEASUREMENTS))
+    if sample_bytes < TUNING_MIN_SAMPLE_BYTES:
+        return TUNING_MIN_SAMPLE_BYTES if retune else None
+    return sample_bytes
+
+def measure_throughput(directory, chunk_size, workers, sample_bytes=TUNING_SAMPLE_BYTES, backend=None, key=None,
+                       stop_check=None):
+    """
+    Dekriptálás + írás áteresztőképessége (MB/s) a célmappában, workers párhuzamos szállal
+    (összesen sample_bytes, szálanként egyenlően elosztva). A dekriptálás a megadott
+    backenddel (és kulccsal) fut, mint a valódi futásban; stop_check: darabonként
+    ellenőrizve (OperationCancelled)
+    """
+    backend = backend or PycryptodomeBackend()
+    key = key or derive_key("lockmypix-tuning")
+    block = memoryview(os.urandom(chunk_size))
+    per_worker = max(sample_bytes // workers, 16)
+
+    def write_sample(_):
+        fd, sample_path = tempfile.mkstemp(prefix=".lockmypix_tune_", dir=directory)
+        try:
+            cipher = backend.create(key)
+            with os.fdopen(fd, "wb") as f:
+                for offset in range(0, per_worker, chunk_size):
+                    check_cancelled(stop_check)
+                    f.write(cipher.decrypt(block[:min(chunk_size, per_worker - offset)]))
+                f.flush()
+                os.fsync(f.fileno())
+        finally:
+            remove_partial_file(sample_path)
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(write_sample, range(workers)))
+    elapsed = max(time.monotonic() - started, 1e-6)
+    return per_worker * workers / elapsed / (1024 * 1024)
+
+def calibrate_device(directory, backend=None, key=None, stop_check=None, sample_bytes=TUNING_SAMPLE_BYTES):
+    """
+    Rövid kalibráció: előbb a darabméret egy szálon, majd a szálszám (1, 2, 4, ...)
+    A legkisebb szálszám nyer, amely a legjobb mért érték 90%-át hozza. Mérésenként
+    sample_bytes kerül a célra; a mintánál nagyobb darabméret nem kerül kipróbálásra
+    """
+    backend = backend or PycryptodomeBackend()
+
+    def measure(chunk_size, workers):
+        return measure_throughput(directory, chunk_size, workers, sample_bytes, backend, key, stop_check)
+
+    candidates = [chunk_size for chunk_size in TUNING_CHUNK_SIZES if chunk_size <= sample_bytes]
+    chunk_results = {chunk_size: measure(chunk_size, 1) for chunk_size in candidates or TUNING_CHUNK_SIZES[:1]}
+    chunk_size = max(chunk_results, key=chunk_results.get)
+
+    worker_results = {1: chunk_results[chunk_size]}
+    workers = 2
+    while workers <= TUNING_MAX_WORKERS:
+        worker_results[workers] = measure(chunk_size, workers)
+        workers *= 2
+    best = max(worker_results.values())
+    workers = min(count for count, rate in worker_results.items() if rate >= best * 0.9)
+
+    return {
+        "chunk_size": chunk_size,
+        "workers": workers,
+        "mb_per_s": round(best, 1),
+        "cipher": backend.name,
+        "sample_bytes": sample_bytes,
+        "calibrated": datetime.now().isoformat(timespec="seconds"),
+    }
+
+def load_tuning_cache():
+    """Eszközönként mentett hangolások (hiányzó/sérült fájl esetén üres)"""
+    try:
+        with open(tuning_cache_path(), "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def device_tuning(directory, retune=False, on_calibrate=None, backend=None, key=None, stop_check=None,
+                  input_bytes=None):
+    """
+    Hangolás a mappát tároló eszközhöz (st_dev): gyorsítótárból, vagy kalibrálással
+    Más backenddel, vagy a mostaninál kisebb mintával mért gyorsítótárazott érték
+    helyett új kalibráció készül; kis bemenetnél (lásd calibration_sample) nincs kalibráció
+
+    Args:
+        directory (str): Létező mappa a kimeneti eszközön
+        retune (bool): Gyorsítótár figyelmen kívül hagyása, új kalibráció
+        on_calibrate (callable): Kalibráció előtt hívva (állapotüzenethez)
+        backend: A futás AES-CTR backendje (alapból pycryptodome)
+        key (bytes): A futás kulcsa (a XOR backend kulcsfolyama így újrahasznosul)
+        stop_check (callable): Leállítás kérve? (OperationCancelled a kalibráció közben)
+        input_bytes (int): A futás bemenetének (becsült) mérete; None: ismeretlen
+
+    Returns:
+        dict: chunk_size, workers (és a mérés adatai), vagy None (kalibráció nélkül)
+    """
+    backend = backend or PycryptodomeBackend()
+    sample_bytes = calibration_sample(input_bytes, retune)
+    device = str(os.stat(directory).st_dev)
+    cache = load_tuning_cache()
+    cached = cache.get(device)
+    # A mintaméret nélküli (korábbi) bejegyzések teljes mintával készültek
+    if (not retune and isinstance(cached, dict) and cached.get("cipher", "pycryptodome") == backend.name
+            and cached.get("sample_bytes", TUNING_SAMPLE_BYTES) >= (sample_bytes or 0)):
+        return cached
+    if sample_bytes is None:
+        return None
+
+    if on_calibrate:
+        on_calibrate()
+    tuning = calibrate_device(directory, backend, key, stop_check, sample_bytes)
+    cache[device] = tuning
+    try:
+        cache_path = tuning_cache_path()
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=1)
+    except OSError:
+        pass  # Gyorsítótár nélkül is használható az eredmény
+    return tuning
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""Titkosított tároló (mappa vagy .zip.cmpexport) bejárása és olvasása kimenet írása nélkül."""
+
+import os
+import zipfile
+import tempfile
+import shutil
+from datetime import datetime
+
+from .formats import BACKUP_EXTENSION
+from .streaming import check_cancelled, extract_zip_member, zip_member_timestamp
+from .crypto import derive_key, EncryptedReader
+from .naming import load_sort_db, probe_file, probe_source, generate_intelligent_filename, resolve_file_timestamp
+from .index import InputIndex
+from .plan import backup_members, is_supported_member, open_backup_member, plan_source_key
+from .decryptor import Decryptor
+
+# ======================================
+# TÁROLÓ - Bejegyzések, nevek, dátumok és dekriptált tartalom
+# ======================================
+
+class VaultEntry:
+    """Egy titkosított fájl a tárolóban: azonosító, javasolt név, dátum és méret"""
+    __slots__ = ("source", "rel_dir", "name", "size", "sort_id", "kind", "timestamp", "path", "info")
+
+    def __init__(self, source, rel_dir, name, size, sort_id, kind, timestamp, path=None, info=None):
+        self.source = source        # plan_source_key / .encrypt/ bejegyzés (terv és manifest azonosító)
+        self.rel_dir = rel_dir      # célmappa (backupnál a sort.db albuma)
+        self.name = name            # intelligens fájlnév (ütközéskezelés nélkül)
+        self.size = size            # CTR: a dekriptált méret azonos
+        self.sort_id = sort_id
+        self.kind = kind            # "image", "video" vagy "other"
+        self.timestamp = timestamp  # visszaállított dátum (epoch másodperc)
+        self.path = path            # egyedi fájl útvonala
+        self.info = info            # backup ZipInfo
+
+    @property
+    def date(self):
+        return datetime.fromtimestamp(self.timestamp)
+
+    def __repr__(self):
+        return f"VaultEntry({self.source!r}, name={self.name!r}, size={self.size})"
+
+class Vault:
+    """
+    LockMyPix tároló megnyitása beágyazott használatra (Qt nélkül)
+
+        with Vault(path, password) as vault:
+            for entry in vault.entries():
+                data = vault.read(entry)
+
+    A bejegyzések nevét és dátumát ugyanaz a fejléc alapú vizsgálat adja, mint a
+    dry-run tervet (a fájlok elejének véletlen hozzáférésű dekriptálása); kimenet
+    írásához a decryptor() ad egy ugyanerre a bemenetre beállított Decryptort.
+    """
+
+    def __init__(self, path, password, recursive=True):
+        self.path = path
+        self.password = password
+        self.key = derive_key(password)
+        self.recursive = recursive
+        self.is_backup = os.path.isfile(path) and path.endswith(BACKUP_EXTENSION)
+        self.zip_ref = None
+        self.file_mapping = {}
+
+    def open(self):
+        """Backupnál a ZIP központi könyvtár és a sort.db betöltése (egyedi fájloknál nincs teendő)"""
+        if self.is_backup and self.zip_ref is None:
+            self.zip_ref = zipfile.ZipFile(self.path, 'r')
+            if "sort.db" in self.zip_ref.namelist():
+                # Az sqlite fájlt igényel: ideiglenes kibontás
+                temp_dir = tempfile.mkdtemp(prefix="lockmypix_vault_")
+                try:
+                    self.file_mapping = load_sort_db(
+                        extract_zip_member(self.zip_ref, self.zip_ref.getinfo("sort.db"), temp_dir))
+                finally:
+                    shutil.rmtree(temp_dir, ignore_errors=True)
+        return self
+
+    def close(self):
+        if self.zip_ref is not None:
+            self.zip_ref.close()
+            self.zip_ref = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def entries(self, stop_check=None):
+        """
+        Támogatott titkosított fájlok bejárása (generátor)
+
+        Yields:
+            VaultEntry: bejegyzés javasolt névvel és visszaállított dátummal
+        """
+        if self.is_backup:
+            yield from self.backup_entries(stop_check)
+        else:
+            yield from self.individual_entries(stop_check)
+
+    def individual_entries(self, stop_check):
+        """Egyedi fájlok (ugyanaz a bejárás és névadás, mint a valódi futásnál)"""
+        index = InputIndex.scan(self.path, stop_check, recursive=self.recursive)
+        sort_order = 0
+        for entry in index.supported_entries():
+            check_cancelled(stop_check)
+            sort_order += 1
+            probe = probe_file(entry.path, key=self.key)
+            name = generate_intelligent_filename(None, None, entry.path, sort_order, probe)
+            timestamp = resolve_file_timestamp(entry.path, entry.path, probe=probe)
+            yield VaultEntry(plan_source_key(entry.rel_dir, entry.name), entry.rel_dir, name, entry.size,
+                             None, probe.kind, timestamp, path=entry.path)
+
+    def backup_entries(self, stop_check):
+        """.zip.cmpexport bejegyzések (sort.db mapping szerinti albummal és névvel)"""
+        self.open()
+        for sort_order, info, rel_path in backup_members(self.zip_ref):
+            check_cancelled(stop_check)
+            if not is_supported_member(rel_path):
+                continue
+
+            file_basename = os.path.splitext(os.path.basename(rel_path))[0]
+            if file_basename in self.file_mapping:
+                rel_dir = self.file_mapping[file_basename]['directory'].rstrip('/')
+                sort_order = self.file_mapping[file_basename]['sort_order']
+            else:
+                rel_dir = os.path.dirname(rel_path)
+
+            probe = probe_source(lambda: self.open_entry_stream(info), rel_path, self.file_mapping, file_basename)
+            name = generate_intelligent_filename(self.file_mapping, file_basename, rel_path, sort_order, probe)
+            timestamp = resolve_file_timestamp(None, rel_path, self.file_mapping, file_basename, probe,
+                                               zip_member_timestamp(info))
+
+            sort_id = file_basename if file_basename in self.file_mapping else None
+            yield VaultEntry(info.filename, rel_dir, name, info.file_size, sort_id, probe.kind, timestamp,
+                             info=info)
+
+    def open_entry_stream(self, info):
+        """Backup bejegyzés dekriptált, seekelhető folyama"""
+        return open_backup_member(self.path, self.zip_ref, info, self.key)
+
+    def open_entry(self, entry):
+        """
+        Bejegyzés dekriptált tartalma olvasható folyamként (darabonként olvasva
+        nagy videóknál sem kerül memóriába a teljes fájl)
+        """
+        if entry.info is not None:
+            self.open()
+            return self.open_entry_stream(entry.info)
+        return EncryptedReader(open(entry.path, "rb"), self.key)
+
+    def read(self, entry):
+        """Bejegyzés teljes dekriptált tartalma bájtokként (kis fájlokhoz)"""
+        with self.open_entry(entry) as f:
+            return f.read()
+
+    def decryptor(self, output_dir, **options):
+        """Decryptor ugyanerre a tárolóra (kimenet írása, párhuzamos feldolgozás, manifest)"""
+        return Decryptor(self.password, self.path, output_dir, recursive=self.recursive, **options)
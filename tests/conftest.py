@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""Teljesítménytesztek: generált titkosított bemenetek és a mérő folyamat indítása."""
+
+import os
+import sys
+import json
+import struct
+import subprocess
+import zipfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lockmypix.crypto import create_ctr_cipher, derive_key
+from lockmypix.metadata import MP4_EPOCH_OFFSET
+
+from perf_runner import PASSWORD
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perf_baseline.json")
+
+# Érvényes JPEG fejléc (SOI, APP0, SOF0, SOS), utána a tömörített adat helyén nullák:
+# a névadás és a dátumvizsgálat a fejlécnél megáll, mint valódi képen
+JPEG_HEADER = (b"\xff\xd8"
+               b"\xff\xe0\x00\x10JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00"
+               b"\xff\xc0\x00\x11\x08\x00\x10\x00\x10\x03\x01\x22\x00\x02\x11\x01\x03\x11\x01"
+               b"\xff\xda\x00\x0c\x03\x01\x00\x02\x11\x03\x11\x00\x3f\x00")
+
+def exif_jpeg_header(date_text):
+    """JPEG fejléc APP1 Exif szegmenssel (IFD0 DateTime = date_text, 'YYYY:MM:DD HH:MM:SS')"""
+    value = date_text.encode("ascii") + b"\x00"
+    tiff = (b"II*\x00" + struct.pack("<I", 8) + struct.pack("<H", 1)
+            + struct.pack("<HHII", 0x0132, 2, len(value), 26) + struct.pack("<I", 0) + value)
+    app1 = b"Exif\x00\x00" + tiff
+    return JPEG_HEADER[:2] + b"\xff\xe1" + struct.pack(">H", len(app1) + 2) + app1 + JPEG_HEADER[2:]
+
+def bmff_box(box_type, payload):
+    """ISO-BMFF doboz (32 bites méret + típus)"""
+    return struct.pack(">I", 8 + len(payload)) + box_type + payload
+
+def mp4_moov_at_end(creation_time, mdat_size):
+    """MP4 a fájl végén álló moov/mvhd atommal (creation_time: Unix idő, UTC)"""
+    mvhd = bmff_box(b"mvhd", bytes(4) + struct.pack(">II", creation_time + MP4_EPOCH_OFFSET, 0) + bytes(88))
+    return (bmff_box(b"ftyp", b"isom\x00\x00\x02\x00isom") + bmff_box(b"mdat", bytes(mdat_size))
+            + bmff_box(b"moov", mvhd))
+
+# ======================================
+# TESZTBEMENETEK - Mappa és .zip.cmpexport (internet és valódi adat nélkül)
+# ======================================
+
+def encrypt_fixture(path, size, header=JPEG_HEADER):
+    """size bájtos titkosított "kép" írása 1 MiB-os darabokban (a generálás sem tölt mindent memóriába)"""
+    cipher = create_ctr_cipher(derive_key(PASSWORD))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        remaining = size
+        block = header + bytes(min(size, 1024 * 1024) - len(header))
+        while remaining > 0:
+            chunk = block[:remaining]
+            f.write(cipher.encrypt(chunk))
+            remaining -= len(chunk)
+            block = bytes(len(block))
+
+def make_folder(directory, sizes):
+    """Egyedi titkosított fájlok albumonként (a méretlista sorrendjében)"""
+    for i, size in enumerate(sizes):
+        encrypt_fixture(os.path.join(directory, f"album{i % 3}", f"file{i:04d}.6zu"), size)
+    return directory
+
+def make_backup(path, folder, compression=zipfile.ZIP_DEFLATED):
+    """A mappa tartalma .zip.cmpexport-ként (.encrypt/ alatt, alapból deflate tömörítéssel, mint az exportban)"""
+    with zipfile.ZipFile(path, "w", compression, compresslevel=1) as zip_ref:
+        for root, _, files in os.walk(folder):
+            for name in sorted(files):
+                file_path = os.path.join(root, name)
+                zip_ref.write(file_path, ".encrypt/" + os.path.relpath(file_path, folder).replace(os.sep, "/"))
+    return path
+
+# ======================================
+# MÉRÉS - Futtatás külön folyamatban, alapérték kezelése
+# ======================================
+
+def pytest_addoption(parser):
+    parser.addoption("--update-perf-baseline", action="store_true",
+                     help="A mért áteresztőképesség mentése új alapértékként (perf_baseline.json)")
+
+@pytest.fixture(scope="session")
+def run_decrypt(tmp_path_factory):
+    """Dekriptálás a perf_runner folyamatában; az eredmény a runner JSON sora"""
+    cache_home = str(tmp_path_factory.mktemp("xdg"))
+
+    def run(input_path, cipher="auto", rounds=1):
+        output = str(tmp_path_factory.mktemp("out"))
+        env = dict(os.environ, XDG_CACHE_HOME=cache_home)
+        completed = subprocess.run(
+            [sys.executable, os.path.join(ROOT, "tests", "perf_runner.py"), input_path, output, "--cipher", cipher,
+             "--rounds", str(rounds)],
+            cwd=str(tmp_path_factory.getbasetemp()), env=env, capture_output=True, text=True, timeout=600)
+        assert completed.returncode == 0, completed.stderr or completed.stdout
+        return json.loads(completed.stdout.strip().splitlines()[-1])
+
+    return run
+
+@pytest.fixture(scope="session")
+def perf_baseline(request):
+    """Tárolt alapérték; --update-perf-baseline esetén a session végén felülírva"""
+    with open(BASELINE_PATH, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    measured = {}
+    yield baseline, measured
+    if request.config.getoption("--update-perf-baseline") and measured:
+        baseline["relative_throughput"].update(measured)
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=1)
+            f.write("\n")
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Egy dekriptálás futtatása külön folyamatban, mért idővel és csúcs-RSS-sel
+
+    python tests/perf_runner.py <input> <output> [--cipher NAME] [--rounds N]
+
+Az eredmény egy JSON sor a szabványos kimeneten. Külön folyamat kell, mert a
+ru_maxrss a folyamat teljes élettartamának csúcsa - így minden mérés tiszta.
+Több körnél egy bemelegítő kör után minden kör friss kimeneti mappába dekriptál,
+és a körönként a CPU-plafonhoz mért arányok közül a legjobb számít.
+"""
+
+import os
+import sys
+import argparse
+import json
+import resource
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lockmypix import Decryptor, CIPHER_AUTO
+from lockmypix.crypto import derive_key
+
+PASSWORD = "lockmypix-perf"
+
+# Viszonyítási mérés: ennyi kör (plusz egy bemelegítő), a legjobb kör számít
+REFERENCE_ROUNDS = 5
+
+def measure_reference(backend, workers, chunk_size, sizes):
+    """
+    A futás CPU-plafonja (MB/s): ugyanazok a fájlméretek (fájlonként friss cipher),
+    ugyanaz a backend, szálszám és darabméret, memóriában (I/O nélkül). A futás ehhez
+    mért aránya a hatékonyság, ami nem függ a gép magszámától és az AES / XOR
+    sebességétől (a XOR gyorsítótárán belüli és túli rész aránya is a futásé)
+    """
+    key = derive_key(PASSWORD)
+    block = memoryview(os.urandom(chunk_size))
+
+    def decrypt(size):
+        cipher = backend.create(key)
+        for offset in range(0, size, chunk_size):
+            cipher.decrypt(block[:min(chunk_size, size - offset)])
+
+    best = 0.0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for _ in range(REFERENCE_ROUNDS + 1):  # az első kör bemelegítés
+            started = time.perf_counter()
+            list(executor.map(decrypt, sizes))
+            elapsed = max(time.perf_counter() - started, 1e-9)
+            best = max(best, sum(sizes) / elapsed / (1024 * 1024))
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="LockMyPix teljesítménymérés")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--cipher", default=CIPHER_AUTO)
+    parser.add_argument("--rounds", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    warm_up = int(args.rounds > 1)  # bemelegítő kör: backend önteszt és mérés, hideg lapgyorsítótár
+    rounds = []
+    for round_index in range(warm_up + args.rounds):
+        output = os.path.join(args.output, f"round{round_index}") if args.rounds > 1 else args.output
+        decryptor = Decryptor(PASSWORD, args.input, output, autotune=False, cipher_backend=args.cipher)
+        started = time.monotonic()
+        sizes = [result.size for result in decryptor.results() if not result.error]
+        seconds = time.monotonic() - started
+        success, message = decryptor.summary
+        if not success:
+            break
+        if round_index < warm_up:
+            continue
+        # Gépfüggetlen viszonyítás: a futás fájljaival és beállításaival mért CPU-plafon,
+        # közvetlenül a kör után (ha a gép épp terhelt, mindkettő lassul)
+        reference = measure_reference(decryptor.backend, decryptor.workers, decryptor.chunk_size, sizes)
+        rounds.append((sum(sizes) / (1024 * 1024) / max(seconds, 1e-9) / reference, seconds, reference))
+
+    # A legjobb kör aránya (a zaj - más folyamatok, az eszköz állapota - csak lassíthat)
+    relative, seconds, reference = max(rounds) if rounds else (0.0, seconds, 0.0)
+    print(json.dumps({
+        "success": success,
+        "message": message,
+        "seconds": seconds,
+        "relative": relative,
+        "rounds": [round(ratio, 3) for ratio, _, _ in rounds],
+        "bytes": decryptor.progress.bytes_done if decryptor.progress else 0,
+        "cipher": decryptor.backend.name if decryptor.backend else None,
+        "workers": decryptor.workers,
+        "reference_mb_s": reference,
+        "peak_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,  # Linux: kB
+    }))
+    return 0 if success else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+AES-CTR backendek: bit-pontos egyezés az eredeti algoritmussal, és a XOR
+kulcsfolyam-gyorsítótár korlátos, helyben nő és a memóriakeretbe számít
+"""
+
+import os
+from itertools import cycle
+
+import pytest
+
+from perf_runner import PASSWORD
+
+from lockmypix import Decryptor, available_backends
+from lockmypix.ciphers import (BENCHMARK_FILES, KEYSTREAM_CACHE_MAX, KEYSTREAM_KEYS, XorKeystreamBackend,
+                               check_conformance, new_backend, reference_keystream)
+from lockmypix.crypto import create_ctr_cipher, derive_key
+
+# Szabálytalan darabolás (blokkhatáron belül, rajta és átlépve), a XOR gyorsítótár végén át is
+CHUNK_PATTERN = (1, 15, 16, 17, 4095, 65536 + 3)
+CONFORMANCE_CACHE = 64 * 1024
+
+@pytest.mark.parametrize("name", available_backends())
+def test_backend_matches_original_cipher(name):
+    assert check_conformance(name)
+
+    key = derive_key(PASSWORD)
+    data = os.urandom(3 * CONFORMANCE_CACHE + 5)
+    expected = create_ctr_cipher(key).decrypt(data)  # az eredeti algoritmus
+    cipher = new_backend(name, keystream_cache=CONFORMANCE_CACHE).create(key)
+    pieces, position, sizes = [], 0, cycle(CHUNK_PATTERN)
+    while position < len(data):
+        size = next(sizes)
+        pieces.append(bytes(cipher.decrypt(data[position:position + size])))
+        position += size
+    assert b"".join(pieces) == expected
+
+    # Blokkeltolásról indítva (véletlen hozzáférés) a folyam megfelelő része
+    for block_offset in (1, 4097, CONFORMANCE_CACHE // 16 + 3):
+        cipher = new_backend(name, keystream_cache=CONFORMANCE_CACHE).create(key, block_offset)
+        assert cipher.decrypt(data[block_offset * 16:]) == expected[block_offset * 16:]
+
+def test_counter_wraps_at_128_bits():
+    key = b"\xff" * 16
+    for name in available_backends():
+        cipher = new_backend(name, keystream_cache=CONFORMANCE_CACHE).create(key)
+        assert bytes(cipher.decrypt(bytes(64))) == reference_keystream(key, 0, 64)
+
+def test_keystream_grows_in_place_up_to_cap():
+    backend = XorKeystreamBackend(cache_max=256 * 1024)
+    key = derive_key(PASSWORD)
+    buffer = backend.keystream(key, 100)
+    assert len(buffer) == 256 * 1024
+    assert backend.keystream(key, 200 * 1024) is buffer
+    assert bytes(buffer[:200 * 1024]) == reference_keystream(key, 0, 200 * 1024)
+    for i in range(KEYSTREAM_KEYS + 2):
+        backend.keystream(bytes([i]) * 16, 16)
+    assert len(backend.keystreams) == KEYSTREAM_KEYS
+    assert backend.reserved_bytes == KEYSTREAM_KEYS * 256 * 1024
+
+def test_keystream_cache_counts_against_memory_budget(tmp_path):
+    budget = 64 * 1024 * 1024
+    decryptor = Decryptor(PASSWORD, str(tmp_path), str(tmp_path / "out"), memory_budget=budget,
+                          chunk_size=1024 * 1024, workers=2, autotune=False, cipher_backend="xor")
+    decryptor.select_cipher()
+    decryptor.tune()
+    assert decryptor.budget.limit == budget - new_backend("xor").reserved_bytes
+
+def test_benchmark_covers_uncached_tail():
+    """Az auto választás a gyorsítótár utáni részt is méri, és a minta legalább harmada azon túl van"""
+    assert max(BENCHMARK_FILES) > KEYSTREAM_CACHE_MAX
+    assert sum(max(size - KEYSTREAM_CACHE_MAX, 0) for size in BENCHMARK_FILES) * 3 >= sum(BENCHMARK_FILES)
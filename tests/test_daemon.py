@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Démon: a socket 0600 joggal jön létre, bontott kapcsolatnál a futó feladat leáll,
+munkafolyamat összeomlása után új készlet indul, a nem olvasó kliens kimenete korlátos
+"""
+
+import os
+import sys
+import json
+import stat
+import time
+import signal
+import socket
+import asyncio
+import subprocess
+
+import pytest
+
+from conftest import ROOT, make_folder
+from perf_runner import PASSWORD
+
+from lockmypix.daemon import ClientChannel, submit
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Unix socket, forkserver")
+
+@pytest.fixture
+def daemon(tmp_path):
+    """Egy munkafolyamatos démon (egyszerre egy feladat fut)"""
+    socket_path = str(tmp_path / "d.sock")
+    process = subprocess.Popen([sys.executable, "-m", "lockmypix.daemon", socket_path, "--workers", "1"],
+                               cwd=ROOT, env=dict(os.environ, XDG_CACHE_HOME=str(tmp_path / "xdg")))
+    deadline = time.monotonic() + 60
+    while not os.path.exists(socket_path):
+        assert process.poll() is None and time.monotonic() < deadline
+        time.sleep(0.05)
+    yield socket_path
+    process.terminate()
+    process.wait(30)
+
+def request(input_path, output):
+    return {"job": "decrypt", "input": input_path, "output": output, "password": PASSWORD,
+            "options": {"autotune": False, "workers": 1, "chunk_size": 64 * 1024, "cipher_backend": "pycryptodome"}}
+
+def test_socket_mode_and_cancel_on_disconnect(daemon, tmp_path):
+    assert stat.S_IMODE(os.stat(daemon).st_mode) == 0o600
+
+    # Hosszú feladat: a kliens az első haladási esemény után bontja a kapcsolatot
+    slow = make_folder(str(tmp_path / "slow" / "in"), [8 * 1024 * 1024] * 40)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(daemon)
+        sock.sendall((json.dumps(request(slow, str(tmp_path / "slow" / "out"))) + "\n").encode("utf-8"))
+        with sock.makefile("r", encoding="utf-8") as f:
+            for line in f:
+                if json.loads(line)["event"] == "progress":
+                    break
+
+    # Az egyetlen munkafolyamat felszabadul: a következő feladat hamar sorra kerül
+    quick = make_folder(str(tmp_path / "quick"), [4096])
+    started = time.monotonic()
+    events = list(submit(daemon, request(quick, str(tmp_path / "quick-out"))))
+    assert events[-1]["event"] == "finished" and events[-1]["success"], events[-1]
+    assert time.monotonic() - started < 10
+
+    # A bontott feladat nem futott végig (a kimenete - átnevezve is - a slow mappában)
+    outputs = [name for root, _, names in os.walk(str(tmp_path / "slow")) if "in" not in root.split(os.sep)
+               for name in names if name.endswith(".jpg")]
+    assert len(outputs) < 40
+
+def test_worker_crash_restarts_pool(daemon, tmp_path):
+    slow = make_folder(str(tmp_path / "slow" / "in"), [8 * 1024 * 1024] * 40)
+    events = submit(daemon, request(slow, str(tmp_path / "slow" / "out")))
+    for event in events:
+        if event["event"] == "started":
+            os.kill(event["pid"], signal.SIGKILL)
+            break
+    assert [event["event"] for event in events][-1] == "error"
+
+    # A következő feladatok az új készleten futnak
+    for attempt in range(2):
+        quick = make_folder(str(tmp_path / f"quick{attempt}"), [4096])
+        finished = list(submit(daemon, request(quick, str(tmp_path / f"quick{attempt}-out"))))[-1]
+        assert finished["event"] == "finished" and finished["success"], finished
+
+def test_stalled_client_output_is_bounded():
+    async def scenario():
+        ours, theirs = socket.socketpair()
+        _, writer = await asyncio.open_connection(sock=ours)
+        channel = ClientChannel(writer, limit=8)
+        for i in range(100):
+            channel.send({"event": "progress", "done": i})
+        assert channel.queue.qsize() == 4  # a sor felénél a haladás eldobva
+        for i in range(5):
+            channel.send({"event": "result", "data": "x" * 1024 * 1024})
+        assert channel.closed  # a kliens nem olvasott: bontva, a sor nem nő tovább
+        await asyncio.sleep(0)
+        theirs.close()
+
+    asyncio.run(scenario())
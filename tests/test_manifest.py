@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""Audit manifest: halasztott módban a sorok elkészüléskor naplóba kerülnek, az átnevezés lezáráskor"""
+
+import os
+import csv
+import json
+import hashlib
+
+import pytest
+
+from lockmypix.manifest import AuditManifest
+
+def digest(data):
+    hasher = hashlib.sha256()
+    hasher.update(data)
+    return [hasher]
+
+@pytest.mark.parametrize("name", ["manifest.csv", "manifest.jsonl"])
+def test_deferred_rows_are_journaled_and_renamed_at_close(name, tmp_path):
+    path = str(tmp_path / name)
+    output_dir = os.path.join(str(tmp_path), "out")
+    manifest = AuditManifest(path, deferred=True)
+    journal_path = manifest.journal_path
+    for i in range(3):
+        manifest.add(f"in/{i}.6zu", None, os.path.join(output_dir, "album", f"{i}.jpg"), 4, [], digest(b"data"))
+
+    # A sorok már a naplóban vannak (összeomlás után is megmaradnak), nem memóriában
+    with open(journal_path, encoding="utf-8") as f:
+        assert len(f.read().splitlines()) == 3
+
+    manifest.rename_prefix(os.path.join(output_dir, "album"), os.path.join(output_dir, "20200101"))
+    manifest.rename_prefix(output_dir, os.path.join(str(tmp_path), "20200101"))
+    manifest.close()
+    manifest.close()
+
+    assert not os.path.exists(journal_path)
+    if name.endswith(".csv"):
+        with open(path, encoding="utf-8", newline="") as f:
+            outputs = [row["output"] for row in csv.DictReader(f)]
+    else:
+        with open(path, encoding="utf-8") as f:
+            outputs = [json.loads(line)["output"] for line in f]
+    assert outputs == [os.path.join(str(tmp_path), "20200101", "20200101", f"{i}.jpg") for i in range(3)]
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""Natív metaadat olvasók: mvhd, udta ©day, TIFF IFD, JPEG APP1 és HEIF iloc"""
+
+import io
+import struct
+from datetime import datetime
+
+import pytest
+
+from conftest import JPEG_HEADER, bmff_box, exif_jpeg_header, mp4_moov_at_end
+
+from lockmypix.metadata import (EXIF_IFD_POINTER, MP4_EPOCH_OFFSET, parse_media_date_string,
+                                read_image_datetime, read_video_datetime)
+
+CREATION_TIME = 1577934245  # 2020-01-02 03:04:05 UTC
+
+def local(timestamp):
+    return datetime.fromtimestamp(timestamp)
+
+# ======================================
+# VIDEÓ - moov/mvhd és udta/©day
+# ======================================
+
+def ftyp():
+    return bmff_box(b"ftyp", b"isom\x00\x00\x02\x00isom")
+
+def mvhd_v1(creation_time):
+    return bmff_box(b"mvhd", b"\x01\x00\x00\x00" + struct.pack(">QQ", creation_time + MP4_EPOCH_OFFSET, 0)
+                    + bytes(100))
+
+def quicktime_day(text):
+    value = text.encode("utf-8")
+    return bmff_box(b"\xa9day", struct.pack(">HH", len(value), 0x55c4) + value)
+
+def itunes_day(text):
+    data = bmff_box(b"data", struct.pack(">II", 1, 0) + text.encode("utf-8"))
+    return bmff_box(b"meta", bytes(4) + bmff_box(b"ilst", bmff_box(b"\xa9day", data)))
+
+def test_mvhd_version_0_moov_at_end():
+    assert read_video_datetime(io.BytesIO(mp4_moov_at_end(CREATION_TIME, 4096))) == local(CREATION_TIME)
+
+def test_mvhd_version_1():
+    video = ftyp() + bmff_box(b"moov", mvhd_v1(CREATION_TIME))
+    assert read_video_datetime(io.BytesIO(video)) == local(CREATION_TIME)
+
+def test_mvhd_unset_creation_time():
+    video = ftyp() + bmff_box(b"moov", bmff_box(b"mvhd", bytes(100)))
+    assert read_video_datetime(io.BytesIO(video)) is None
+
+@pytest.mark.parametrize("day_box", [quicktime_day, itunes_day])
+def test_udta_day_takes_priority_over_mvhd(day_box):
+    text = "2019-07-08T09:10:11+0200"
+    video = ftyp() + bmff_box(b"moov", mvhd_v1(CREATION_TIME) + bmff_box(b"udta", day_box(text)))
+    # Az időzóna-eltolás helyi (naiv) időre váltva, mint az mvhd UTC ideje
+    expected = datetime.fromisoformat("2019-07-08T09:10:11+02:00").astimezone().replace(tzinfo=None)
+    assert parse_media_date_string(text) == expected
+    assert read_video_datetime(io.BytesIO(video)) == expected
+
+def test_video_without_moov():
+    assert read_video_datetime(io.BytesIO(ftyp() + bmff_box(b"mdat", bytes(64)))) is None
+
+# ======================================
+# KÉP - TIFF IFD, JPEG APP1, HEIF iloc
+# ======================================
+
+def tiff(endian, ifd0, exif=None):
+    """TIFF struktúra ASCII dátum tagekkel: IFD0, és ha megadva, Exif IFD (mutatóval az IFD0-ban)"""
+    ifd0_size = 2 + 12 * (len(ifd0) + (exif is not None)) + 4
+    exif_offset = 8 + ifd0_size
+    data_offset = exif_offset + (2 + 12 * len(exif) + 4 if exif is not None else 0)
+    values = []
+
+    def ifd(tags, extra=()):
+        entries = list(extra)
+        for tag, text in tags.items():
+            value = text.encode("ascii") + b"\x00"
+            entries.append(struct.pack(endian + "HHII", tag, 2, len(value), data_offset + len(b"".join(values))))
+            values.append(value)
+        entries.sort(key=lambda entry: struct.unpack(endian + "H", entry[:2])[0])
+        return struct.pack(endian + "H", len(entries)) + b"".join(entries) + struct.pack(endian + "I", 0)
+
+    pointer = [struct.pack(endian + "HHII", EXIF_IFD_POINTER, 4, 1, exif_offset)] if exif is not None else []
+    first = ifd(ifd0, pointer)
+    second = ifd(exif) if exif is not None else b""
+    header = (b"II*\x00" if endian == "<" else b"MM\x00*") + struct.pack(endian + "I", 8)
+    return header + first + second + b"".join(values)
+
+@pytest.mark.parametrize("endian", ["<", ">"])
+def test_tiff_exif_ifd_date_time_original(endian):
+    image = tiff(endian, {0x010F: "Camera maker"}, {0x9003: "2018:05:06 07:08:09"})
+    assert read_image_datetime(io.BytesIO(image)) == datetime(2018, 5, 6, 7, 8, 9)
+
+def test_tiff_ifd0_date_time_wins():
+    image = tiff("<", {0x0132: "2017:01:02 03:04:05"}, {0x9003: "2018:05:06 07:08:09"})
+    assert read_image_datetime(io.BytesIO(image)) == datetime(2017, 1, 2, 3, 4, 5)
+
+def test_jpeg_app1_exif():
+    assert read_image_datetime(io.BytesIO(exif_jpeg_header("2021:06:15 12:30:45"))) == datetime(2021, 6, 15, 12, 30, 45)
+
+def test_jpeg_app1_after_app0():
+    app1 = b"Exif\x00\x00" + tiff(">", {}, {0x9004: "2016:02:03 04:05:06"})
+    image = JPEG_HEADER[:20] + b"\xff\xe1" + struct.pack(">H", len(app1) + 2) + app1 + JPEG_HEADER[20:]
+    assert read_image_datetime(io.BytesIO(image)) == datetime(2016, 2, 3, 4, 5, 6)
+
+def test_jpeg_without_exif_stops_at_scan():
+    assert read_image_datetime(io.BytesIO(JPEG_HEADER + bytes(1024))) is None
+
+def heic(version, date_text):
+    """HEIC: meta/iinf (infe v2 'Exif' elem) és meta/iloc (v0 vagy v1 alapoffsettel), az Exif az mdat-ban"""
+    exif_item = struct.pack(">I", 6) + b"Exif\x00\x00" + tiff("<", {0x0132: date_text})
+    infe = bmff_box(b"infe", b"\x02\x00\x00\x00" + struct.pack(">HH", 1, 0) + b"hvc1" + b"\x00")
+    infe_exif = bmff_box(b"infe", b"\x02\x00\x00\x00" + struct.pack(">HH", 2, 0) + b"Exif" + b"\x00")
+    iinf = bmff_box(b"iinf", bytes(4) + struct.pack(">H", 2) + infe + infe_exif)
+
+    def iloc(exif_offset):
+        if version == 0:
+            items = [struct.pack(">HHHII", 1, 0, 1, 0, 0), struct.pack(">HHHII", 2, 0, 1, exif_offset, len(exif_item))]
+            return bmff_box(b"iloc", b"\x00\x00\x00\x00" + b"\x44\x00" + struct.pack(">H", 2) + b"".join(items))
+        # v1: construction_method, 4 bájtos alapoffset; az extent offset ehhez relatív
+        items = [struct.pack(">HHHIHII", 1, 0, 0, 0, 1, 0, 0),
+                 struct.pack(">HHHIHII", 2, 0, 0, exif_offset - 8, 1, 8, len(exif_item))]
+        return bmff_box(b"iloc", b"\x01\x00\x00\x00" + b"\x44\x40" + struct.pack(">H", 2) + b"".join(items))
+
+    head = bmff_box(b"ftyp", b"heic\x00\x00\x00\x00mif1heic")
+    meta_size = len(bmff_box(b"meta", bytes(4) + iinf + iloc(8)))  # a méret nem függ az offsettől
+    exif_offset = len(head) + meta_size + 8  # az mdat fejléce után
+    meta = bmff_box(b"meta", bytes(4) + iinf + iloc(exif_offset))
+    return head + meta + bmff_box(b"mdat", exif_item)
+
+@pytest.mark.parametrize("version", [0, 1])
+def test_heif_iloc_exif_item(version):
+    image = heic(version, "2022:11:12 13:14:15")
+    assert read_image_datetime(io.BytesIO(image)) == datetime(2022, 11, 12, 13, 14, 15)
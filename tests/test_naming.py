@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""Névadás: ütköző nevek utótagjai a bemeneti sorrendben, a szálak versenyétől függetlenül"""
+
+import os
+
+import pytest
+
+from conftest import encrypt_fixture, exif_jpeg_header, make_backup
+from perf_runner import PASSWORD
+
+from lockmypix import Decryptor, build_plan
+from lockmypix.sinks import NameAllocator
+
+# Egy másodpercen belüli sorozatkép: minden fájl ugyanazt a nevet kapná
+BURST_DATE = "2021:06:15 12:30:45"
+BURST_NAME = "IMG_20210615_123045"
+
+# Vegyes méretek, hogy a fájlok más sorrendben készüljenek el, mint ahogy indultak
+BURST_SIZES = [3 * 1024 * 1024, 4096, 1024 * 1024, 8192, 2 * 1024 * 1024, 512, 65536, 4096] * 2
+
+def test_allocator_suffixes_existing_and_case():
+    allocator = NameAllocator(lambda rel_dir: ["IMG_1.jpg"] if rel_dir == "a" else [])
+    assert allocator.allocate("a", "img_1.JPG") == "img_1_1.JPG"
+    assert allocator.allocate("a", "IMG_1.jpg") == "IMG_1_2.jpg"
+    assert allocator.allocate("b", "IMG_1.jpg") == "IMG_1.jpg"
+    assert allocator.allocate(os.path.join("b", "."), "IMG_1.jpg") == "IMG_1_1.jpg"
+
+@pytest.fixture(scope="module")
+def burst(tmp_path_factory):
+    """Azonos EXIF dátumú képek egy albumban, mappaként és .zip.cmpexport-ként"""
+    base = tmp_path_factory.mktemp("burst")
+    folder = base / "in"
+    for i, size in enumerate(BURST_SIZES):
+        encrypt_fixture(str(folder / "album" / f"shot{i:02d}.6zu"), size, exif_jpeg_header(BURST_DATE))
+    return {"folder": str(folder), "backup": make_backup(str(base / "burst.zip.cmpexport"), str(folder))}
+
+def decrypted_names(input_path, output, order):
+    """forrás -> kiosztott név, a mappaátnevezés nélküli kimenet szerint"""
+    decryptor = Decryptor(PASSWORD, input_path, output, autotune=False, workers=8, chunk_size=64 * 1024,
+                          order=order, output_format="tar")
+    names = {os.path.basename(result.source): result.name for result in decryptor.results()}
+    assert decryptor.summary[0], decryptor.summary
+    return names
+
+@pytest.mark.parametrize("scenario", ["folder", "backup"])
+def test_colliding_timestamps_get_stable_suffixes(scenario, burst, tmp_path):
+    runs = [decrypted_names(burst[scenario], str(tmp_path / f"{order}-{attempt}.tar"), order)
+            for order in ("discovery", "largest", "smallest") for attempt in range(2)]
+    assert all(run == runs[0] for run in runs[1:])
+
+    # Az utótagok a forrás szerinti rendezett sorrendben (shot00 kapja az utótag nélküli nevet)
+    expected = [f"{BURST_NAME}.jpg"] + [f"{BURST_NAME}_{i}.jpg" for i in range(1, len(BURST_SIZES))]
+    assert [runs[0][source] for source in sorted(runs[0])] == expected
+
+def test_fallback_numbers_follow_sorted_walk(tmp_path):
+    """Dátum nélküli fájlok file_NNN sorszáma index nélkül is a rendezett bejárást követi, mint a tervben"""
+    folder = tmp_path / "in"
+    for rel_path in ("b/x.6zu", "a/sub/z.6zu", "a/y.6zu", "a/b.6zu", "c.6zu", "b/a.6zu"):
+        encrypt_fixture(str(folder / rel_path), 2048)
+    plan = build_plan(str(folder), str(tmp_path / "planned"), PASSWORD)
+    planned = {entry["source"]: entry["name"] for entry in plan["entries"]}
+
+    decryptor = Decryptor(PASSWORD, str(folder), str(tmp_path / "out.tar"), autotune=False, workers=8,
+                          output_format="tar")
+    names = {os.path.relpath(result.source, str(folder)).replace(os.sep, "/"): result.name
+             for result in decryptor.results()}
+    assert names == planned
+    assert names["c.6zu"] == "file_001.jpg" and names["b/x.6zu"] == "file_006.jpg"
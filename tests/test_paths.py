@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""Útvonal-bejárás (zip-slip) elleni védelem: bejegyzésnevek és sort.db mappák a kimeneten belül"""
+
+import os
+import sqlite3
+import tarfile
+import zipfile
+
+import pytest
+
+from conftest import encrypt_fixture
+from perf_runner import PASSWORD
+
+from lockmypix import Decryptor, build_plan
+from lockmypix.streaming import clean_member_path
+
+ESCAPING_MEMBER = ".encrypt/../../../escaped/x.p5o"
+
+@pytest.mark.parametrize("name, expected", [
+    ("../../../escaped/x.p5o", "escaped/x.p5o"),
+    ("/etc/passwd", "etc/passwd"),
+    ("C:\\Windows\\x.6zu", "Windows/x.6zu"),
+    ("a/./b/../c", "a/b/c"),
+    ("..", ""),
+])
+def test_clean_member_path(name, expected):
+    assert clean_member_path(name) == expected
+
+@pytest.fixture
+def hostile_backup(tmp_path):
+    """Backup '..' bejegyzésnévvel, kivezető sort.db mappával és egy symlinken át mutató bejegyzéssel"""
+    plain = tmp_path / "plain.6zu"
+    encrypt_fixture(str(plain), 4096)
+    data = plain.read_bytes()
+
+    sort_db = tmp_path / "sort.db"
+    conn = sqlite3.connect(str(sort_db))
+    conn.execute("CREATE TABLE sortorder (id TEXT, dir TEXT, sort INTEGER, date_modified TEXT)")
+    conn.execute("INSERT INTO sortorder VALUES ('mapped', '../../../evil/', 1, NULL)")
+    conn.commit()
+    conn.close()
+
+    backup = tmp_path / "hostile.zip.cmpexport"
+    with zipfile.ZipFile(str(backup), "w") as zip_ref:
+        zip_ref.write(str(sort_db), "sort.db")
+        for name in (ESCAPING_MEMBER, ".encrypt/mapped.6zu", ".encrypt/link/y.6zu"):
+            zip_ref.writestr(zipfile.ZipInfo(name), data)
+    return backup
+
+def files_under(path):
+    return sorted(os.path.relpath(os.path.join(root, name), path)
+                  for root, _, names in os.walk(path) for name in names)
+
+def test_backup_members_stay_inside_output(tmp_path, hostile_backup):
+    output = tmp_path / "nested" / "deeper" / "out"
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    output.mkdir(parents=True)
+    os.symlink(str(outside), str(output / "link"))
+    before = files_under(str(tmp_path))
+
+    decryptor = Decryptor(PASSWORD, str(hostile_backup), str(output), autotune=False)
+    results = {result.source: result for result in decryptor.results()}
+
+    # A '..' elemek nélkül a kimeneten belül; a symlinken át kivezető bejegyzés hibával kimarad
+    assert results[ESCAPING_MEMBER].success
+    assert results[".encrypt/mapped.6zu"].success
+    assert not results[".encrypt/link/y.6zu"].success
+    assert os.listdir(str(outside)) == []
+    created = set(files_under(str(tmp_path))) - set(before)
+    assert created and all(path.startswith(os.path.join("nested", "deeper", "out", "")) for path in created)
+
+def test_archive_and_plan_names_are_clean(tmp_path, hostile_backup):
+    target = tmp_path / "out.tar"
+    assert Decryptor(PASSWORD, str(hostile_backup), str(target), output_format="tar", autotune=False).run()[0]
+    with tarfile.open(str(target)) as tar:
+        names = tar.getnames()
+    assert len(names) == 3
+    assert all(".." not in name.split("/") and not name.startswith("/") for name in names)
+
+    plan = build_plan(str(hostile_backup), str(tmp_path / "planned"), PASSWORD)
+    assert all(".." not in entry["rel_dir"].split("/") and not os.path.isabs(entry["rel_dir"])
+               for entry in plan["entries"])
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Teljesítmény-regressziós tesztek: áteresztőképesség a tárolt alapértékhez mérve,
+és a csúcs-RSS nem nőhet a bemeneti fájl méretével
+
+    python -m pytest tests
+    python -m pytest tests --update-perf-baseline   # új alapérték ezen a gépen
+"""
+
+import sys
+
+import pytest
+
+from conftest import make_folder, make_backup
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"),
+                                reason="ru_maxrss és posix_fadvise: Linux")
+
+MIB = 1024 * 1024
+
+# Vegyes bemenet: sok kis kép és néhány nagy fájl (darabolva streamelt)
+THROUGHPUT_SIZES = [256 * 1024] * 120 + [8 * MIB + 4096] * 6
+
+# Mért körök a bemelegítés után (a legjobb körönkénti arány számít)
+THROUGHPUT_ROUNDS = 9
+
+# Egyetlen kicsi és egyetlen nagy fájl: a csúcs-RSS különbsége ennyi lehet legfeljebb
+RSS_SMALL = 8 * MIB
+RSS_LARGE = 128 * MIB
+RSS_GROWTH_LIMIT = 32 * MIB
+
+@pytest.fixture(scope="session")
+def scenarios(tmp_path_factory):
+    """Mappa és .zip.cmpexport bemenetek (egyszer generálva)"""
+    base = tmp_path_factory.mktemp("inputs")
+
+    def folder(name, sizes):
+        return make_folder(str(base / name), sizes)
+
+    throughput = folder("throughput", THROUGHPUT_SIZES)
+    small = folder("small", [RSS_SMALL])
+    large = folder("large", [RSS_LARGE])
+    return {
+        "folder": {"throughput": throughput, "small": small, "large": large},
+        "backup": {key: make_backup(str(base / f"{key}.zip.cmpexport"), path)
+                   for key, path in (("throughput", throughput), ("small", small), ("large", large))},
+    }
+
+@pytest.mark.parametrize("scenario", ["folder", "backup"])
+def test_throughput(scenario, scenarios, run_decrypt, perf_baseline):
+    """
+    Áteresztőképesség a futás CPU-plafonjához viszonyítva (ugyanazok a fájlok, backend,
+    szálszám és darabméret, memóriában - így az alapérték gépek között is értelmes),
+    legalább az alapérték tolerance-szorosa
+    """
+    baseline, measured = perf_baseline
+    result = run_decrypt(scenarios[scenario]["throughput"], rounds=THROUGHPUT_ROUNDS)
+    assert result["success"], result["message"]
+    assert result["bytes"] == sum(THROUGHPUT_SIZES)
+
+    relative = result["relative"]
+    measured[scenario] = round(relative, 3)
+    expected = baseline["relative_throughput"][scenario] * baseline["tolerance"]
+    assert relative >= expected, (
+        f"{scenario}: {relative:.3f} x CPU-plafon ({result['cipher']}, {result['workers']} szál), "
+        f"alapérték {expected:.3f} alatt; körök: {result['rounds']}")
+
+@pytest.mark.parametrize("cipher", ["auto", "pycryptodome"])
+@pytest.mark.parametrize("scenario", ["folder", "backup"])
+def test_peak_rss_independent_of_file_size(scenario, cipher, scenarios, run_decrypt):
+    """
+    16x nagyobb fájl sem növelheti érdemben a csúcs-RSS-t (streaming dekriptálás)
+    Az alapértelmezett (auto) backenddel is: a XOR kulcsfolyam-gyorsítótára korlátos
+    """
+    small = run_decrypt(scenarios[scenario]["small"], cipher=cipher)
+    large = run_decrypt(scenarios[scenario]["large"], cipher=cipher)
+    assert small["success"] and large["success"]
+    assert large["bytes"] == RSS_LARGE
+
+    growth = large["peak_rss"] - small["peak_rss"]
+    assert growth <= RSS_GROWTH_LIMIT, (
+        f"{scenario} ({large['cipher']}): csúcs-RSS {small['peak_rss'] // MIB} MiB -> {large['peak_rss'] // MIB} MiB")
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""Dry-run terv és valódi futás egyezése: ugyanaz a szűrés, vizsgálat, név és dátum"""
+
+import os
+import zipfile
+from datetime import datetime
+
+import pytest
+
+from conftest import encrypt_fixture, exif_jpeg_header, make_backup, mp4_moov_at_end
+from perf_runner import PASSWORD
+
+from lockmypix import Decryptor, Vault, build_plan
+
+# Videó a végén álló moov atommal: tömörített bejegyzésnél a fejléc az mdat után van
+VIDEO_TIME = 1577934245
+VIDEO_MDAT = 300 * 1024
+
+@pytest.fixture(scope="module")
+def mixed(tmp_path_factory):
+    """Datált kép, dátum nélküli kép, moov-at-end videó és egy ismeretlen kiterjesztés, albumokban"""
+    base = tmp_path_factory.mktemp("mixed")
+    folder = base / "in"
+    encrypt_fixture(str(folder / "a" / "dated.6zu"), 4096, exif_jpeg_header("2019:03:01 10:00:00"))
+    encrypt_fixture(str(folder / "a" / "plain.6zu"), 4096)
+    encrypt_fixture(str(folder / "b" / "undated.6zu"), 4096)
+    video = mp4_moov_at_end(VIDEO_TIME, VIDEO_MDAT)
+    encrypt_fixture(str(folder / "b" / "clip.vp3"), len(video), video)
+    encrypt_fixture(str(folder / "notes.txt"), 64)
+    return {
+        "folder": str(folder),
+        "deflated": make_backup(str(base / "deflated.zip.cmpexport"), str(folder)),
+        "stored": make_backup(str(base / "stored.zip.cmpexport"), str(folder), zipfile.ZIP_STORED),
+    }
+
+def source_key(source, input_path):
+    """Forrás azonosítója a tervben (backupnál a bejegyzés neve, mappánál a relatív út)"""
+    if os.path.isdir(input_path):
+        return os.path.relpath(source, input_path).replace(os.sep, "/")
+    return source
+
+@pytest.mark.parametrize("scenario", ["folder", "deflated", "stored"])
+@pytest.mark.parametrize("output_format", ["dir", "tar"])
+def test_plan_matches_run(scenario, output_format, mixed, tmp_path):
+    input_path = mixed[scenario]
+    output = str(tmp_path / ("out" if output_format == "dir" else "out.tar"))
+    plan = build_plan(input_path, output, PASSWORD)
+    planned = {entry["source"]: (entry["name"], entry["timestamp"]) for entry in plan["entries"]}
+
+    decryptor = Decryptor(PASSWORD, input_path, output, output_format=output_format, autotune=False, workers=4)
+    ran = {source_key(result.source, input_path): (result.name, result.timestamp)
+           for result in decryptor.results()}
+    assert decryptor.summary[0], decryptor.summary
+
+    assert ran == planned
+    assert len(planned) == 4 and len(plan["unknown"]) == 1
+    video_name = datetime.fromtimestamp(VIDEO_TIME).strftime("VID_%Y%m%d_%H%M%S.mp4")
+    assert video_name in {name for name, _ in planned.values()}
+
+@pytest.mark.parametrize("scenario", ["folder", "deflated"])
+def test_vault_matches_plan(scenario, mixed, tmp_path):
+    input_path = mixed[scenario]
+    plan = build_plan(input_path, str(tmp_path / "out"), PASSWORD)
+    with Vault(input_path, PASSWORD) as vault:
+        entries = {entry.source: (entry.name, entry.timestamp) for entry in vault.entries()}
+    assert entries == {entry["source"]: (entry["proposed_name"], entry["timestamp"]) for entry in plan["entries"]}
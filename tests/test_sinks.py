@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""Kimeneti célok: mappa (barrier, jogosultság, összeomlás utáni helyreállítás) és archívumok"""
+
+import io
+import os
+import json
+import stat
+import time
+import tarfile
+import zipfile
+
+import pytest
+
+from conftest import encrypt_fixture
+from perf_runner import PASSWORD
+
+from lockmypix import Decryptor
+from lockmypix.sinks import COMMIT_JOURNAL, STAGING_LOCK, STAGING_PREFIX, DirectorySink, TarSink, ZipSink, try_lock
+
+SIZES = [4096, 3 * 1024 * 1024 + 17, 100]
+
+def archive_contents(path, output_format):
+    if output_format == "tar":
+        with tarfile.open(path) as tar:
+            return {member.name: tar.extractfile(member).read() for member in tar.getmembers()}
+    with zipfile.ZipFile(path) as archive:
+        return {name: archive.read(name) for name in archive.namelist()}
+
+@pytest.mark.parametrize("output_format", ["tar", "zip"])
+def test_archive_matches_directory_output(output_format, tmp_path):
+    folder = tmp_path / "in"
+    for i, size in enumerate(SIZES):
+        encrypt_fixture(str(folder / "album" / f"f{i}.6zu"), size)
+
+    # A kimeneti mappa a futás végén dátum szerint átneveződik: a szülőjét járjuk be
+    directory = tmp_path / "dir"
+    assert Decryptor(PASSWORD, str(folder), str(directory / "out"), autotune=False).run()[0]
+    expected = {}
+    for root, _, names in os.walk(str(directory)):
+        for name in names:
+            with open(os.path.join(root, name), "rb") as f:
+                expected[name] = f.read()
+
+    target = str(tmp_path / f"out.{output_format}")
+    assert Decryptor(PASSWORD, str(folder), target, output_format=output_format, autotune=False,
+                     chunk_size=64 * 1024).run()[0]
+    contents = archive_contents(target, output_format)
+    assert {os.path.basename(name): data for name, data in contents.items()} == expected
+    assert not [name for name in os.listdir(str(tmp_path)) if name.endswith(".partial")]
+
+class FailingSource:
+    """Olvasható folyam, ami néhány darab után hibát dob (pl. olvasási hiba a forráson)"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def read(self, size=-1):
+        if not self.chunks:
+            raise OSError("olvasási hiba")
+        self.chunks -= 1
+        return bytes(size)
+
+@pytest.mark.parametrize("sink_class", [TarSink, ZipSink])
+def test_interrupted_entry_discards_archive(sink_class, tmp_path):
+    target = str(tmp_path / "out.archive")
+    sink = sink_class(target)
+    sink.open()
+    sink.write("a", "ok.jpg", 0, 5, io.BytesIO(b"12345"))
+    with pytest.raises(OSError):
+        sink.write("a", "broken.jpg", 0, 1024 * 1024, FailingSource(2), chunk_size=64 * 1024)
+    sink.close()
+    assert sink.failed
+    assert os.listdir(str(tmp_path)) == []
+
+def staged_file(sink, rel_dir, name, data):
+    """Kész staging fájl commitolva, mint a dekriptálás után"""
+    temp_path = sink.staging_path(rel_dir, name)
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    return sink.commit(temp_path, rel_dir, name, 1600000000)
+
+@pytest.mark.parametrize("umask, mode", [(0o022, 0o644), (0o077, 0o600)])
+def test_output_mode_follows_umask(umask, mode, tmp_path):
+    previous = os.umask(umask)
+    try:
+        sink = DirectorySink(str(tmp_path / "out"))
+        sink.open()
+        final_path = staged_file(sink, "a", "x.jpg", b"data")
+        sink.close()
+    finally:
+        os.umask(previous)
+    assert stat.S_IMODE(os.stat(final_path).st_mode) == mode
+
+def test_barrier_runs_without_further_commits(tmp_path):
+    sink = DirectorySink(str(tmp_path / "out"), interval=0.05)
+    sink.open()
+    try:
+        final_path = staged_file(sink, "a", "x.jpg", b"data")
+        deadline = time.monotonic() + 5
+        while not os.path.exists(final_path) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert os.path.exists(final_path)
+    finally:
+        sink.close()
+
+def test_interrupted_run_publishes_committed_files(tmp_path):
+    output = tmp_path / "out"
+    staging = output / f"{STAGING_PREFIX}1-x"
+    staging.mkdir(parents=True)
+    (staging / STAGING_LOCK).write_bytes(b"")  # senki nem tartja
+    (output / "a").mkdir()
+    (output / "a" / "taken.jpg").write_bytes(b"other")
+    (staging / "temp_1").write_bytes(b"complete")
+    (staging / "temp_2").write_bytes(b"taken name")
+    (staging / "temp_3").write_bytes(b"half")
+    (staging / "temp_4").write_bytes(b"not committed")
+    journal = [[8, "temp_1", "a/done.jpg"], [10, "temp_2", "a/taken.jpg"], [100, "temp_3", "a/short.jpg"]]
+    (staging / COMMIT_JOURNAL).write_text("".join(json.dumps(line) + "\n" for line in journal) + '[3, "tem')
+
+    sink = DirectorySink(str(output))
+    sink.open()
+    sink.close()
+    assert sorted(os.listdir(str(output))) == ["a"]
+    assert (output / "a" / "done.jpg").read_bytes() == b"complete"
+    assert (output / "a" / "taken.jpg").read_bytes() == b"other"
+    assert (output / "a" / "taken_1.jpg").read_bytes() == b"taken name"
+    assert sorted(os.listdir(str(output / "a"))) == ["done.jpg", "taken.jpg", "taken_1.jpg"]
+
+def test_locked_staging_is_left_alone(tmp_path):
+    """Futó (zárolt) staging mappa a PID-jétől függetlenül érintetlen marad"""
+    output = tmp_path / "out"
+    staging = output / f"{STAGING_PREFIX}999999999-x"
+    staging.mkdir(parents=True)
+    (staging / "temp_1").write_bytes(b"in progress")
+    (staging / COMMIT_JOURNAL).write_text(json.dumps([11, "temp_1", "a/x.jpg"]) + "\n")
+    with open(str(staging / STAGING_LOCK), "w+b") as lock_file:
+        assert try_lock(lock_file)
+        sink = DirectorySink(str(output))
+        sink.open()
+        sink.close()
+        assert (staging / "temp_1").exists()
+        assert not (output / "a").exists()
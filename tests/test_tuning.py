@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Kalibráció: a futás backendjével mér, leállítható, backendenként kerül a gyorsítótárba,
+és a kiírt minta a bemenet méretéhez igazodik (kis bemenetnél nincs kalibráció)
+"""
+
+import pytest
+
+from conftest import make_folder
+from perf_runner import PASSWORD
+
+from lockmypix import Decryptor, tuning
+from lockmypix.ciphers import new_backend
+from lockmypix.streaming import OperationCancelled
+
+def test_calibration_stops_on_request(tmp_path):
+    checks = []
+
+    def stop_check():
+        checks.append(1)
+        return len(checks) > 3
+
+    with pytest.raises(OperationCancelled):
+        tuning.calibrate_device(str(tmp_path), new_backend("xor"), stop_check=stop_check)
+    assert list(tmp_path.iterdir()) == []
+
+def test_cached_tuning_is_per_backend(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    measured = []
+
+    def calibrate(directory, backend, key, stop_check, sample_bytes):
+        measured.append(backend.name)
+        return {"chunk_size": 1024 * 1024, "workers": 2, "cipher": backend.name}
+
+    monkeypatch.setattr(tuning, "calibrate_device", calibrate)
+    for name in ("xor", "xor", "pycryptodome", "pycryptodome"):
+        assert tuning.device_tuning(str(tmp_path), backend=new_backend(name))["cipher"] == name
+    assert measured == ["xor", "pycryptodome"]
+
+MIB = 1024 * 1024
+
+def test_calibration_sample_follows_input_size():
+    assert tuning.calibration_sample(None) == tuning.TUNING_SAMPLE_BYTES
+    assert tuning.calibration_sample(tuning.TUNING_FULL_INPUT_BYTES * 10) == tuning.TUNING_SAMPLE_BYTES
+    assert tuning.calibration_sample(tuning.TUNING_SAMPLE_BYTES) is None
+    assert tuning.calibration_sample(tuning.TUNING_SAMPLE_BYTES, retune=True) == tuning.TUNING_MIN_SAMPLE_BYTES
+    for input_bytes in (200 * MIB, 400 * MIB, 4096 * MIB):
+        sample_bytes = tuning.calibration_sample(input_bytes)
+        assert sample_bytes * tuning.TUNING_MEASUREMENTS <= max(input_bytes * tuning.TUNING_INPUT_SHARE,
+                                                                 tuning.TUNING_SAMPLE_BYTES)
+
+def test_smaller_cached_sample_is_recalibrated(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    samples = []
+
+    def calibrate(directory, backend, key, stop_check, sample_bytes):
+        samples.append(sample_bytes)
+        return {"chunk_size": MIB, "workers": 2, "cipher": backend.name, "sample_bytes": sample_bytes}
+
+    monkeypatch.setattr(tuning, "calibrate_device", calibrate)
+    for input_bytes in (10 * MIB, 200 * MIB, 100 * MIB, 4096 * MIB, 200 * MIB):
+        tuning.device_tuning(str(tmp_path), input_bytes=input_bytes)
+    assert samples == [tuning.calibration_sample(200 * MIB), tuning.TUNING_SAMPLE_BYTES]
+
+def test_small_run_skips_calibration(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+
+    def calibrate(*args):
+        raise AssertionError("kis bemenetnél nincs kalibráció")
+
+    monkeypatch.setattr(tuning, "calibrate_device", calibrate)
+    folder = make_folder(str(tmp_path / "in"), [4096] * 3)
+    decryptor = Decryptor(PASSWORD, folder, str(tmp_path / "out.tar"), output_format="tar")
+    assert decryptor.run()[0], decryptor.summary
+    assert decryptor.chunk_size and decryptor.workers